@@ -1,9 +1,12 @@
+import csv
 import json
 import os
 import re
 import shutil
 import subprocess
+import threading
 import uuid
+from dataclasses import asdict
 from datetime import date, datetime, timezone
 from urllib.parse import urlparse
 
@@ -13,12 +16,13 @@ import copy
 
 import config
 from modes import all_modes, get_mode
-from platforms import get_platform
+from platforms import PLATFORMS
 from platforms.base import LinkCard, MediaAttachment
-from services.media import process_uploads, cleanup_uploads, compress_for_bluesky, get_mime_type
-from services.link_card import fetch_og_metadata
+from services.media import process_uploads, cleanup_uploads, get_mime_type, prune_derivatives, describe_image
+from services.link_card import card_cache, get_link_card
 from services.social_links import extract_social_links
-from services.bwe_list import get_bwe_lists, mark_bwe_posted, update_bwe_after_post, delete_bwe_posted, delete_bwe_to_post, add_bwe_to_post
+from services import bwe_batch
+from services.bwe_list import get_bwe_lists, mark_bwe_posted, update_bwe_after_post, delete_bwe_posted, delete_bwe_to_post, add_bwe_to_post, apply_bwe_operations, load_bwe, operation_error
 from services.issue_counts import get_latest_issue_counts
 from services.insights import generate_insights
 from services.issue_records import generate_issue_records
@@ -26,6 +30,14 @@ from services.latest_data import generate_latest_data
 from services.blog_post import create_blog_post, summarize_blog_post, blog_post_exists
 from services.og_image import derive_og_image_path
 from services.slugify import slugify
+from services.links import normalize_link
+from services import post_telemetry, preflight
+from services.posting import build_jobs, publish, remote_jobs, update_platform
+from services.post_queue import PostQueue
+from services.scheduler import PostScheduler
+from services.engagement import EngagementCollector
+from services.prefetch import MetadataPrefetcher, SITE_KINDS, kinds_for_type
+from services.draft_gc import collect_orphaned_draft_images, format_report
 from services.showcase_output import (
     delete_showcase_output,
     showcase_output_path,
@@ -46,6 +58,12 @@ def friendly_time(iso_timestamp):
         return iso_timestamp[:16].replace("T", " ") if iso_timestamp else ""
 
 
+@app.template_test("editable")
+def editable_platform(name):
+    """True if published posts on platform *name* can be edited."""
+    return name in PLATFORMS and PLATFORMS[name].can_edit()
+
+
 @app.context_processor
 def cache_busting():
     """Provide static asset cache-busting timestamps to templates."""
@@ -61,6 +79,10 @@ def cache_busting():
 _BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 HISTORY_FILE = os.path.join(_BASE_DIR, "posts", "history.json")
 DRAFT_IMAGES_DIR = os.path.join(_BASE_DIR, "posts", "draft_images")
+POST_QUEUE_FILE = os.path.join(_BASE_DIR, "posts", "post-queue.json")
+POST_QUEUE_WORKERS = 2
+POST_SCHEDULE_FILE = os.path.join(_BASE_DIR, "posts", "post-schedule.json")
+ENGAGEMENT_FILE = os.path.join(_BASE_DIR, "posts", "engagement.json")
 
 BUNDLEDB_PATH = "/Users/Bob/Dropbox/Docs/Sites/11tybundle/11tybundledb/bundledb.json"
 BUNDLEDB_BACKUP_DIR = "/Users/Bob/Dropbox/Docs/Sites/11tybundle/11tybundledb/bundledb-backups"
@@ -85,6 +107,9 @@ def _get_path(key):
         "BUNDLEDB_DIR": BUNDLEDB_DIR,
         "SVELTIACMS_SITES_PATH": SVELTIACMS_SITES_PATH,
         "STASH_PATH": STASH_PATH,
+        "POST_QUEUE_FILE": POST_QUEUE_FILE,
+        "POST_SCHEDULE_FILE": POST_SCHEDULE_FILE,
+        "ENGAGEMENT_FILE": ENGAGEMENT_FILE,
     }
     return app.config.get(key, defaults.get(key, ""))
 
@@ -102,6 +127,13 @@ def _create_backup_with_pruning(source_path, backup_dir, prefix, max_backups=25)
         os.remove(os.path.join(backup_dir, backups.pop(0)))
 
 
+# Held across every read-modify-write of history.json. Queue workers, the
+# scheduler, BWE batches and request threads all write it, and without the
+# lock two that finish together would each write back a list missing the
+# other's change.
+_history_lock = threading.Lock()
+
+
 def _read_history():
     path = _get_path("HISTORY_FILE")
     if not os.path.exists(path):
@@ -112,12 +144,15 @@ def _read_history():
 
 def _write_history(entries):
     path = _get_path("HISTORY_FILE")
-    with open(path, "w") as f:
+    # Write aside and rename, so a post finishing on another thread never reads half a file
+    tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    with open(tmp_path, "w") as f:
         json.dump(entries, f, indent=2)
+    os.replace(tmp_path, path)
 
 
 def save_post(text, platforms, link_url=None, image_count=0, is_draft=False, images=None,
-              mode=None, platform_texts=None):
+              mode=None, platform_texts=None, telemetry=None):
     """Prepend a new entry to history and write back."""
     entry = {
         "id": str(uuid.uuid4()),
@@ -132,9 +167,12 @@ def save_post(text, platforms, link_url=None, image_count=0, is_draft=False, ima
     if mode:
         entry["mode"] = mode
         entry["platform_texts"] = platform_texts
-    history = _read_history()
-    history.insert(0, entry)
-    _write_history(history)
+    if telemetry:
+        entry["telemetry"] = telemetry
+    with _history_lock:
+        history = _read_history()
+        history.insert(0, entry)
+        _write_history(history)
     return entry
 
 
@@ -188,7 +226,7 @@ def _resolve_modes(issue_number):
 
 @app.route("/social")
 def compose():
-    bwe_to_post, bwe_posted = get_bwe_lists()
+    bwe_to_post, bwe_posted = get_bwe_lists(posted_limit=10)
     recent = load_recent_posts()
     _annotate_bwe_with_drafts(bwe_to_post, recent)
     issue_counts = get_latest_issue_counts()
@@ -204,9 +242,252 @@ def compose():
         bwe_to_post=bwe_to_post,
         bwe_posted=bwe_posted,
         issue_counts=issue_counts,
+        scheduled_posts=[_scheduled_summary(e) for e in _get_post_scheduler().entries()],
+        engagement=_get_engagement().counts(recent),
+    )
+
+
+def _finish_post(results, attachments, draft_id_to_clean, text, link_url, mode, platform_texts,
+                 bwe_name="", bwe_url=""):
+    """Record a finished post: history entry, retry images, temp cleanup, BWE list.
+
+    If any platform failed and there were images, the images are copied to a
+    draft images dir and the entry is saved with ``is_failed`` for retry.
+    """
+    draft_images_dir = _get_path("DRAFT_IMAGES_DIR")
+
+    # Determine success/failure
+    any_failed = any(not r["success"] for r in results)
+    platform_entries = []
+    for r in results:
+        if r["success"]:
+            platform_entries.append({"name": r["platform"], "post_url": r.get("post_url", "")})
+    # Timing, bytes and error class of every platform's attempt, failed ones included
+    telemetry = {r["platform"]: r["telemetry"] for r in results if r.get("telemetry")}
+
+    if any_failed and attachments:
+        # Persist images for retry (same as draft image flow)
+        failed_id = str(uuid.uuid4())
+        failed_dir = os.path.join(draft_images_dir, failed_id)
+        failed_images = []
+
+        # Carry over draft images if present
+        if draft_id_to_clean:
+            src_dir = os.path.join(draft_images_dir, draft_id_to_clean)
+            for att in attachments:
+                if att.file_path.startswith(src_dir):
+                    fname = os.path.basename(att.file_path)
+                    os.makedirs(failed_dir, exist_ok=True)
+                    dest = os.path.join(failed_dir, fname)
+                    shutil.copy2(att.file_path, dest)
+                    failed_images.append({
+                        "filename": fname,
+                        "alt_text": att.alt_text,
+                        "mime_type": att.mime_type,
+                    })
+
+        # Save newly uploaded images
+        for att in attachments:
+            if att.file_path.startswith(config.UPLOAD_FOLDER):
+                fname = os.path.basename(att.file_path)
+                os.makedirs(failed_dir, exist_ok=True)
+                dest = os.path.join(failed_dir, fname)
+                shutil.copy2(att.file_path, dest)
+                failed_images.append({
+                    "filename": fname,
+                    "alt_text": att.alt_text,
+                    "mime_type": att.mime_type,
+                })
+
+        # Clean up originals
+        newly_uploaded = [a for a in attachments if a.file_path.startswith(config.UPLOAD_FOLDER)]
+        cleanup_uploads(newly_uploaded)
+        if draft_id_to_clean:
+            old_dir = os.path.join(draft_images_dir, draft_id_to_clean)
+            shutil.rmtree(old_dir, ignore_errors=True)
+
+        # Save failed entry with images for retry
+        entry = {
+            "id": failed_id,
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "text": text,
+            "platforms": platform_entries,
+            "link_url": link_url or None,
+            "image_count": len(failed_images),
+            "is_draft": False,
+            "is_failed": True,
+            "images": failed_images,
+        }
+        if mode:
+            entry["mode"] = mode
+            entry["platform_texts"] = platform_texts
+        if telemetry:
+            entry["telemetry"] = telemetry
+        with _history_lock:
+            history = _read_history()
+            history.insert(0, entry)
+            _write_history(history)
+    else:
+        # Clean up uploaded files (skip draft images — removed separately)
+        newly_uploaded = [a for a in attachments if a.file_path.startswith(config.UPLOAD_FOLDER)]
+        cleanup_uploads(newly_uploaded)
+
+        # Clean up draft images directory if we used any
+        if draft_id_to_clean:
+            draft_dir = os.path.join(draft_images_dir, draft_id_to_clean)
+            shutil.rmtree(draft_dir, ignore_errors=True)
+
+        # Save to history with platform results
+        save_post(
+            text=text,
+            platforms=platform_entries,
+            link_url=link_url,
+            image_count=len(attachments),
+            is_draft=False,
+            mode=mode,
+            platform_texts=platform_texts,
+            telemetry=telemetry,
+        )
+
+    # Update BWE list if this was a BWE mode post
+    if mode == "11ty-bwe" and bwe_name and bwe_url:
+        platform_letter_map = {"mastodon": "M", "bluesky": "B", "discord": "D", "discord_content": "C"}
+        posted_platforms = [
+            platform_letter_map[r["platform"]]
+            for r in results
+            if r["success"] and r["platform"] in platform_letter_map
+        ]
+        if posted_platforms:
+            timestamp = datetime.now(timezone.utc).isoformat()
+            update_bwe_after_post(bwe_name, bwe_url, posted_platforms, timestamp)
+
+
+def _payload_attachments(payload):
+    return [MediaAttachment(**image) for image in payload["images"]]
+
+
+def _run_queued_platforms(payload, platform_names):
+    """Post a queued payload to *platform_names* (the queue's run_platforms hook)."""
+    attachments = _payload_attachments(payload)
+    link_card = None
+    if payload["link_url"] and not attachments:
+        link_card = get_link_card(payload["link_url"])
+    jobs = build_jobs(platform_names, payload["text"], payload["platform_texts"], attachments,
+                      link_card, payload["content_warnings"])
+    return publish(jobs)
+
+
+def _complete_queued_post(job):
+    """Record a queued post once every platform has succeeded or given up."""
+    payload = job["payload"]
+    results = [
+        {"platform": name, "success": state["status"] == "success",
+         "post_url": state["post_url"], "error": state["error"],
+         "telemetry": dict(state["telemetry"], attempts=state["attempts"]) if state.get("telemetry") else None}
+        for name, state in job["platforms"].items()
+    ]
+    _finish_post(
+        results, _payload_attachments(payload), payload["draft_id_to_clean"], payload["text"],
+        payload["link_url"], payload["mode"], payload["platform_texts"],
+        payload["bwe_site_name"], payload["bwe_site_url"],
     )
 
 
+_post_queue = None
+
+
+def _get_post_queue():
+    """The app's post queue, rebuilt if POST_QUEUE_FILE has changed (tests)."""
+    global _post_queue
+    path = _get_path("POST_QUEUE_FILE")
+    if _post_queue is None or _post_queue.path != path:
+        if _post_queue is not None:
+            _post_queue.stop()
+        _post_queue = PostQueue(
+            path, _run_queued_platforms, on_complete=_complete_queued_post,
+            workers=app.config.get("POST_QUEUE_WORKERS", POST_QUEUE_WORKERS),
+        )
+    return _post_queue
+
+
+def _job_summary(job):
+    """The parts of a queue job the result page polls for."""
+    return {
+        "id": job["id"],
+        "status": job["status"],
+        "platforms": [
+            {"platform": name, "status": state["status"], "attempts": state["attempts"],
+             "post_url": state["post_url"], "error": state["error"]}
+            for name, state in job["platforms"].items()
+        ],
+    }
+
+
+def _parse_post_at(value):
+    """Epoch seconds for a ``post_at`` form value.
+
+    Accepts ISO 8601; a value without an offset (what ``datetime-local``
+    inputs send) is taken as the server's local time.
+    """
+    when = datetime.fromisoformat(value)
+    if when.tzinfo is None:
+        when = when.astimezone()
+    return when.timestamp()
+
+
+_post_scheduler = None
+
+
+def _get_post_scheduler():
+    """The app's post scheduler, rebuilt if POST_SCHEDULE_FILE has changed (tests).
+
+    Due posts go to the post queue. The scheduler thread runs only when the
+    queue has workers, so tests fire entries by hand with ``run_due()``.
+    Like the queue, it starts on first use or explicitly at startup.
+    """
+    global _post_scheduler
+    path = _get_path("POST_SCHEDULE_FILE")
+    if _post_scheduler is None or _post_scheduler.path != path:
+        if _post_scheduler is not None:
+            _post_scheduler.stop()
+        _post_scheduler = PostScheduler(
+            path, lambda entry: _get_post_queue().enqueue(entry["payload"], entry["platforms"]),
+            threaded=bool(app.config.get("POST_QUEUE_WORKERS", POST_QUEUE_WORKERS)),
+        )
+    return _post_scheduler
+
+
+_engagement = None
+
+
+def _get_engagement():
+    """The app's engagement collector, rebuilt if ENGAGEMENT_FILE has changed (tests).
+
+    Like the scheduler, its refresh thread runs only when the post queue
+    has workers; tests call ``refresh()`` or POST /engagement/refresh.
+    """
+    global _engagement
+    path = _get_path("ENGAGEMENT_FILE")
+    if _engagement is None or _engagement.path != path:
+        if _engagement is not None:
+            _engagement.stop()
+        _engagement = EngagementCollector(
+            path, _read_history,
+            threaded=bool(app.config.get("POST_QUEUE_WORKERS", POST_QUEUE_WORKERS)),
+        )
+    return _engagement
+
+
+def _scheduled_summary(entry):
+    when = datetime.fromtimestamp(entry["post_at"]).astimezone()
+    return {
+        "id": entry["id"],
+        "post_at": when.isoformat(),
+        "platforms": entry["platforms"],
+        "text": entry["payload"]["text"],
+    }
+
+
 @app.route("/post", methods=["POST"])
 def post():
     text = request.form.get("text", "").strip()
@@ -264,7 +545,7 @@ def post():
                         draft_images.append({
                             "filename": fname,
                             "alt_text": item.get("alt_text", ""),
-                            "mime_type": item.get("mime_type", get_mime_type(src)),
+                            "mime_type": item.get("mime_type") or get_mime_type(src),
                         })
             except (json.JSONDecodeError, KeyError):
                 pass
@@ -308,21 +589,22 @@ def post():
             entry["bwe_site_name"] = bwe_name
             entry["bwe_site_url"] = bwe_url
 
-        history = _read_history()
-
-        # Remove any existing BWE draft with the same URL
-        if mode == "11ty-bwe" and link_url:
-            for old in history:
-                if (old.get("is_draft") and old.get("mode") == "11ty-bwe"
-                        and old.get("link_url") == link_url):
-                    img_dir = os.path.join(draft_images_dir, old["id"])
-                    shutil.rmtree(img_dir, ignore_errors=True)
-            history = [e for e in history
-                       if not (e.get("is_draft") and e.get("mode") == "11ty-bwe"
-                               and e.get("link_url") == link_url)]
-
-        history.insert(0, entry)
-        _write_history(history)
+        with _history_lock:
+            history = _read_history()
+
+            # Remove any existing BWE draft with the same URL
+            if mode == "11ty-bwe" and link_url:
+                for old in history:
+                    if (old.get("is_draft") and old.get("mode") == "11ty-bwe"
+                            and old.get("link_url") == link_url):
+                        img_dir = os.path.join(draft_images_dir, old["id"])
+                        shutil.rmtree(img_dir, ignore_errors=True)
+                history = [e for e in history
+                           if not (e.get("is_draft") and e.get("mode") == "11ty-bwe"
+                                   and e.get("link_url") == link_url)]
+
+            history.insert(0, entry)
+            _write_history(history)
         return redirect(url_for("compose"))
 
     # --- Normal post path ---
@@ -353,179 +635,104 @@ def post():
                 alt = item.get("alt_text", "")
                 fpath = os.path.join(draft_images_dir, did, fname)
                 if os.path.exists(fpath):
-                    mime = get_mime_type(fpath)
-                    attachments.append(MediaAttachment(
-                        file_path=fpath,
-                        mime_type=mime,
-                        alt_text=alt,
-                    ))
+                    attachments.append(describe_image(fpath, alt))
                     draft_id_to_clean = did
         except (json.JSONDecodeError, KeyError):
             pass
 
+    bwe_name = request.form.get("bwe_site_name", "").strip()
+    bwe_url = request.form.get("bwe_site_url", "").strip()
+
+    # Pre-flight: drop platforms the post would fail on before anything is sent
+    accepted, rejected = preflight.check(platforms_selected, text, platform_texts, attachments, link_url)
+    if not accepted:
+        _finish_post(rejected, attachments, draft_id_to_clean, text, link_url, mode, platform_texts,
+                     bwe_name, bwe_url)
+        return render_template("result.html", results=rejected)
+
+    content_warnings = {
+        name: request.form.get(f"cw_{name}", "").strip() or None
+        for name in accepted
+    }
+
+    queue_payload = {
+        "text": text,
+        "platform_texts": platform_texts,
+        "link_url": link_url,
+        "content_warnings": content_warnings,
+        "images": [asdict(a) for a in attachments],
+        "draft_id_to_clean": draft_id_to_clean,
+        "mode": mode,
+        "bwe_site_name": bwe_name,
+        "bwe_site_url": bwe_url,
+    }
+
+    # Scheduled path: hold the post until post_at, then hand it to the queue
+    post_at_raw = request.form.get("post_at", "").strip()
+    if post_at_raw:
+        try:
+            post_at = _parse_post_at(post_at_raw)
+        except ValueError:
+            return render_template(
+                "result.html",
+                results=[{"platform": "error", "success": False, "error": f"Invalid post time: {post_at_raw}"}],
+            )
+        if post_at > datetime.now(timezone.utc).timestamp():
+            entry = _get_post_scheduler().schedule(queue_payload, accepted, post_at)
+            return render_template("result.html", results=rejected, scheduled=_scheduled_summary(entry))
+
+    # Background path: hand the post to the durable queue and return at once
+    if request.form.get("background") == "on":
+        job = _get_post_queue().enqueue(queue_payload, accepted)
+        return render_template("result.html", results=rejected, job=_job_summary(job))
+
     # Process link card
     link_card = None
     if link_url and not attachments:
-        link_card = fetch_og_metadata(link_url)
+        link_card = get_link_card(link_url)
 
-    results = []
-    for platform_name in platforms_selected:
-        try:
-            client = get_platform(platform_name)
-            if not client.validate_credentials():
-                results.append({
-                    "platform": platform_name,
-                    "success": False,
-                    "error": f"{platform_name} credentials not configured",
-                })
-                continue
-
-            # Platform-specific content warning
-            cw = None
-            if platform_name == "mastodon":
-                cw = request.form.get("cw_mastodon", "").strip() or None
-            elif platform_name == "bluesky":
-                cw = request.form.get("cw_bluesky", "").strip() or None
-            elif platform_name == "discord":
-                cw = request.form.get("cw_discord", "").strip() or None
-            elif platform_name == "discord_content":
-                cw = request.form.get("cw_discord_content", "").strip() or None
-
-            # For Bluesky, compress images if needed
-            media = attachments
-            if platform_name == "bluesky" and attachments:
-                for att in attachments:
-                    compressed_path = compress_for_bluesky(att.file_path, att.mime_type)
-                    if compressed_path != att.file_path:
-                        att.file_path = compressed_path
-
-            # Use per-platform text when mode is active
-            post_text = (platform_texts or {}).get(platform_name, text)
-            if platform_name == "mastodon" and link_card and link_card.url:
-                if link_card.url not in post_text:
-                    post_text = f"{post_text}\n\n{link_card.url}"
-
-            result = client.post(
-                text=post_text,
-                media=media if media else None,
-                content_warning=cw,
-                link_card=link_card if platform_name != "mastodon" else None,
-            )
-            results.append({
-                "platform": result.platform,
-                "success": result.success,
-                "post_url": result.post_url,
-                "error": result.error,
-            })
-        except Exception as e:
-            results.append({
-                "platform": platform_name,
-                "success": False,
-                "error": str(e),
-            })
+    # Fan out to every accepted platform concurrently; results keep selection order
+    jobs = build_jobs(accepted, text, platform_texts, attachments, link_card, content_warnings)
+    by_platform = {r["platform"]: r for r in rejected + publish(jobs)}
+    results = [by_platform[name] for name in platforms_selected if name in by_platform]
 
-    # Determine success/failure
-    any_failed = any(not r["success"] for r in results)
-    platform_entries = []
-    for r in results:
-        if r["success"]:
-            platform_entries.append({"name": r["platform"], "post_url": r.get("post_url", "")})
+    _finish_post(
+        results, attachments, draft_id_to_clean, text, link_url, mode, platform_texts,
+        bwe_name, bwe_url,
+    )
 
-    if any_failed and attachments:
-        # Persist images for retry (same as draft image flow)
-        failed_id = str(uuid.uuid4())
-        failed_dir = os.path.join(draft_images_dir, failed_id)
-        failed_images = []
+    return render_template("result.html", results=results)
 
-        # Carry over draft images if present
-        if draft_id_to_clean:
-            src_dir = os.path.join(draft_images_dir, draft_id_to_clean)
-            for att in attachments:
-                if att.file_path.startswith(src_dir):
-                    fname = os.path.basename(att.file_path)
-                    os.makedirs(failed_dir, exist_ok=True)
-                    dest = os.path.join(failed_dir, fname)
-                    shutil.copy2(att.file_path, dest)
-                    failed_images.append({
-                        "filename": fname,
-                        "alt_text": att.alt_text,
-                        "mime_type": att.mime_type,
-                    })
 
-        # Save newly uploaded images
-        for att in attachments:
-            if att.file_path.startswith(config.UPLOAD_FOLDER):
-                fname = os.path.basename(att.file_path)
-                os.makedirs(failed_dir, exist_ok=True)
-                dest = os.path.join(failed_dir, fname)
-                shutil.copy2(att.file_path, dest)
-                failed_images.append({
-                    "filename": fname,
-                    "alt_text": att.alt_text,
-                    "mime_type": att.mime_type,
-                })
+@app.route("/post/jobs/<job_id>")
+def post_job_status(job_id):
+    job = _get_post_queue().get(job_id)
+    if job is None:
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify(_job_summary(job))
 
-        # Clean up originals
-        newly_uploaded = [a for a in attachments if a.file_path.startswith(config.UPLOAD_FOLDER)]
-        cleanup_uploads(newly_uploaded)
-        if draft_id_to_clean:
-            old_dir = os.path.join(draft_images_dir, draft_id_to_clean)
-            shutil.rmtree(old_dir, ignore_errors=True)
 
-        # Save failed entry with images for retry
-        entry = {
-            "id": failed_id,
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-            "text": text,
-            "platforms": platform_entries,
-            "link_url": link_url or None,
-            "image_count": len(failed_images),
-            "is_draft": False,
-            "is_failed": True,
-            "images": failed_images,
-        }
-        if mode:
-            entry["mode"] = mode
-            entry["platform_texts"] = platform_texts
-        history = _read_history()
-        history.insert(0, entry)
-        _write_history(history)
-    else:
-        # Clean up uploaded files (skip draft images — removed separately)
-        newly_uploaded = [a for a in attachments if a.file_path.startswith(config.UPLOAD_FOLDER)]
-        cleanup_uploads(newly_uploaded)
+@app.route("/post/scheduled")
+def scheduled_posts():
+    return jsonify([_scheduled_summary(e) for e in _get_post_scheduler().entries()])
 
-        # Clean up draft images directory if we used any
-        if draft_id_to_clean:
-            draft_dir = os.path.join(draft_images_dir, draft_id_to_clean)
-            shutil.rmtree(draft_dir, ignore_errors=True)
 
-        # Save to history with platform results
-        save_post(
-            text=text,
-            platforms=platform_entries,
-            link_url=link_url,
-            image_count=len(attachments),
-            is_draft=False,
-            mode=mode,
-            platform_texts=platform_texts,
-        )
+@app.route("/post/scheduled/<entry_id>/cancel", methods=["POST"])
+def cancel_scheduled_post(entry_id):
+    entry = _get_post_scheduler().cancel(entry_id)
+    if entry is not None:
+        # Draft images stay put: the draft dir is only removed once a post completes
+        cleanup_uploads([a for a in _payload_attachments(entry["payload"])
+                         if a.file_path.startswith(config.UPLOAD_FOLDER)])
+    return redirect(url_for("compose"))
 
-    # Update BWE list if this was a BWE mode post
-    bwe_name = request.form.get("bwe_site_name", "").strip()
-    bwe_url = request.form.get("bwe_site_url", "").strip()
-    if mode == "11ty-bwe" and bwe_name and bwe_url:
-        platform_letter_map = {"mastodon": "M", "bluesky": "B", "discord": "D", "discord_content": "C"}
-        posted_platforms = [
-            platform_letter_map[r["platform"]]
-            for r in results
-            if r["success"] and r["platform"] in platform_letter_map
-        ]
-        if posted_platforms:
-            timestamp = datetime.now(timezone.utc).isoformat()
-            update_bwe_after_post(bwe_name, bwe_url, posted_platforms, timestamp)
 
-    return render_template("result.html", results=results)
+@app.route("/engagement/refresh", methods=["POST"])
+def refresh_engagement():
+    """Fetch engagement counts that are due now, and return the recent posts' counts."""
+    collector = _get_engagement()
+    report = collector.refresh()
+    return jsonify({**report, "counts": collector.counts(load_recent_posts())})
 
 
 @app.route("/draft-image/<draft_id>/<filename>")
@@ -536,19 +743,20 @@ def draft_image(draft_id, filename):
 
 @app.route("/draft/<draft_id>")
 def use_draft(draft_id):
-    history = _read_history()
-    draft = None
-    remaining = []
-    for entry in history:
-        if entry["id"] == draft_id and entry.get("is_draft"):
-            draft = entry
-        else:
-            remaining.append(entry)
-    if draft is None:
-        return redirect(url_for("compose"))
-    # Remove the draft from history
-    _write_history(remaining)
-    bwe_to_post, bwe_posted = get_bwe_lists()
+    with _history_lock:
+        history = _read_history()
+        draft = None
+        remaining = []
+        for entry in history:
+            if entry["id"] == draft_id and entry.get("is_draft"):
+                draft = entry
+            else:
+                remaining.append(entry)
+        if draft is None:
+            return redirect(url_for("compose"))
+        # Remove the draft from history
+        _write_history(remaining)
+    bwe_to_post, bwe_posted = get_bwe_lists(posted_limit=10)
     recent = load_recent_posts()
     _annotate_bwe_with_drafts(bwe_to_post, recent)
     issue_counts = get_latest_issue_counts()
@@ -569,19 +777,20 @@ def use_draft(draft_id):
 
 @app.route("/retry/<post_id>")
 def retry_post(post_id):
-    history = _read_history()
-    failed = None
-    remaining = []
-    for entry in history:
-        if entry["id"] == post_id and (entry.get("is_failed") or (not entry.get("is_draft") and not entry.get("platforms"))):
-            failed = entry
-        else:
-            remaining.append(entry)
-    if failed is None:
-        return redirect(url_for("compose"))
-    # Remove the failed entry from history
-    _write_history(remaining)
-    bwe_to_post, bwe_posted = get_bwe_lists()
+    with _history_lock:
+        history = _read_history()
+        failed = None
+        remaining = []
+        for entry in history:
+            if entry["id"] == post_id and (entry.get("is_failed") or (not entry.get("is_draft") and not entry.get("platforms"))):
+                failed = entry
+            else:
+                remaining.append(entry)
+        if failed is None:
+            return redirect(url_for("compose"))
+        # Remove the failed entry from history
+        _write_history(remaining)
+    bwe_to_post, bwe_posted = get_bwe_lists(posted_limit=10)
     recent = load_recent_posts()
     _annotate_bwe_with_drafts(bwe_to_post, recent)
     issue_counts = get_latest_issue_counts()
@@ -610,17 +819,130 @@ def delete_post(post_id):
     return _delete_entry(post_id)
 
 
-def _delete_entry(entry_id):
-    history = _read_history()
-    remaining = []
-    for entry in history:
-        if entry["id"] == entry_id:
-            # Clean up any persisted images
-            img_dir = os.path.join(_get_path("DRAFT_IMAGES_DIR"), entry_id)
-            shutil.rmtree(img_dir, ignore_errors=True)
+def _request_values():
+    """``(json_body, values)``: the JSON object sent, or None, and the values to read (JSON or form)."""
+    data = request.get_json(silent=True)
+    return (data, data) if isinstance(data, dict) else (None, request.form)
+
+
+@app.route("/post/<post_id>/remote-delete", methods=["POST"])
+def remote_delete_post(post_id):
+    """Delete a published post from the platforms it reached, concurrently.
+
+    ``platforms`` limits it to some of them. Platforms where the post is
+    gone (deleted now, or already) are dropped from the history entry, and
+    the entry is removed once none are left. Bluesky goes through the pooled
+    client, so it reuses the cached session.
+    """
+    data, _ = _request_values()
+    entry = next((e for e in _read_history() if e["id"] == post_id), None)
+    if entry is None or entry.get("is_draft"):
+        return jsonify({"error": "Post not found"}), 404
+    selected = (data.get("platforms") if data else request.form.getlist("platforms")) or None
+    if selected is not None and not (isinstance(selected, list) and all(isinstance(n, str) for n in selected)):
+        return jsonify({"error": "platforms must be a list of platform names"}), 400
+    targets = [p for p in entry["platforms"] if selected is None or p["name"] in selected]
+
+    results = publish(remote_jobs("delete", targets), run=update_platform)
+
+    deleted = {r["platform"] for r in results if r["success"]}
+    if deleted:
+        with _history_lock:
+            history = []
+            for current in _read_history():
+                if current["id"] == post_id:
+                    current["platforms"] = [p for p in current["platforms"] if p["name"] not in deleted]
+                    if not current["platforms"]:
+                        _remove_entry_images(post_id)
+                        continue
+                history.append(current)
+            _write_history(history)
+
+    if data is not None:
+        return jsonify({"results": results})
+    return render_template("result.html", results=results)
+
+
+def _shown_texts(entry):
+    """``{platform: text}`` for the text each of a history entry's platforms shows."""
+    platform_texts = entry.get("platform_texts") or {}
+    return {p["name"]: platform_texts.get(p["name"]) or entry["text"] for p in entry["platforms"]}
+
+
+@app.route("/post/<post_id>/edit", methods=["POST"])
+def edit_post(post_id):
+    """Edit a published post's text on the platforms that support edits.
+
+    Takes ``text_<platform>`` fields (JSON: ``platform_texts``), falling back
+    to ``text`` for every platform. Platforms whose text is unchanged are left
+    alone. Each new text goes through the pre-flight length checks first;
+    Bluesky has no edits and reports so. The history entry records what each
+    platform now shows; ``text`` changes only when every platform was edited.
+    """
+    data, values = _request_values()
+    entry = next((e for e in _read_history() if e["id"] == post_id), None)
+    if entry is None or entry.get("is_draft"):
+        return jsonify({"error": "Post not found"}), 404
+    text = (values.get("text") or "").strip()
+    given_texts = (data.get("platform_texts") or {}) if data else {}
+    if not isinstance(given_texts, dict):
+        return jsonify({"error": "platform_texts must be an object"}), 400
+    new_texts = {}
+    for name, current_text in _shown_texts(entry).items():
+        given = given_texts.get(name) if data else values.get(f"text_{name}")
+        new_text = str(given or "").strip() or text
+        if new_text and new_text != current_text:
+            new_texts[name] = new_text
+
+    rejected = []
+    sent_texts = {}
+    for name, new_text in new_texts.items():
+        sent = preflight.platform_text(name, new_text, link_url=entry.get("link_url") or "")
+        errors = preflight.platform_errors(name, sent)
+        if errors:
+            rejected.append({"platform": name, "success": False, "error": "Not edited: " + "; ".join(errors)})
         else:
-            remaining.append(entry)
-    _write_history(remaining)
+            sent_texts[name] = sent
+    targets = [p for p in entry["platforms"] if p["name"] in sent_texts]
+    edited = publish(remote_jobs("edit", targets, sent_texts), run=update_platform)
+    by_platform = {r["platform"]: r for r in rejected + edited}
+    results = [by_platform[p["name"]] for p in entry["platforms"] if p["name"] in by_platform]
+
+    done = [r["platform"] for r in edited if r["success"]]
+    if done:
+        with _history_lock:
+            history = _read_history()
+            for current in history:
+                if current["id"] == post_id:
+                    texts = _shown_texts(current)
+                    for name in done:
+                        texts[name] = new_texts[name]
+                    if current.get("platform_texts") or len(set(texts.values())) > 1:
+                        current["platform_texts"] = texts
+                    if set(done) == set(texts):
+                        current["text"] = text or new_texts[done[0]]
+                    current["edited_at"] = datetime.now(timezone.utc).isoformat()
+            _write_history(history)
+
+    if data is not None:
+        return jsonify({"results": results})
+    return render_template("result.html", results=results)
+
+
+def _remove_entry_images(entry_id):
+    """Remove the persisted images of a history entry, if it has any."""
+    shutil.rmtree(os.path.join(_get_path("DRAFT_IMAGES_DIR"), entry_id), ignore_errors=True)
+
+
+def _delete_entry(entry_id):
+    with _history_lock:
+        remaining = []
+        for entry in _read_history():
+            if entry["id"] == entry_id:
+                _remove_entry_images(entry_id)
+            else:
+                remaining.append(entry)
+        _write_history(remaining)
     return redirect(url_for("compose"))
 
 
@@ -631,26 +953,23 @@ def link_preview():
     if not url:
         return jsonify({"error": "No URL provided"}), 400
 
-    card = fetch_og_metadata(url)
+    card = get_link_card(url)
     result = {
         "title": card.title,
         "description": card.description,
         "image_url": card.image_url,
     }
 
-    # Verify OG image dimensions for bobmonsour.com links
+    # Verify OG image dimensions for bobmonsour.com links (recorded before the
+    # card's thumbnail was normalized)
     if "bobmonsour.com" in url and card.image_data:
-        from io import BytesIO
-        from PIL import Image as PILImage
-        try:
-            img = PILImage.open(BytesIO(card.image_data))
-            w, h = img.size
-            if abs(w - 1200) > 50 or abs(h - 630) > 50:
-                result["og_warning"] = (
-                    f"OG image is {w}x{h}px (expected ~1200x630)"
-                )
-        except Exception:
+        w, h = card.image_width, card.image_height
+        if not (w and h):
             result["og_warning"] = "Could not read OG image dimensions"
+        elif abs(w - 1200) > 50 or abs(h - 630) > 50:
+            result["og_warning"] = (
+                f"OG image is {w}x{h}px (expected ~1200x630)"
+            )
 
     return jsonify(result)
 
@@ -767,6 +1086,95 @@ def delete_bwe_posted_entry():
     return redirect(url_for("compose"))
 
 
+@app.route("/bwe/bulk", methods=["POST"])
+def bwe_bulk():
+    """Add, remove, re-platform or mark-posted many BWE entries in one write."""
+    payload = request.get_json(silent=True)
+    if payload is not None and not isinstance(payload, dict):
+        return jsonify({"error": "Request body must be a JSON object"}), 400
+    operations = payload.get("operations") if payload else None
+    if not isinstance(operations, list) or not operations:
+        return jsonify({"error": "No operations provided"}), 400
+    for i, operation in enumerate(operations):
+        error = operation_error(operation)
+        if error:
+            return jsonify({"error": f"Operation {i}: {error}"}), 400
+
+    timestamp = datetime.now(timezone.utc).isoformat()
+    results = apply_bwe_operations(operations, timestamp=timestamp)
+    bwe = load_bwe()
+    return jsonify({
+        "success": True,
+        "applied": sum(1 for r in results if r["ok"]),
+        "results": results,
+        "to_post_count": len(bwe.to_post),
+        "posted_count": len(bwe.posted),
+    })
+
+
+def _site_mentions(site_url):
+    """@-mentions for a site: bundledb first, then the site's own HTML (as /social-links)."""
+    return _lookup_social_links_from_bundledb(site_url) or extract_social_links(site_url)
+
+
+@app.route("/bwe/batch-post", methods=["POST"])
+def bwe_batch_post():
+    """Schedule the next ``count`` BWE sites to post now, one post per site.
+
+    Every post is due at once; the scheduler keeps each platform's minimum
+    gap between them, and each site is recorded in the BWE list when its
+    post finishes. Sites already queued or without platforms are skipped,
+    as are platforms whose text fails the pre-flight checks. A JSON request
+    gets a JSON report (``dry_run`` previews the texts); the sidebar form is
+    redirected back to compose.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    data = request.get_json(silent=True)
+    values = data if isinstance(data, dict) else request.form
+    try:
+        count = int(values.get("count", 1))
+    except (TypeError, ValueError):
+        count = 0
+    if count < 1:
+        return jsonify({"error": "count must be a positive integer"}), 400
+
+    scheduler = _get_post_scheduler()
+    pending = bwe_batch.pending_site_urls(_get_post_queue().jobs() + scheduler.entries())
+    to_post, _ = get_bwe_lists(posted_limit=0)
+    sites, skipped = bwe_batch.select_sites(to_post, count, pending)
+
+    # Mention lookups may scrape each site, so run them side by side
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        mentions = list(executor.map(_site_mentions, [site["url"] for site in sites]))
+
+    mode = get_mode("11ty-bwe")
+    dry_run = bool(data and data.get("dry_run"))
+    now = datetime.now(timezone.utc).timestamp()
+    posts = []
+    for site, site_mentions in zip(sites, mentions):
+        platform_names = bwe_batch.site_platforms(site)
+        link_url = showcase_url_for_site(site["url"]) or site["url"]
+        payload = bwe_batch.build_payload(site, platform_names, "11ty-bwe", mode, link_url, site_mentions)
+        accepted, rejected = preflight.check(platform_names, payload["text"], payload["platform_texts"],
+                                             link_url=link_url)
+        if not accepted:
+            skipped.append({"name": site["name"], "url": site["url"],
+                            "reason": "; ".join(r["error"] for r in rejected)})
+            continue
+        summary = {"name": site["name"], "url": site["url"], "platforms": accepted,
+                   "platform_texts": payload["platform_texts"]}
+        if rejected:
+            summary["rejected"] = rejected
+        if not dry_run:
+            summary["id"] = scheduler.schedule(payload, accepted, now)["id"]
+        posts.append(summary)
+
+    if data is None:
+        return redirect(url_for("compose"))
+    return jsonify({"success": True, "dry_run": dry_run, "posts": posts, "skipped": skipped})
+
+
 @app.route("/")
 def home():
     issue_counts = get_latest_issue_counts()
@@ -775,10 +1183,10 @@ def home():
         try:
             with open(_get_path("SVELTIACMS_SITES_PATH"), "r") as f:
                 queue = json.load(f)
-            for entry in queue:
-                if not entry.get("skip"):
-                    sveltiacms_prefill = entry
-                    break
+            pending = [entry for entry in queue if not entry.get("skip")]
+            if pending:
+                sveltiacms_prefill = pending[0]
+                _prefetch_queue(pending, "url")
         except (FileNotFoundError, json.JSONDecodeError):
             pass
     stash_count = 0
@@ -820,6 +1228,41 @@ def editor_stash():
     return jsonify({"success": True, "count": len(stash)})
 
 
+@app.route("/editor/stash/bulk", methods=["POST"])
+def editor_stash_bulk():
+    """Stash many entries from an uploaded CSV, NDJSON or OPML file in one write.
+
+    Links already in bundledb, showcase-data or the stash are dropped. The
+    format comes from the ``format`` field, else the filename or content type.
+    """
+    from xml.etree.ElementTree import ParseError
+    from services.stash_ingest import DEFAULT_TYPE, guess_format, ingest
+
+    upload = request.files.get("file")
+    if upload:
+        stream = upload.stream
+        fmt = request.form.get("format") or guess_format(upload.filename, upload.mimetype)
+    else:
+        stream = request.stream
+        fmt = request.args.get("format") or guess_format(content_type=request.content_type)
+    if not fmt:
+        return jsonify({"error": "Could not determine input format (csv, ndjson or opml)"}), 400
+
+    default_type = request.values.get("type") or DEFAULT_TYPE
+    try:
+        report = ingest(
+            stream, fmt,
+            stash_path=_get_path("STASH_PATH"),
+            bundledb_path=_get_path("BUNDLEDB_PATH"),
+            showcase_path=_get_path("SHOWCASE_PATH"),
+            default_type=default_type,
+        )
+    except (ValueError, ParseError, UnicodeDecodeError, csv.Error) as e:
+        return jsonify({"error": str(e)}), 400
+
+    return jsonify({"success": True, **report})
+
+
 @app.route("/editor/stash/next")
 def editor_stash_next():
     """Return the first stashed entry (FIFO)."""
@@ -832,6 +1275,8 @@ def editor_stash_next():
 
     if not stash:
         return jsonify({"entry": None, "count": 0})
+    # Warm the entry being opened and the next few behind it
+    _prefetch_queue(stash, "link", "type")
     return jsonify({"entry": stash[0], "count": len(stash)})
 
 
@@ -863,11 +1308,7 @@ def editor_check_url():
     if not url:
         return jsonify({"error": "No URL provided"}), 400
 
-    # Normalize: lowercase, strip trailing slashes, ensure protocol, strip www.
-    normalized = url.lower().rstrip("/")
-    if not normalized.startswith(("http://", "https://")):
-        normalized = "https://" + normalized
-    normalized = re.sub(r"^(https?://)www\.", r"\1", normalized)
+    normalized = normalize_link(url)
 
     results = []
 
@@ -876,11 +1317,7 @@ def editor_check_url():
         with open(_get_path("BUNDLEDB_PATH"), "r") as f:
             bundledb = json.load(f)
         for entry in bundledb:
-            entry_link = (entry.get("Link") or "").strip().lower().rstrip("/")
-            if not entry_link.startswith(("http://", "https://")):
-                entry_link = "https://" + entry_link
-            entry_link = re.sub(r"^(https?://)www\.", r"\1", entry_link)
-            if entry_link == normalized:
+            if normalize_link(entry.get("Link")) == normalized:
                 results.append({
                     "source": "bundledb.json",
                     "type": entry.get("Type", ""),
@@ -895,11 +1332,7 @@ def editor_check_url():
         with open(_get_path("SHOWCASE_PATH"), "r") as f:
             showcase = json.load(f)
         for entry in showcase:
-            entry_link = (entry.get("link") or "").strip().lower().rstrip("/")
-            if not entry_link.startswith(("http://", "https://")):
-                entry_link = "https://" + entry_link
-            entry_link = re.sub(r"^(https?://)www\.", r"\1", entry_link)
-            if entry_link == normalized:
+            if normalize_link(entry.get("link")) == normalized:
                 results.append({
                     "source": "showcase-data.json",
                     "title": entry.get("title", ""),
@@ -924,24 +1357,17 @@ def editor_data():
         showcase_list = []
 
     # Build normalized link set from bundledb for matching
-    def _normalize_link(url):
-        s = (url or "").strip().lower().rstrip("/")
-        if s and not s.startswith(("http://", "https://")):
-            s = "https://" + s
-        s = re.sub(r"^(https?://)www\.", r"\1", s)
-        return s
-
     bundledb_links = set()
     for item in data:
-        link = _normalize_link(item.get("Link", ""))
+        link = normalize_link(item.get("Link", ""))
         if link:
             bundledb_links.add(link)
 
     # Tag bundledb entries with _origin and merge showcase fields for sites
-    showcase_by_link = {_normalize_link(e.get("link", "")): e for e in showcase_list if e.get("link")}
+    showcase_by_link = {normalize_link(e.get("link", "")): e for e in showcase_list if e.get("link")}
     for item in data:
         if item.get("Type") == "site" and item.get("Link"):
-            sc = showcase_by_link.get(_normalize_link(item["Link"]))
+            sc = showcase_by_link.get(normalize_link(item["Link"]))
             if sc:
                 item["screenshotpath"] = sc.get("screenshotpath", "")
                 item["leaderboardLink"] = sc.get("leaderboardLink", "")
@@ -954,7 +1380,7 @@ def editor_data():
     # Build showcase_only array: entries in showcase not in bundledb
     showcase_only = []
     for i, sc in enumerate(showcase_list):
-        sc_link = _normalize_link(sc.get("link", ""))
+        sc_link = normalize_link(sc.get("link", ""))
         if sc_link and sc_link not in bundledb_links:
             entry = {
                 "Title": sc.get("title", ""),
@@ -1385,6 +1811,59 @@ def editor_delete_test_entries():
     })
 
 
+# ===== Editor metadata prefetch =====
+
+# How many queued stash / SveltiaCMS entries to warm ahead of the editor.
+PREFETCH_AHEAD = 3
+
+
+def _fetch_favicon(url):
+    from services.favicon import fetch_favicon
+    return fetch_favicon(url)
+
+
+def _fetch_description(url):
+    from services.description import extract_description
+    return extract_description(url)
+
+
+def _fetch_leaderboard(url):
+    from services.leaderboard import check_leaderboard_link
+    return check_leaderboard_link(url)
+
+
+def _fetch_content_review(url):
+    from services.content_review import review_content
+    return review_content(url)
+
+
+def _capture_screenshot(url):
+    """Run the screenshot script for *url* and return its JSON output."""
+    result = subprocess.run(
+        ["node", SCREENSHOT_SCRIPT, url],
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+    return json.loads(result.stdout.strip())
+
+
+# Read-only lookups only; screenshots and content reviews run when the editor asks
+prefetcher = MetadataPrefetcher({
+    "favicon": _fetch_favicon,
+    "description": _fetch_description,
+    "leaderboard": _fetch_leaderboard,
+})
+
+
+def _prefetch_queue(entries, url_key, type_key=None):
+    """Start background lookups for the first PREFETCH_AHEAD queued entries."""
+    ahead = app.config.get("PREFETCH_AHEAD", PREFETCH_AHEAD)
+    for entry in entries[:ahead]:
+        kinds = kinds_for_type(entry.get(type_key)) if type_key else SITE_KINDS
+        prefetcher.warm(entry.get(url_key), kinds)
+
+
 @app.route("/editor/favicon", methods=["POST"])
 def editor_favicon():
     data = request.get_json()
@@ -1392,8 +1871,7 @@ def editor_favicon():
     if not url:
         return jsonify({"success": False, "error": "No URL provided"}), 400
 
-    from services.favicon import fetch_favicon
-    result = fetch_favicon(url)
+    result = prefetcher.get("favicon", url, refresh=bool(data.get("refresh")))
     if result:
         return jsonify({"success": True, "favicon": result})
     return jsonify({"success": False, "error": "Could not fetch favicon"})
@@ -1407,15 +1885,14 @@ def editor_author_info():
     if not url:
         return jsonify({"success": False, "error": "No URL provided"}), 400
 
-    from services.description import extract_description
     from services.social_links import extract_social_links
-    from services.favicon import fetch_favicon
     from services.rss_link import extract_rss_link
 
+    refresh = bool(data.get("refresh"))
     result = {"success": True}
-    result["description"] = extract_description(url) or ""
+    result["description"] = prefetcher.get("description", url, refresh=refresh) or ""
     result["socialLinks"] = extract_social_links(url) or {}
-    result["favicon"] = fetch_favicon(url) or ""
+    result["favicon"] = prefetcher.get("favicon", url, refresh=refresh) or ""
     result["rssLink"] = extract_rss_link(url) or ""
     return jsonify(result)
 
@@ -1427,8 +1904,7 @@ def editor_description():
     if not url:
         return jsonify({"success": False, "error": "No URL provided"}), 400
 
-    from services.description import extract_description
-    description = extract_description(url)
+    description = prefetcher.get("description", url, refresh=bool(data.get("refresh")))
     if description:
         return jsonify({"success": True, "description": description})
     return jsonify({"success": False, "error": "Could not extract description"})
@@ -1442,8 +1918,7 @@ def editor_content_review():
     if not url:
         return jsonify({"success": False, "error": "No URL provided"}), 400
 
-    from services.content_review import review_content
-    result = review_content(url)
+    result = _fetch_content_review(url)
 
     # Add to allowlist if cleared (not flagged, no error)
     if not result.get("flagged") and not result.get("error"):
@@ -1462,8 +1937,7 @@ def editor_leaderboard():
     if not url:
         return jsonify({"success": False, "error": "No URL provided"}), 400
 
-    from services.leaderboard import check_leaderboard_link
-    result = check_leaderboard_link(url)
+    result = prefetcher.get("leaderboard", url, refresh=bool(data.get("refresh")))
     return jsonify({"success": True, "leaderboard_link": result})
 
 
@@ -1475,13 +1949,7 @@ def editor_screenshot():
         return jsonify({"success": False, "error": "No URL provided"}), 400
 
     try:
-        result = subprocess.run(
-            ["node", SCREENSHOT_SCRIPT, url],
-            capture_output=True,
-            text=True,
-            timeout=60,
-        )
-        output = json.loads(result.stdout.strip())
+        output = _capture_screenshot(url)
         return jsonify(output)
     except subprocess.TimeoutExpired:
         return jsonify({"success": False, "error": "Screenshot timed out"})
@@ -1573,7 +2041,6 @@ ELEVENTY_PROJECT_DIR = "/Users/Bob/Dropbox/Docs/Sites/11tybundle/11tybundle.dev"
 def editor_run_latest():
     """Start 'npm run latest' in the 11tybundle.dev project and wait for the server to be ready."""
     import select
-    import threading
 
     try:
         # Kill any existing processes on ports 8080-8083
@@ -1818,7 +2285,9 @@ def db_mgmt():
             sveltiacms_count = sum(1 for s in json.load(f) if not s.get("skip"))
     except (FileNotFoundError, json.JSONDecodeError):
         pass
-    return render_template("db_mgmt.html", stats=stats, backup_info=backup_info, sveltiacms_count=sveltiacms_count)
+    posting_stats = post_telemetry.summarize(_read_history())
+    return render_template("db_mgmt.html", stats=stats, backup_info=backup_info, sveltiacms_count=sveltiacms_count,
+                           posting_stats=posting_stats)
 
 
 @app.route("/db-mgmt/commits")
@@ -2044,9 +2513,10 @@ def db_mgmt_sveltiacms_next():
     try:
         with open(_get_path("SVELTIACMS_SITES_PATH"), "r") as f:
             queue = json.load(f)
-        for entry in queue:
-            if not entry.get("skip"):
-                return jsonify(entry)
+        pending = [entry for entry in queue if not entry.get("skip")]
+        if pending:
+            _prefetch_queue(pending, "url")
+            return jsonify(pending[0])
     except (FileNotFoundError, json.JSONDecodeError):
         pass
     return jsonify({"error": "No queued sites"}), 404
@@ -2056,4 +2526,18 @@ if __name__ == "__main__":
     os.makedirs(config.UPLOAD_FOLDER, exist_ok=True)
     os.makedirs(os.path.join(_BASE_DIR, "posts"), exist_ok=True)
     os.makedirs(DRAFT_IMAGES_DIR, exist_ok=True)
+    # Reclaim draft image dirs orphaned by a crash mid-save; capped so a large
+    # backlog never delays startup (the next start picks up the rest).
+    print(format_report(collect_orphaned_draft_images(
+        HISTORY_FILE, DRAFT_IMAGES_DIR, time_budget=2.0,
+        queue_path=POST_QUEUE_FILE, schedule_path=POST_SCHEDULE_FILE,
+    )))
+    prune_derivatives()
+    card_cache.prune()
+    # Resume queued and scheduled posts left over from the last run, in the
+    # reloader's serving process only (debug mode runs this block in the parent too)
+    if os.environ.get("WERKZEUG_RUN_MAIN") == "true":
+        _get_post_queue().start()
+        _get_post_scheduler().start()
+        _get_engagement().start()
     app.run(host="127.0.0.1", port=5555, debug=True)
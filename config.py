@@ -8,6 +8,11 @@ MASTODON_ACCESS_TOKEN = os.getenv("MASTODON_ACCESS_TOKEN", "")
 
 BLUESKY_IDENTIFIER = os.getenv("BLUESKY_IDENTIFIER", "")
 BLUESKY_APP_PASSWORD = os.getenv("BLUESKY_APP_PASSWORD", "")
+# PDS to talk to; empty means atproto's default (bsky.social)
+BLUESKY_PDS_URL = os.getenv("BLUESKY_PDS_URL", "").rstrip("/")
+# Persisted atproto session (access/refresh JWTs) so restarts refresh instead of logging in
+BLUESKY_SESSION_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "posts", "bluesky-session.json")
+BLUESKY_HANDLE_CACHE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "posts", "bluesky-handles.json")
 
 DISCORD_WEBHOOK_URL = os.getenv("DISCORD_WEBHOOK_URL", "")
 DISCORD_GUILD_ID = os.getenv("DISCORD_GUILD_ID", "")
@@ -18,9 +23,16 @@ DISCORD_GUILD_ID_CONTENT = os.getenv("DISCORD_GUILD_ID_CONTENT", "")
 ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY", "")
 
 UPLOAD_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "uploads")
+# Per-platform image variants, named <sha256>-<profile>.jpg so retries reuse them
+MEDIA_DERIVATIVES_DIR = os.path.join(UPLOAD_FOLDER, "derivatives")
+MEDIA_DERIVATIVES_MAX_AGE = 7 * 24 * 3600
+# OG images behind the link-card cache (services.link_card)
+LINK_CARD_CACHE_DIR = os.path.join(UPLOAD_FOLDER, "link-cards")
 MAX_IMAGES = 4
 ALLOWED_EXTENSIONS = {"png", "jpg", "jpeg", "gif", "webp"}
 BLUESKY_MAX_IMAGE_SIZE = 1_000_000  # 1MB
+# Refuse to post images without alt text (pre-flight check in services.preflight)
+REQUIRE_ALT_TEXT = os.getenv("REQUIRE_ALT_TEXT", "").lower() in ("1", "true", "yes")
 
 
 def mastodon_configured():
@@ -1,3 +1,5 @@
+import threading
+
 from platforms.mastodon_client import MastodonClient
 from platforms.bluesky_client import BlueskyClient
 from platforms.discord_client import DiscordClient
@@ -10,9 +12,25 @@ PLATFORMS = {
     "discord_content": DiscordContentClient,
 }
 
+# Process-wide client registry: one long-lived, already-authenticated client per
+# platform, so posts and retries reuse sessions instead of logging in each time.
+_clients = {}
+_clients_lock = threading.Lock()
+
 
 def get_platform(name):
     cls = PLATFORMS.get(name)
     if cls is None:
         raise ValueError(f"Unknown platform: {name}")
-    return cls()
+    with _clients_lock:
+        client = _clients.get(name)
+        if client is None or type(client) is not cls:
+            client = cls()
+            _clients[name] = client
+        return client
+
+
+def reset_platforms():
+    """Drop all pooled clients; the next get_platform() call builds fresh ones."""
+    with _clients_lock:
+        _clients.clear()
@@ -1,13 +1,25 @@
+import time
+import unicodedata
 from abc import ABC, abstractmethod
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
+from contextlib import contextmanager
 from dataclasses import dataclass, field
 from typing import Optional
 
+import requests
+
+MAX_PARALLEL_UPLOADS = 4
+
 
 @dataclass
 class MediaAttachment:
     file_path: str
     mime_type: str
     alt_text: str = ""
+    # From the file's header when it was saved (0 if unknown); JPEG sizes are before EXIF rotation
+    width: int = 0
+    height: int = 0
+    size: int = 0
 
 
 @dataclass
@@ -18,6 +30,9 @@ class LinkCard:
     image_url: str = ""
     image_data: bytes = field(default=b"", repr=False)
     image_mime: str = ""
+    # Dimensions of the og:image as served, before thumbnail normalization
+    image_width: int = 0
+    image_height: int = 0
 
 
 @dataclass
@@ -26,11 +41,83 @@ class PostResult:
     success: bool
     post_url: str = ""
     error: str = ""
+    # Telemetry for this attempt: seconds per phase ("auth", "upload", "create", ...),
+    # bytes sent as media, and requests the client retried itself (e.g. on a 429)
+    phases: dict = field(default_factory=dict)
+    bytes_uploaded: int = 0
+    retries: int = 0
+    # Coarse class of a failure, from the exception type or HTTP status (see
+    # PlatformClient.error_class); "" leaves it to the error message
+    error_class: str = ""
+
+
+def status_error_class(status):
+    """The error class of an HTTP *status* code ("" if it is not an error status)."""
+    if status == 429:
+        return "rate_limit"
+    if status in (401, 403):
+        return "auth"
+    if 500 <= status <= 599:
+        return "server"
+    if 400 <= status <= 499:
+        return "client"
+    return ""
+
+
+_CR, _LF, _ZWJ = "\r", "\n", "\u200d"
+
+
+def _extends(ch):
+    """True if *ch* never starts a grapheme cluster (marks, ZWJ, selectors, modifiers, tags)."""
+    cp = ord(ch)
+    return (
+        unicodedata.category(ch) in ("Mn", "Me", "Mc")
+        or ch == _ZWJ
+        or 0xFE00 <= cp <= 0xFE0F or 0xE0100 <= cp <= 0xE01EF  # variation selectors
+        or 0x1F3FB <= cp <= 0x1F3FF  # emoji skin tones
+        or 0xE0020 <= cp <= 0xE007F  # emoji tag sequences
+        or 0x1160 <= cp <= 0x11FF  # Hangul medial and final jamo
+    )
+
+
+def _regional_indicator(ch):
+    return 0x1F1E6 <= ord(ch) <= 0x1F1FF
+
+
+def grapheme_len(text):
+    """Count user-perceived characters, as the compose form's Intl.Segmenter does.
+
+    A close approximation of Unicode extended grapheme clusters: combining
+    marks, ZWJ emoji sequences, skin tones, flags (regional indicator pairs)
+    and CRLF each count once.
+    """
+    count = 0
+    prev = ""
+    flag_open = False  # an unpaired regional indicator starts the current cluster
+    for ch in text:
+        if prev and (_extends(ch) or prev == _ZWJ or (prev == _CR and ch == _LF)):
+            pass
+        elif flag_open and _regional_indicator(ch):
+            flag_open = False
+        else:
+            count += 1
+            flag_open = _regional_indicator(ch)
+        prev = ch
+    return count
 
 
 class PlatformClient(ABC):
     name: str = ""
     char_limit: int = 500
+    # Media limits checked before anything is uploaded (0 means no limit)
+    max_images: int = 4
+    max_image_bytes: int = 0
+    max_alt_text: int = 0
+
+    @classmethod
+    def text_length(cls, text):
+        """Length of *text* as the platform counts it against ``char_limit``."""
+        return grapheme_len(text)
 
     @abstractmethod
     def post(self, text, media=None, content_warning=None, link_card=None):
@@ -41,3 +128,73 @@ class PlatformClient(ABC):
     def validate_credentials(self):
         """Check if credentials are configured. Returns bool."""
         pass
+
+    @classmethod
+    def error_class(cls, exc):
+        """Coarse class of an exception raised while posting ("" if its type says nothing).
+
+        Transport failures are ``network`` or ``timeout``; an error response
+        is classed by its HTTP status. Clients add their library's exceptions.
+        """
+        if isinstance(exc, (requests.Timeout, TimeoutError)):
+            return "timeout"
+        if isinstance(exc, (requests.ConnectionError, ConnectionError)):
+            return "network"
+        return status_error_class(getattr(getattr(exc, "response", None), "status_code", None) or 0)
+
+    def delete(self, post_url):
+        """Delete the published post at *post_url*. Returns a PostResult."""
+        return PostResult(platform=self.name, success=False, post_url=post_url,
+                          error=f"{self.name} does not support deleting posts")
+
+    @classmethod
+    def can_edit(cls):
+        """True if the platform implements ``edit()``."""
+        return cls.edit is not PlatformClient.edit
+
+    def edit(self, post_url, text):
+        """Replace the text of the published post at *post_url*. Returns a PostResult."""
+        return PostResult(platform=self.name, success=False, post_url=post_url,
+                          error=f"{self.name} does not support editing posts")
+
+    def engagement(self, post_urls):
+        """Engagement counts for published posts, as ``{post_url: {name: count}}``.
+
+        Posts the platform no longer has are left out. Platforms without
+        stats (Discord webhooks) return ``{}``.
+        """
+        return {}
+
+
+@contextmanager
+def timed(phases, name):
+    """Add the seconds spent in the block to ``phases[name]``, even if it raises."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        phases[name] = phases.get(name, 0.0) + time.perf_counter() - started
+
+
+def upload_concurrently(items, upload):
+    """Call ``upload(item)`` for every item in parallel; return results in item order.
+
+    If any upload raises, uploads that have not started yet are cancelled and
+    the error of the earliest failed item is re-raised. Uploads already in
+    flight cannot be interrupted, but their results are discarded.
+    """
+    items = list(items)
+    if len(items) <= 1:
+        return [upload(item) for item in items]
+    executor = ThreadPoolExecutor(
+        max_workers=min(MAX_PARALLEL_UPLOADS, len(items)), thread_name_prefix="upload"
+    )
+    try:
+        futures = [executor.submit(upload, item) for item in items]
+        done, _ = wait(futures, return_when=FIRST_EXCEPTION)
+        for future in futures:
+            if future in done and future.exception() is not None:
+                raise future.exception()
+        return [future.result() for future in futures]
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
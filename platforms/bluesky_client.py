@@ -1,139 +1,237 @@
+import json
+import os
 import re
+import threading
 from datetime import datetime, timezone
 
 from atproto import Client, models
-from platforms.base import PlatformClient, PostResult
+from atproto_client.client.session import SessionEvent
+from atproto_client.exceptions import (
+    AtProtocolError,
+    BadRequestError,
+    InvokeTimeoutError,
+    LoginRequiredError,
+    NetworkError,
+    UnauthorizedError,
+)
+from platforms.base import PlatformClient, PostResult, timed, upload_concurrently
+from platforms.bluesky_handles import HandleCache
 import config
 
 
-# Regex patterns for facet detection
-URL_PATTERN = re.compile(
-    r"https?://[^\s\)\]\}>\"',]+[^\s\)\]\}>\"',.\!?]"
-)
-MENTION_PATTERN = re.compile(
-    r"(?<!\w)@([\w.]+(?:\.[\w]+)+)"
-)
-HASHTAG_PATTERN = re.compile(
-    r"(?<!\w)#(\w+)"
+# Facet detection: URLs, mentions and hashtags in one pass, so a text is
+# scanned once and facets never overlap (a #fragment or /@user inside a URL
+# stays part of the link)
+FACET_PATTERN = re.compile(
+    r"(?P<url>https?://[^\s\)\]\}>\"',]+[^\s\)\]\}>\"',.\!?])"
+    r"|(?<!\w)@(?P<mention>[\w.]+(?:\.[\w]+)+)"
+    r"|(?<!\w)#(?P<tag>\w+)"
 )
 
 
 def parse_facets(text):
-    """Parse URLs, mentions, and hashtags from text to create Bluesky facets."""
+    """Parse URLs, mentions, and hashtags from text to create Bluesky facets.
+
+    Facets index UTF-8 bytes, not characters. Matches arrive in text order, so
+    the byte offset is carried forward by encoding only the gap since the
+    previous match, keeping the whole parse linear in the length of the text.
+    """
     facets = []
-    text_bytes = text.encode("utf-8")
+    char_pos = 0
+    byte_pos = 0
 
-    for match in URL_PATTERN.finditer(text):
-        start = len(text[: match.start()].encode("utf-8"))
-        end = len(text[: match.end()].encode("utf-8"))
-        facets.append(
-            models.AppBskyRichtextFacet.Main(
-                index=models.AppBskyRichtextFacet.ByteSlice(
-                    byte_start=start, byte_end=end
-                ),
-                features=[
-                    models.AppBskyRichtextFacet.Link(uri=match.group(0))
-                ],
-            )
-        )
+    for match in FACET_PATTERN.finditer(text):
+        start = byte_pos + len(text[char_pos: match.start()].encode("utf-8"))
+        end = start + len(match.group(0).encode("utf-8"))
+        char_pos, byte_pos = match.end(), end
 
-    for match in MENTION_PATTERN.finditer(text):
-        start = len(text[: match.start()].encode("utf-8"))
-        end = len(text[: match.end()].encode("utf-8"))
-        # Use the handle as-is; resolution would require an API call
-        facets.append(
-            models.AppBskyRichtextFacet.Main(
-                index=models.AppBskyRichtextFacet.ByteSlice(
-                    byte_start=start, byte_end=end
-                ),
-                features=[
-                    models.AppBskyRichtextFacet.Mention(did=match.group(1))
-                ],
-            )
-        )
+        if match.group("url"):
+            feature = models.AppBskyRichtextFacet.Link(uri=match.group("url"))
+        elif match.group("mention"):
+            # Use the handle as-is; BlueskyClient swaps in the DID before posting
+            feature = models.AppBskyRichtextFacet.Mention(did=match.group("mention"))
+        else:
+            feature = models.AppBskyRichtextFacet.Tag(tag=match.group("tag"))
 
-    for match in HASHTAG_PATTERN.finditer(text):
-        start = len(text[: match.start()].encode("utf-8"))
-        end = len(text[: match.end()].encode("utf-8"))
         facets.append(
             models.AppBskyRichtextFacet.Main(
                 index=models.AppBskyRichtextFacet.ByteSlice(
                     byte_start=start, byte_end=end
                 ),
-                features=[
-                    models.AppBskyRichtextFacet.Tag(tag=match.group(1))
-                ],
+                features=[feature],
             )
         )
 
     return facets if facets else None
 
 
-def resolve_handle(client, handle):
-    """Resolve a handle to a DID for mentions."""
-    try:
-        resp = client.resolve_handle(handle)
-        return resp.did
-    except Exception:
-        return None
+def _is_session_error(exc):
+    """True when *exc* means the pooled session is no longer usable."""
+    if isinstance(exc, (UnauthorizedError, LoginRequiredError)):
+        return True
+    if isinstance(exc, BadRequestError) and exc.response is not None:
+        error = getattr(exc.response.content, "error", "")
+        return error in ("ExpiredToken", "InvalidToken")
+    return False
+
+
+# AT URIs per app.bsky.feed.getPosts request (the API's maximum)
+GET_POSTS_BATCH = 25
 
 
 class BlueskyClient(PlatformClient):
     name = "bluesky"
     char_limit = 300
 
-    def __init__(self):
+    def __init__(self, session_file=None, handle_cache_file=None):
         self.identifier = config.BLUESKY_IDENTIFIER
         self.app_password = config.BLUESKY_APP_PASSWORD
+        self.session_file = session_file or config.BLUESKY_SESSION_FILE
+        self.handles = HandleCache(handle_cache_file or config.BLUESKY_HANDLE_CACHE_FILE)
         self._client = None
+        self._lock = threading.Lock()
+
+    def _load_session(self):
+        """Return the saved session string for this identifier, or None."""
+        try:
+            with open(self.session_file, "r") as f:
+                saved = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+        if saved.get("identifier") != self.identifier:
+            return None
+        return saved.get("session") or None
+
+    def _save_session(self, event, session):
+        """Persist the session on login and on every token refresh."""
+        if event == SessionEvent.IMPORT:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.session_file), exist_ok=True)
+            # Owner-only: the file holds live access and refresh tokens
+            fd = os.open(self.session_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "w") as f:
+                json.dump({"identifier": self.identifier, "session": session.encode()}, f)
+        except OSError:
+            pass
+
+    def _new_client(self):
+        client = Client(base_url=config.BLUESKY_PDS_URL or None)
+        client.on_session_change(self._save_session)
+        return client
 
     def _get_client(self):
-        if self._client is None:
-            self._client = Client()
-            self._client.login(self.identifier, self.app_password)
-        return self._client
+        with self._lock:
+            if self._client is None:
+                session_string = self._load_session()
+                client = None
+                if session_string:
+                    # Resume the saved session; atproto refreshes it if the access token is stale
+                    client = self._new_client()
+                    try:
+                        client.login(session_string=session_string)
+                    except AtProtocolError:
+                        client = None
+                if client is None:
+                    client = self._new_client()
+                    client.login(self.identifier, self.app_password)
+                self._client = client
+            return self._client
+
+    def _drop_client(self):
+        """Forget the pooled session so the next post logs in again."""
+        with self._lock:
+            self._client = None
 
     def validate_credentials(self):
         return config.bluesky_configured()
 
+    @classmethod
+    def error_class(cls, exc):
+        # The client is dropped on a stale session, so the next attempt logs in again
+        if isinstance(exc, LoginRequiredError) or (
+            isinstance(exc, BadRequestError) and _is_session_error(exc)
+        ):
+            return "session"
+        # Transport failures carry no response; 409/413/502 come as NetworkError with one
+        if isinstance(exc, NetworkError) and exc.response is None:
+            return "timeout" if isinstance(exc, InvokeTimeoutError) else "network"
+        return super().error_class(exc)
+
+    def _resolve_mentions(self, client, facets):
+        """Swap mention handles for DIDs via the handle cache.
+
+        Mentions whose handle does not resolve are dropped (the text keeps the
+        @handle, it just isn't linked), since a mention facet needs a real DID.
+        Returns the new facet list, or None if nothing is left.
+        """
+        handles = [
+            feature.did
+            for facet in facets
+            for feature in facet.features
+            if isinstance(feature, models.AppBskyRichtextFacet.Mention)
+        ]
+        if not handles:
+            return facets
+        dids = self.handles.resolve_many(client, handles)
+        kept = []
+        for facet in facets:
+            mention = next(
+                (f for f in facet.features if isinstance(f, models.AppBskyRichtextFacet.Mention)),
+                None,
+            )
+            if mention is not None:
+                did = dids.get(mention.did)
+                if not did:
+                    continue
+                mention.did = did
+            kept.append(facet)
+        return kept or None
+
     def post(self, text, media=None, content_warning=None, link_card=None):
+        phases = {}
+        uploaded = []  # blob sizes
         try:
-            client = self._get_client()
+            with timed(phases, "auth"):
+                client = self._get_client()
 
             # Parse facets for clickable links/mentions/hashtags
             facets = parse_facets(text)
 
             # Resolve mention DIDs
             if facets:
-                for facet in facets:
-                    for feature in facet.features:
-                        if isinstance(feature, models.AppBskyRichtextFacet.Mention):
-                            did = resolve_handle(client, feature.did)
-                            if did:
-                                feature.did = did
+                with timed(phases, "resolve"):
+                    facets = self._resolve_mentions(client, facets)
 
             embed = None
 
             # Handle image embeds
             if media:
-                images = []
-                for attachment in media:
+                def upload_image(attachment):
                     with open(attachment.file_path, "rb") as f:
                         img_data = f.read()
                     upload = client.upload_blob(img_data)
-                    images.append(
-                        models.AppBskyEmbedImages.Image(
-                            alt=attachment.alt_text or "",
-                            image=upload.blob,
-                        )
+                    uploaded.append(len(img_data))
+                    return upload
+
+                with timed(phases, "upload"):
+                    uploads = upload_concurrently(media, upload_image)
+                images = [
+                    models.AppBskyEmbedImages.Image(
+                        alt=attachment.alt_text or "",
+                        image=upload.blob,
                     )
+                    for attachment, upload in zip(media, uploads)
+                ]
                 embed = models.AppBskyEmbedImages.Main(images=images)
 
             # Handle link card embed (mutually exclusive with images)
             elif link_card:
                 thumb_blob = None
                 if link_card.image_data:
-                    upload = client.upload_blob(link_card.image_data)
+                    with timed(phases, "upload"):
+                        upload = client.upload_blob(link_card.image_data)
+                    uploaded.append(len(link_card.image_data))
                     thumb_blob = upload.blob
                 embed = models.AppBskyEmbedExternal.Main(
                     external=models.AppBskyEmbedExternal.External(
@@ -165,13 +263,14 @@ class BlueskyClient(PlatformClient):
                     ]
                 )
 
-            response = client.com.atproto.repo.create_record(
-                models.ComAtprotoRepoCreateRecord.Data(
-                    repo=client.me.did,
-                    collection=models.ids.AppBskyFeedPost,
-                    record=record,
+            with timed(phases, "create"):
+                response = client.com.atproto.repo.create_record(
+                    models.ComAtprotoRepoCreateRecord.Data(
+                        repo=client.me.did,
+                        collection=models.ids.AppBskyFeedPost,
+                        record=record,
+                    )
                 )
-            )
 
             # Build the post URL from the response
             # URI format: at://did:plc:.../app.bsky.feed.post/rkey
@@ -183,10 +282,75 @@ class BlueskyClient(PlatformClient):
                 platform=self.name,
                 success=True,
                 post_url=post_url,
+                phases=phases,
+                bytes_uploaded=sum(uploaded),
             )
         except Exception as e:
+            if _is_session_error(e):
+                self._drop_client()
             return PostResult(
                 platform=self.name,
                 success=False,
                 error=str(e),
+                error_class=self.error_class(e),
+                phases=phases,
+                bytes_uploaded=sum(uploaded),
             )
+
+    def delete(self, post_url):
+        """Delete a post by its bsky.app URL, through the pooled session.
+
+        deleteRecord succeeds for a record that is already gone. Bluesky has
+        no edits, so ``edit()`` keeps the base class's refusal.
+        """
+        phases = {}
+        try:
+            with timed(phases, "auth"):
+                client = self._get_client()
+            rkey = post_url.rstrip("/").rsplit("/", 1)[-1]
+            with timed(phases, "delete"):
+                client.com.atproto.repo.delete_record(
+                    models.ComAtprotoRepoDeleteRecord.Data(
+                        repo=client.me.did,
+                        collection=models.ids.AppBskyFeedPost,
+                        rkey=rkey,
+                    )
+                )
+            return PostResult(platform=self.name, success=True, post_url=post_url, phases=phases)
+        except Exception as e:
+            if _is_session_error(e):
+                self._drop_client()
+            return PostResult(platform=self.name, success=False, post_url=post_url, error=str(e),
+                              error_class=self.error_class(e), phases=phases)
+
+    def engagement(self, post_urls):
+        """Likes, reposts, replies and quotes via getPosts, GET_POSTS_BATCH URIs per request.
+
+        Uses the pooled session. The AppView sends no validators, so there
+        are no conditional requests; the caller's cache decides how often to ask.
+        """
+        try:
+            client = self._get_client()
+            uris = {
+                f"at://{client.me.did}/{models.ids.AppBskyFeedPost}/{url.rstrip('/').rsplit('/', 1)[-1]}": url
+                for url in post_urls
+            }
+            counts = {}
+            batch = list(uris)
+            for start in range(0, len(batch), GET_POSTS_BATCH):
+                response = client.app.bsky.feed.get_posts(
+                    models.AppBskyFeedGetPosts.Params(uris=batch[start:start + GET_POSTS_BATCH])
+                )
+                for post in response.posts:
+                    if post.uri in uris:
+                        counts[uris[post.uri]] = {
+                            "likes": post.like_count or 0,
+                            "reposts": post.repost_count or 0,
+                            "replies": post.reply_count or 0,
+                            "quotes": post.quote_count or 0,
+                        }
+            return counts
+        except Exception as e:
+            if _is_session_error(e):
+                self._drop_client()
+            raise
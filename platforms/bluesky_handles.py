@@ -0,0 +1,119 @@
+"""Persistent TTL cache of Bluesky handle -> DID resolutions.
+
+Every mention facet in a post needs the mentioned account's DID, and BWE posts
+mention the same handles over and over (``@11ty.dev`` on every one). The cache
+keeps resolved DIDs for a week and remembers handles that do not resolve for an
+hour, resolves the misses of one post concurrently, and saves to disk so
+restarts start warm.
+"""
+
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from atproto_client.exceptions import BadRequestError
+
+POSITIVE_TTL = 7 * 24 * 3600
+NEGATIVE_TTL = 3600
+MAX_WORKERS = 4
+
+
+def _is_unresolvable(exc):
+    """True when *exc* is the server saying the handle does not exist."""
+    if not isinstance(exc, BadRequestError) or exc.response is None:
+        return False
+    return "Unable to resolve handle" in (getattr(exc.response.content, "message", None) or "")
+
+
+class HandleCache:
+    """Handle -> DID map with expiry, backed by a JSON file at *path*."""
+
+    def __init__(self, path, ttl=POSITIVE_TTL, negative_ttl=NEGATIVE_TTL):
+        self.path = path
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._entries = None  # handle -> {"did": str | None, "expires": epoch seconds}
+        self._lock = threading.Lock()
+
+    def _load(self):
+        """Populate the in-memory map from disk on first use. Caller holds the lock."""
+        if self._entries is not None:
+            return
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+            self._entries = data if isinstance(data, dict) else {}
+        except (OSError, json.JSONDecodeError):
+            self._entries = {}
+
+    def _save(self):
+        """Write the unexpired entries back to disk. Caller holds the lock."""
+        now = time.time()
+        live = {h: e for h, e in self._entries.items() if e.get("expires", 0) > now}
+        self._entries = live
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(live, f, indent=2)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            pass
+
+    def lookup(self, handle):
+        """Return ``(True, did_or_None)`` for a live cache entry, else ``(False, None)``."""
+        handle = handle.lower()
+        with self._lock:
+            self._load()
+            entry = self._entries.get(handle)
+            if entry is None or entry.get("expires", 0) <= time.time():
+                return False, None
+            return True, entry.get("did")
+
+    def resolve_many(self, client, handles):
+        """Resolve *handles* to DIDs, hitting the network only for cache misses.
+
+        Misses are resolved concurrently. A handle the server says does not
+        exist is cached as ``None`` for ``negative_ttl``. Any other failure
+        (network, timeout, expired session, server error) is not cached. Returns ``{handle: did_or_None}`` keyed by the
+        handles as given.
+        """
+        result = {}
+        misses = []
+        seen = set()
+        for handle in handles:
+            found, did = self.lookup(handle)
+            if found:
+                result[handle] = did
+            elif handle.lower() not in seen:
+                seen.add(handle.lower())
+                misses.append(handle)
+
+        if not misses:
+            return result
+
+        def _resolve(handle):
+            try:
+                return handle, client.resolve_handle(handle).did, True
+            except Exception as e:
+                return handle, None, _is_unresolvable(e)
+
+        with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(misses))) as pool:
+            resolved = list(pool.map(_resolve, misses))
+
+        now = time.time()
+        with self._lock:
+            self._load()
+            for handle, did, cacheable in resolved:
+                if cacheable:
+                    ttl = self.ttl if did else self.negative_ttl
+                    self._entries[handle.lower()] = {"did": did, "expires": now + ttl}
+            self._save()
+
+        by_lower = {handle.lower(): did for handle, did, _ in resolved}
+        for handle in handles:
+            if handle not in result:
+                result[handle] = by_lower.get(handle.lower())
+        return result
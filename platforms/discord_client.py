@@ -1,60 +1,207 @@
 import json
+import os
+import re
+import threading
+import time
+import uuid
+from contextlib import ExitStack
 
 import requests
-from platforms.base import PlatformClient, PostResult
+from platforms.base import PlatformClient, PostResult, status_error_class, timed
 import config
 
 
 AVATAR_URL = "https://raw.githubusercontent.com/bobmonsour/social-posting/main/static/img/bundle_avatar.png"
 
+REQUEST_TIMEOUT = 30
+MAX_RATE_LIMIT_RETRIES = 3
+# Never sleep longer than this for a rate limit; the post deadline is 30s
+MAX_RATE_LIMIT_WAIT = 20
+
+# A message posted with a content warning: the warning, the spoilered text,
+# and the link card URL appended after it, if any
+_CONTENT_WARNING = re.compile(r"\A\*\*CW: (.*?)\*\*\n\n\|\|.*\|\|(\n\n\S+)?\Z", re.S)
+
+
+def _with_content_warning(text, content_warning):
+    """*text* behind Discord spoiler syntax, headed by the content warning."""
+    return f"**CW: {content_warning}**\n\n||{text}||"
+
+
+class _MultipartStream:
+    """File-like multipart/form-data body that reads attachments as it is sent.
+
+    requests streams any body with ``read()`` and a length, so images go out
+    in blocks instead of being assembled into one bytes object first.
+    """
+
+    def __init__(self, parts, boundary):
+        self._parts = parts  # bytes, or open binary file objects
+        self._index = 0
+        self.content_type = f"multipart/form-data; boundary={boundary}"
+        self._len = sum(
+            len(p) if isinstance(p, bytes) else os.fstat(p.fileno()).st_size - p.tell()
+            for p in parts
+        )
+
+    def __len__(self):
+        return self._len
+
+    def __iter__(self):
+        while True:
+            chunk = self.read(64 * 1024)
+            if not chunk:
+                return
+            yield chunk
+
+    def read(self, size=-1):
+        out = bytearray()
+        while self._index < len(self._parts) and (size < 0 or len(out) < size):
+            part = self._parts[self._index]
+            want = -1 if size < 0 else size - len(out)
+            if isinstance(part, bytes):
+                take = part if want < 0 else part[:want]
+                out += take
+                rest = part[len(take):]
+                if rest:
+                    self._parts[self._index] = rest
+                else:
+                    self._index += 1
+            else:
+                chunk = part.read(want)
+                if chunk:
+                    out += chunk
+                else:
+                    self._index += 1
+        return bytes(out)
+
+
+def _multipart_body(stack, payload, media):
+    """Build a streamed multipart body; files are opened on *stack* (an ExitStack)."""
+    boundary = uuid.uuid4().hex
+    parts = [
+        f"--{boundary}\r\n"
+        'Content-Disposition: form-data; name="payload_json"\r\n'
+        "Content-Type: application/json\r\n\r\n".encode("utf-8"),
+        json.dumps(payload).encode("utf-8"),
+        b"\r\n",
+    ]
+    for i, attachment in enumerate(media):
+        filename = os.path.basename(attachment.file_path).replace('"', "")
+        parts.append(
+            f"--{boundary}\r\n"
+            f'Content-Disposition: form-data; name="file{i}"; filename="{filename}"\r\n'
+            f"Content-Type: {attachment.mime_type}\r\n\r\n".encode("utf-8")
+        )
+        parts.append(stack.enter_context(open(attachment.file_path, "rb")))
+        parts.append(b"\r\n")
+    parts.append(f"--{boundary}--\r\n".encode("utf-8"))
+    return _MultipartStream(parts, boundary)
+
 
 class DiscordClient(PlatformClient):
     name = "discord"
     char_limit = 2000
+    max_images = 10
+    max_image_bytes = 10 * 1024 * 1024  # webhook uploads without a boosted server
 
     def __init__(self, webhook_url=None, guild_id=None, name=None):
         self.webhook_url = webhook_url or config.DISCORD_WEBHOOK_URL
         self.guild_id = guild_id or config.DISCORD_GUILD_ID
         if name:
             self.name = name
+        # One keep-alive session per webhook (clients are pooled per platform)
+        self.session = requests.Session()
+        self._lock = threading.Lock()
+        self._remaining = None  # requests left in the webhook's rate-limit bucket
+        self._reset_at = 0.0  # time.monotonic() when the bucket refills
 
     def validate_credentials(self):
         return bool(self.webhook_url and self.guild_id)
 
+    def _wait_for_bucket(self, allowance=MAX_RATE_LIMIT_WAIT):
+        """Sleep until the bucket has room, if the last response said it was empty.
+
+        Sleeps at most *allowance* seconds; returns the seconds slept.
+        """
+        if self._remaining == 0:
+            delay = min(self._reset_at - time.monotonic(), allowance)
+            if delay > 0:
+                time.sleep(delay)
+                return delay
+        return 0.0
+
+    def _track_bucket(self, resp):
+        """Update the bucket from Discord's X-RateLimit-* response headers."""
+        remaining = resp.headers.get("X-RateLimit-Remaining")
+        reset_after = resp.headers.get("X-RateLimit-Reset-After")
+        try:
+            if remaining is not None:
+                self._remaining = int(remaining)
+            if reset_after is not None:
+                self._reset_at = time.monotonic() + float(reset_after)
+        except ValueError:
+            pass
+
+    @staticmethod
+    def _retry_after(resp):
+        """Seconds Discord asked us to wait on a 429."""
+        try:
+            return float(resp.json().get("retry_after"))
+        except (ValueError, TypeError, AttributeError):
+            pass
+        try:
+            return float(resp.headers.get("Retry-After", 1))
+        except ValueError:
+            return 1.0
+
+    def _send(self, url, payload, media, stats, method="POST", phase="create"):
+        """Send to the webhook, honouring the bucket and retrying 429s.
+
+        Fills *stats* with ``phases`` (``rate_limit_wait`` and *phase*), the
+        media ``bytes`` sent and the number of ``retries``.
+        """
+        phases = stats.setdefault("phases", {})
+        with self._lock:
+            waited = 0.0  # bucket waits and 429 delays together stay under MAX_RATE_LIMIT_WAIT
+            for attempt in range(MAX_RATE_LIMIT_RETRIES + 1):
+                with timed(phases, "rate_limit_wait"):
+                    waited += self._wait_for_bucket(MAX_RATE_LIMIT_WAIT - waited)
+                with ExitStack() as stack, timed(phases, phase):
+                    if media:
+                        body = _multipart_body(stack, payload, media)
+                        stats["bytes"] = len(body)
+                        resp = self.session.request(
+                            method, url, data=body, headers={"Content-Type": body.content_type},
+                            timeout=REQUEST_TIMEOUT,
+                        )
+                    else:
+                        resp = self.session.request(method, url, json=payload, timeout=REQUEST_TIMEOUT)
+                self._track_bucket(resp)
+                if resp.status_code != 429 or attempt == MAX_RATE_LIMIT_RETRIES:
+                    return resp
+                delay = self._retry_after(resp)
+                if waited + delay > MAX_RATE_LIMIT_WAIT:
+                    return resp
+                with timed(phases, "rate_limit_wait"):
+                    time.sleep(delay)
+                waited += delay
+                stats["retries"] = attempt + 1
+            return resp
+
     def post(self, text, media=None, content_warning=None, link_card=None):
+        stats = {"phases": {}, "bytes": 0, "retries": 0}
         try:
             # Apply content warning using Discord spoiler syntax
             if content_warning:
-                text = f"**CW: {content_warning}**\n\n||{text}||"
+                text = _with_content_warning(text, content_warning)
 
             # Append link card URL if not already in text (Discord auto-previews)
             if link_card and link_card.url and link_card.url not in text:
                 text = f"{text}\n\n{link_card.url}"
 
             url = f"{self.webhook_url}?wait=true"
-
-            if media:
-                files = {}
-                for i, attachment in enumerate(media):
-                    files[f"file{i}"] = (
-                        attachment.file_path.rsplit("/", 1)[-1],
-                        open(attachment.file_path, "rb"),
-                        attachment.mime_type,
-                    )
-                payload = {"content": text, "avatar_url": AVATAR_URL}
-                resp = requests.post(
-                    url,
-                    data={"payload_json": json.dumps(payload)},
-                    files=files,
-                )
-                # Close file handles
-                for f in files.values():
-                    f[1].close()
-            else:
-                resp = requests.post(
-                    url,
-                    json={"content": text, "avatar_url": AVATAR_URL},
-                )
+            resp = self._send(url, {"content": text, "avatar_url": AVATAR_URL}, media, stats)
 
             if resp.status_code not in (200, 204):
                 error_msg = resp.text[:200]
@@ -62,6 +209,10 @@ class DiscordClient(PlatformClient):
                     platform=self.name,
                     success=False,
                     error=f"Discord API error {resp.status_code}: {error_msg}",
+                    error_class=status_error_class(resp.status_code),
+                    phases=stats["phases"],
+                    bytes_uploaded=stats["bytes"],
+                    retries=stats["retries"],
                 )
 
             data = resp.json()
@@ -77,10 +228,68 @@ class DiscordClient(PlatformClient):
                 platform=self.name,
                 success=True,
                 post_url=post_url,
+                phases=stats["phases"],
+                bytes_uploaded=stats["bytes"],
+                retries=stats["retries"],
             )
         except Exception as e:
             return PostResult(
                 platform=self.name,
                 success=False,
                 error=str(e),
+                error_class=self.error_class(e),
+                phases=stats["phases"],
+                bytes_uploaded=stats["bytes"],
+                retries=stats["retries"],
             )
+
+    def _message_url(self, post_url):
+        """The webhook's endpoint for the message at *post_url* (``.../channels/<guild>/<channel>/<id>``)."""
+        message_id = post_url.rstrip("/").rsplit("/", 1)[-1]
+        return f"{self.webhook_url}/messages/{message_id}"
+
+    def delete(self, post_url):
+        stats = {"phases": {}, "bytes": 0, "retries": 0}
+        try:
+            resp = self._send(self._message_url(post_url), None, None, stats, method="DELETE", phase="delete")
+            # 404 (Unknown Message): already deleted
+            if resp.status_code not in (200, 204, 404):
+                return PostResult(
+                    platform=self.name, success=False, post_url=post_url,
+                    error=f"Discord API error {resp.status_code}: {resp.text[:200]}",
+                    error_class=status_error_class(resp.status_code),
+                    phases=stats["phases"], retries=stats["retries"],
+                )
+            return PostResult(platform=self.name, success=True, post_url=post_url,
+                              phases=stats["phases"], retries=stats["retries"])
+        except Exception as e:
+            return PostResult(platform=self.name, success=False, post_url=post_url, error=str(e),
+                              error_class=self.error_class(e), phases=stats["phases"], retries=stats["retries"])
+
+    def edit(self, post_url, text):
+        stats = {"phases": {}, "bytes": 0, "retries": 0}
+        try:
+            # Keep a content warning the message was posted with; history does not record it
+            resp = self._send(self._message_url(post_url), None, None, stats, method="GET", phase="fetch")
+            if resp.status_code == 200:
+                match = _CONTENT_WARNING.match(resp.json().get("content") or "")
+                if match:
+                    link = match.group(2) or ""
+                    if link and text.endswith(link):
+                        text = _with_content_warning(text[:-len(link)], match.group(1)) + link
+                    else:
+                        text = _with_content_warning(text, match.group(1))
+            resp = self._send(self._message_url(post_url), {"content": text}, None, stats,
+                              method="PATCH", phase="edit")
+            if resp.status_code != 200:
+                return PostResult(
+                    platform=self.name, success=False, post_url=post_url,
+                    error=f"Discord API error {resp.status_code}: {resp.text[:200]}",
+                    error_class=status_error_class(resp.status_code),
+                    phases=stats["phases"], retries=stats["retries"],
+                )
+            return PostResult(platform=self.name, success=True, post_url=post_url,
+                              phases=stats["phases"], retries=stats["retries"])
+        except Exception as e:
+            return PostResult(platform=self.name, success=False, post_url=post_url, error=str(e),
+                              error_class=self.error_class(e), phases=stats["phases"], retries=stats["retries"])
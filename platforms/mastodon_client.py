@@ -1,16 +1,66 @@
-from mastodon import Mastodon
-from platforms.base import PlatformClient, PostResult
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+
+import requests
+from mastodon import (
+    Mastodon,
+    MastodonAPIError,
+    MastodonIllegalArgumentError,
+    MastodonNetworkError,
+    MastodonNotFoundError,
+    MastodonRatelimitError,
+)
+from platforms.base import PlatformClient, PostResult, status_error_class, timed, upload_concurrently
 import config
 
+# Polling for server-side media processing: first wait, ceiling per wait, and
+# the most the whole post may spend waiting (the post deadline is 60s)
+MEDIA_POLL_INITIAL = 0.5
+MEDIA_POLL_MAX = 4.0
+MEDIA_READY_TIMEOUT = 40.0
+
+# Engagement lookups: status IDs per multi-status request (Mastodon 4.3+), and
+# how many responses are kept for conditional (If-None-Match) requests
+STATUS_BATCH = 20
+ETAG_CACHE_SIZE = 128
+REQUEST_TIMEOUT = 15
+
+# Mastodon counts every URL as 23 characters and a remote mention as its local part
+URL_LENGTH = 23
+_URL_RE = re.compile(r"https?://\S+")
+_REMOTE_MENTION_RE = re.compile(r"(?<![\w/])(@\w+)@[\w.-]+\w")
+
+
+def _file_size(path):
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
 
 class MastodonClient(PlatformClient):
     name = "mastodon"
     char_limit = 500
+    max_image_bytes = 16 * 1024 * 1024
+    max_alt_text = 1500
+
+    @classmethod
+    def text_length(cls, text):
+        text = _REMOTE_MENTION_RE.sub(r"\1", text)
+        text = _URL_RE.sub("x" * URL_LENGTH, text)
+        return super().text_length(text)
 
     def __init__(self):
         self.instance_url = config.MASTODON_INSTANCE_URL
         self.access_token = config.MASTODON_ACCESS_TOKEN
         self._client = None
+        self._session = None  # plain HTTP for conditional GETs, which Mastodon.py can't send
+        self._etags = OrderedDict()  # request URL -> (ETag, parsed body)
+        self._etags_lock = threading.Lock()
+        self._multi_status = True  # cleared if the instance predates GET /api/v1/statuses?id[]=
 
     def _get_client(self):
         if self._client is None:
@@ -23,18 +73,66 @@ class MastodonClient(PlatformClient):
     def validate_credentials(self):
         return config.mastodon_configured()
 
+    @classmethod
+    def error_class(cls, exc):
+        if isinstance(exc, MastodonNetworkError):
+            return "network"
+        if isinstance(exc, MastodonRatelimitError):
+            return "rate_limit"
+        # Raised as ('Mastodon API returned error', status, reason, message)
+        if isinstance(exc, MastodonAPIError) and len(exc.args) > 1 and isinstance(exc.args[1], int):
+            return status_error_class(exc.args[1])
+        if isinstance(exc, MastodonIllegalArgumentError):
+            return "client"
+        return super().error_class(exc)
+
+    def _wait_for_media(self, client, uploaded):
+        """Poll until every uploaded attachment has finished processing.
+
+        The v2 media endpoint answers before large images are processed (``url``
+        is still null), and a status that attaches them is rejected. Pending
+        items are re-fetched together with exponential backoff; raises
+        TimeoutError after MEDIA_READY_TIMEOUT seconds.
+        """
+        deadline = time.monotonic() + MEDIA_READY_TIMEOUT
+        delay = MEDIA_POLL_INITIAL
+        ready = list(uploaded)
+        while True:
+            pending = [i for i, m in enumerate(ready) if m.get("url") is None]
+            if not pending:
+                return ready
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError(
+                    f"Mastodon still processing {len(pending)} image(s) after {MEDIA_READY_TIMEOUT:.0f}s"
+                )
+            time.sleep(min(delay, remaining))
+            delay = min(delay * 2, MEDIA_POLL_MAX)
+            refreshed = upload_concurrently(pending, lambda i: client.media(ready[i]["id"]))
+            for i, m in zip(pending, refreshed):
+                ready[i] = m
+
     def post(self, text, media=None, content_warning=None, link_card=None):
+        phases = {}
+        bytes_uploaded = 0
         try:
-            client = self._get_client()
+            with timed(phases, "auth"):
+                client = self._get_client()
 
             media_ids = []
             if media:
-                for attachment in media:
-                    uploaded = client.media_post(
-                        media_file=attachment.file_path,
-                        description=attachment.alt_text or None,
+                with timed(phases, "upload"):
+                    media_ids = upload_concurrently(
+                        media,
+                        lambda attachment: client.media_post(
+                            media_file=attachment.file_path,
+                            mime_type=attachment.mime_type,
+                            description=attachment.alt_text or None,
+                        ),
                     )
-                    media_ids.append(uploaded)
+                bytes_uploaded = sum(a.size or _file_size(a.file_path) for a in media)
+                with timed(phases, "processing"):
+                    media_ids = self._wait_for_media(client, media_ids)
 
             kwargs = {
                 "status": text,
@@ -45,15 +143,125 @@ class MastodonClient(PlatformClient):
             if content_warning:
                 kwargs["spoiler_text"] = content_warning
 
-            status = client.status_post(**kwargs)
+            with timed(phases, "create"):
+                status = client.status_post(**kwargs)
             return PostResult(
                 platform=self.name,
                 success=True,
                 post_url=status["url"],
+                phases=phases,
+                bytes_uploaded=bytes_uploaded,
             )
         except Exception as e:
             return PostResult(
                 platform=self.name,
                 success=False,
                 error=str(e),
+                error_class=self.error_class(e),
+                phases=phases,
+                bytes_uploaded=bytes_uploaded,
             )
+
+    @staticmethod
+    def _status_id(post_url):
+        """The status ID at the end of a status URL (``https://instance/@user/<id>``)."""
+        return post_url.rstrip("/").rsplit("/", 1)[-1]
+
+    def delete(self, post_url):
+        phases = {}
+        try:
+            with timed(phases, "auth"):
+                client = self._get_client()
+            with timed(phases, "delete"):
+                try:
+                    client.status_delete(self._status_id(post_url))
+                except MastodonNotFoundError:
+                    pass  # already gone
+            return PostResult(platform=self.name, success=True, post_url=post_url, phases=phases)
+        except Exception as e:
+            return PostResult(platform=self.name, success=False, post_url=post_url, error=str(e),
+                              error_class=self.error_class(e), phases=phases)
+
+    def edit(self, post_url, text):
+        """Edit the status text, keeping its attachments and content warning."""
+        phases = {}
+        try:
+            with timed(phases, "auth"):
+                client = self._get_client()
+            status_id = self._status_id(post_url)
+            with timed(phases, "fetch"):
+                status = client.status(status_id)
+            with timed(phases, "edit"):
+                client.status_update(
+                    status_id,
+                    status=text,
+                    spoiler_text=status["spoiler_text"] or None,
+                    # An edit without media_ids drops the attachments
+                    media_ids=[m["id"] for m in status["media_attachments"]] or None,
+                )
+            return PostResult(platform=self.name, success=True, post_url=post_url, phases=phases)
+        except Exception as e:
+            return PostResult(platform=self.name, success=False, post_url=post_url, error=str(e),
+                              error_class=self.error_class(e), phases=phases)
+
+    def _get_json(self, path, params=None):
+        """GET an API path conditionally.
+
+        A repeat of an earlier request sends its ETag; a 304 reuses the body
+        that came with it. Raises requests.HTTPError on other errors.
+        """
+        if self._session is None:
+            self._session = requests.Session()
+            self._session.headers["Authorization"] = f"Bearer {self.access_token}"
+        url = requests.Request("GET", f"{self.instance_url}{path}", params=params).prepare().url
+        with self._etags_lock:
+            cached = self._etags.get(url)
+        headers = {"If-None-Match": cached[0]} if cached else {}
+        resp = self._session.get(url, headers=headers, timeout=REQUEST_TIMEOUT)
+        if resp.status_code == 304 and cached:
+            with self._etags_lock:
+                self._etags.move_to_end(url)
+            return cached[1]
+        resp.raise_for_status()
+        data = resp.json()
+        if resp.headers.get("ETag"):
+            with self._etags_lock:
+                self._etags[url] = (resp.headers["ETag"], data)
+                self._etags.move_to_end(url)
+                while len(self._etags) > ETAG_CACHE_SIZE:
+                    self._etags.popitem(last=False)
+        return data
+
+    def _fetch_statuses(self, status_ids):
+        """Statuses for *status_ids*, STATUS_BATCH per request; missing ones are skipped."""
+        statuses = []
+        for start in range(0, len(status_ids), STATUS_BATCH):
+            chunk = status_ids[start:start + STATUS_BATCH]
+            if self._multi_status:
+                try:
+                    statuses += self._get_json("/api/v1/statuses", [("id[]", i) for i in chunk])
+                    continue
+                except requests.HTTPError as e:
+                    if e.response is None or e.response.status_code not in (400, 404):
+                        raise
+                    self._multi_status = False
+            for status_id in chunk:
+                try:
+                    statuses.append(self._get_json(f"/api/v1/statuses/{status_id}"))
+                except requests.HTTPError as e:
+                    if e.response is None or e.response.status_code != 404:
+                        raise
+        return statuses
+
+    def engagement(self, post_urls):
+        """Favourites, boosts and replies, fetched in batches with conditional requests."""
+        urls = {self._status_id(url): url for url in post_urls}
+        return {
+            urls[status["id"]]: {
+                "favourites": status.get("favourites_count", 0),
+                "boosts": status.get("reblogs_count", 0),
+                "replies": status.get("replies_count", 0),
+            }
+            for status in self._fetch_statuses(list(urls))
+            if status.get("id") in urls
+        }
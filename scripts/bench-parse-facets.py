@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""Micro-benchmark for Bluesky facet parsing.
+
+Compares parse_facets() against the previous implementation, which re-encoded
+the text prefix for every match (quadratic in post length). Two workloads:
+one long, emoji-heavy post with many links/mentions/hashtags, and a batch of
+BWE-sized posts like the ones the batch preview renders.
+
+Usage:
+  python scripts/bench-parse-facets.py             # default repeat counts
+  python scripts/bench-parse-facets.py <repeats>   # override repeats
+"""
+
+import os
+import re
+import sys
+import timeit
+
+# Make platforms/ importable when run as a script.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from atproto import models
+
+from platforms.bluesky_client import parse_facets
+
+URL_PATTERN = re.compile(r"https?://[^\s\)\]\}>\"',]+[^\s\)\]\}>\"',.\!?]")
+MENTION_PATTERN = re.compile(r"(?<!\w)@([\w.]+(?:\.[\w]+)+)")
+HASHTAG_PATTERN = re.compile(r"(?<!\w)#(\w+)")
+
+
+def parse_facets_prefix(text):
+    """The old approach: three scans, each offset from a re-encoded prefix."""
+    facets = []
+    scans = (
+        (URL_PATTERN, lambda m: models.AppBskyRichtextFacet.Link(uri=m.group(0))),
+        (MENTION_PATTERN, lambda m: models.AppBskyRichtextFacet.Mention(did=m.group(1))),
+        (HASHTAG_PATTERN, lambda m: models.AppBskyRichtextFacet.Tag(tag=m.group(1))),
+    )
+    for pattern, feature in scans:
+        for match in pattern.finditer(text):
+            start = len(text[: match.start()].encode("utf-8"))
+            end = len(text[: match.end()].encode("utf-8"))
+            facets.append(
+                models.AppBskyRichtextFacet.Main(
+                    index=models.AppBskyRichtextFacet.ByteSlice(byte_start=start, byte_end=end),
+                    features=[feature(match)],
+                )
+            )
+    return facets or None
+
+
+def long_post():
+    chunk = "🎉✨ New from @zachleat.com → https://www.zachleat.com/web/eleventy-v3/ #eleventy #11ty 🚀 "
+    return chunk * 400
+
+
+def batch_posts():
+    return [
+        f"🏗️ Built with Eleventy: Site {i} https://site{i}.example.dev/ by @author{i}.bsky.social #BuiltWithEleventy"
+        for i in range(500)
+    ]
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    text = long_post()
+    batch = batch_posts()
+
+    print(f"Long post: {len(text)} chars, {len(text.encode('utf-8'))} bytes")
+    for label, fn in (("prefix re-encode", parse_facets_prefix), ("parse_facets", parse_facets)):
+        seconds = timeit.timeit(lambda: fn(text), number=repeats) / repeats
+        print(f"  {label:<18} {seconds * 1000:8.2f} ms/post")
+
+    print(f"Batch preview: {len(batch)} posts")
+    for label, fn in (("prefix re-encode", parse_facets_prefix), ("parse_facets", parse_facets)):
+        seconds = timeit.timeit(lambda: [fn(t) for t in batch], number=repeats) / repeats
+        print(f"  {label:<18} {seconds * 1000:8.2f} ms/batch")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""Load benchmark for /post against local Mastodon, Bluesky and Discord stand-ins.
+
+Starts the stand-in servers from tests/stand_ins.py, points the platform
+clients at them, and drives /post through Flask's test client for three
+workloads: text only, one image, and a link card (a fresh page each post, so
+every card is fetched cold). Prints p50/p95/max latency and throughput per
+workload, and how many posts reached each stand-in. All state (history,
+uploads, sessions) goes to a temporary directory.
+
+Usage:
+  python scripts/bench-posting.py                                  # 30 posts per workload, 4 at a time
+  python scripts/bench-posting.py --requests 100 --concurrency 8
+  python scripts/bench-posting.py --latency 0.05:0.3               # per-response latency range (seconds)
+  python scripts/bench-posting.py --error-rate 0.05 --rate-limit-every 25
+  python scripts/bench-posting.py --discord-bucket 1000             # take Discord's bucket out of the picture
+"""
+
+import argparse
+import io
+import os
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Make the app, platforms/ and tests/ importable when run as a script.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PIL import Image
+
+import app as app_module
+import config
+import platforms
+from services import link_card
+from tests.stand_ins import BlueskyStandIn, DiscordStandIn, MastodonStandIn, SiteStandIn, stand_in_config
+
+PLATFORMS = ["mastodon", "bluesky", "discord"]
+
+
+def parse_latency(value):
+    if ":" in value:
+        low, high = value.split(":", 1)
+        return float(low), float(high)
+    return float(value)
+
+
+def photo_bytes():
+    """A 1600x1200 noisy JPEG of about 1.5 MB, so Bluesky has to re-encode it."""
+    noise = Image.effect_noise((1600, 1200), 64)
+    img = Image.merge("RGB", (noise, noise.rotate(90, expand=False), noise.transpose(Image.FLIP_LEFT_RIGHT)))
+    buf = io.BytesIO()
+    img.save(buf, "JPEG", quality=92)
+    return buf.getvalue()
+
+
+def configure(tmp, servers):
+    """Point config, app paths and the pooled clients at *tmp* and the stand-ins."""
+    values = stand_in_config(mastodon=servers["mastodon"], bluesky=servers["bluesky"],
+                             discord=servers["discord"])
+    values.update(
+        UPLOAD_FOLDER=os.path.join(tmp, "uploads"),
+        MEDIA_DERIVATIVES_DIR=os.path.join(tmp, "uploads", "derivatives"),
+        BLUESKY_SESSION_FILE=os.path.join(tmp, "bluesky-session.json"),
+        BLUESKY_HANDLE_CACHE_FILE=os.path.join(tmp, "bluesky-handles.json"),
+    )
+    for name, value in values.items():
+        setattr(config, name, value)
+    os.makedirs(config.UPLOAD_FOLDER, exist_ok=True)
+
+    history = os.path.join(tmp, "history.json")
+    with open(history, "w") as f:
+        f.write("[]")
+    app_module.app.config.update(
+        TESTING=True,
+        HISTORY_FILE=history,
+        DRAFT_IMAGES_DIR=os.path.join(tmp, "draft_images"),
+        POST_QUEUE_FILE=os.path.join(tmp, "post-queue.json"),
+        POST_SCHEDULE_FILE=os.path.join(tmp, "post-schedule.json"),
+        ENGAGEMENT_FILE=os.path.join(tmp, "engagement.json"),
+        POST_QUEUE_WORKERS=0,
+        PREFETCH_AHEAD=0,
+    )
+    link_card.card_cache.clear()
+    link_card.card_cache.cache_dir = os.path.join(tmp, "link-cards")
+    platforms.reset_platforms()
+
+
+def workloads(site, photo):
+    def text_only(i):
+        return {"text": f"Benchmark text post {i}", "platforms": PLATFORMS}
+
+    def image(i):
+        return {"text": f"Benchmark image post {i}", "platforms": PLATFORMS,
+                "images": (io.BytesIO(photo), f"photo-{i}.jpg"), "alt_text_0": "Noise"}
+
+    def link(i):
+        return {"text": f"Benchmark link post {i}", "platforms": PLATFORMS,
+                "link_url": site.page_url(f"post-{i}-{time.monotonic_ns()}")}
+
+    return [("text only", text_only), ("image", image), ("link card", link)]
+
+
+def run(form, requests, concurrency):
+    """POST *requests* forms, *concurrency* at a time; returns (latencies, wall seconds, errors)."""
+    def one(i):
+        client = app_module.app.test_client()
+        start = time.perf_counter()
+        resp = client.post("/post", data=form(i), content_type="multipart/form-data")
+        return time.perf_counter() - start, resp.status_code
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(one, range(requests)))
+    wall = time.perf_counter() - start
+    return [r[0] for r in results], wall, sum(1 for r in results if r[1] != 200)
+
+
+def delivered(servers):
+    return {
+        "mastodon": len(servers["mastodon"].statuses),
+        "bluesky": len(servers["bluesky"].records),
+        "discord": len(servers["discord"].messages),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--requests", type=int, default=30, help="posts per workload")
+    parser.add_argument("--concurrency", type=int, default=4, help="posts in flight at once")
+    parser.add_argument("--latency", type=parse_latency, default=(0.02, 0.12),
+                        help="stand-in response latency in seconds, N or LOW:HIGH")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of 502 responses")
+    parser.add_argument("--rate-limit-every", type=int, default=0, help="answer every Nth request with a 429")
+    parser.add_argument("--discord-bucket", type=int, default=5,
+                        help="Discord webhook posts allowed per 2s window (its real limit is about 5)")
+    args = parser.parse_args()
+
+    faults = {"latency": args.latency, "error_rate": args.error_rate,
+              "rate_limit_every": args.rate_limit_every, "retry_after": 0.2}
+    servers = {
+        "mastodon": MastodonStandIn(**faults),
+        "bluesky": BlueskyStandIn(**faults),
+        "discord": DiscordStandIn(bucket_size=args.discord_bucket, **faults),
+        "site": SiteStandIn(latency=args.latency),
+    }
+    for server in servers.values():
+        server.start()
+
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            configure(tmp, servers)
+            photo = photo_bytes()
+            print(f"{args.requests} posts per workload, {args.concurrency} in flight, "
+                  f"latency {args.latency}s, error rate {args.error_rate}, "
+                  f"429 every {args.rate_limit_every or 'never'}; image {len(photo) / 1e6:.1f} MB")
+            print(f"{'workload':<10} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>8} {'posts/s':>8}  delivered")
+            for label, form in workloads(servers["site"], photo):
+                before = delivered(servers)
+                latencies, wall, errors = run(form, args.requests, args.concurrency)
+                after = delivered(servers)
+                q = statistics.quantiles(latencies, n=100, method="inclusive")
+                landed = ", ".join(f"{name} {after[name] - before[name]}/{args.requests}" for name in PLATFORMS)
+                print(f"{label:<10} {q[49] * 1000:8.0f} {q[94] * 1000:8.0f} {max(latencies) * 1000:8.0f} "
+                      f"{args.requests / wall:8.2f}  {landed}" + (f"  ({errors} non-200)" if errors else ""))
+    finally:
+        for server in servers.values():
+            server.stop()
+        platforms.reset_platforms()
+
+
+if __name__ == "__main__":
+    main()
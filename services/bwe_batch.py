@@ -0,0 +1,83 @@
+"""Batch posting of the BWE "Sites to Post" queue.
+
+Builds, for each queued site, the post the compose form makes when the site's
+Post button is clicked: the Showcase lead-in, then the ``11ty-bwe`` mode
+prefix, site name and suffix, then any @-mention found for the site. The app
+schedules every payload as due now; the scheduler's per-platform spacing
+spreads them out, and the post queue records each finished post with
+``update_bwe_after_post``.
+"""
+
+SHOWCASE_LEAD_IN = "From the 11ty Bundle Showcase\n\n"
+
+# BWE platform letters, in the order the sidebar lists them
+LETTER_PLATFORMS = {"M": "mastodon", "B": "bluesky", "D": "discord", "C": "discord_content"}
+
+# Platforms that get the site's @-mention appended
+MENTION_PLATFORMS = ("mastodon", "bluesky")
+
+
+def site_platforms(site):
+    """Platform names selected for a BWE entry (from its M/B/D/C letters)."""
+    letters = site.get("platforms") or []
+    return [name for letter, name in LETTER_PLATFORMS.items() if letter in letters]
+
+
+def site_texts(name, platform_names, mode, mentions=None):
+    """Per-platform texts for site *name*, as the compose form builds them."""
+    prefixes = mode.get("prefixes") or {}
+    suffixes = mode.get("suffixes") or {}
+    mentions = mentions or {}
+    texts = {}
+    for platform in platform_names:
+        text = SHOWCASE_LEAD_IN + prefixes.get(platform, "") + name + suffixes.get(platform, "")
+        mention = mentions.get(platform) if platform in MENTION_PLATFORMS else ""
+        if mention and mention not in text:
+            text = text.rstrip() + " " + mention
+        texts[platform] = text
+    return texts
+
+
+def build_payload(site, platform_names, mode_name, mode, link_url, mentions=None):
+    """A post-queue payload for one BWE site."""
+    texts = site_texts(site["name"], platform_names, mode, mentions)
+    return {
+        "text": texts[platform_names[0]],
+        "platform_texts": texts,
+        "link_url": link_url,
+        "content_warnings": {name: None for name in platform_names},
+        "images": [],
+        "draft_id_to_clean": None,
+        "mode": mode_name,
+        "bwe_site_name": site["name"],
+        "bwe_site_url": site["url"],
+    }
+
+
+def pending_site_urls(items):
+    """BWE site URLs that queue jobs or scheduled entries in *items* still hold."""
+    return {
+        item["payload"].get("bwe_site_url")
+        for item in items
+        if item.get("status") not in ("done", "failed") and item["payload"].get("bwe_site_url")
+    }
+
+
+def select_sites(to_post, count, pending_urls=()):
+    """Pick up to *count* sites from the top of *to_post*.
+
+    Returns ``(selected, skipped)``. Sites already queued or scheduled, and
+    sites with no platforms selected, are skipped with a ``reason`` and do
+    not count towards *count*.
+    """
+    selected, skipped = [], []
+    for site in to_post:
+        if len(selected) >= count:
+            break
+        if site["url"] in pending_urls:
+            skipped.append({"name": site["name"], "url": site["url"], "reason": "already queued"})
+        elif not site_platforms(site):
+            skipped.append({"name": site["name"], "url": site["url"], "reason": "no platforms selected"})
+        else:
+            selected.append(site)
+    return selected, skipped
@@ -1,13 +1,23 @@
 import os
 import re
+import threading
+from contextlib import contextmanager
 from datetime import date
 
+from services.links import normalize_link
+
 _BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 BWE_FILE = os.path.join(_BASE_DIR, "built-with-eleventy.md")
 
 ALL_PLATFORMS = ["B", "C", "D", "M"]
 DEFAULT_PLATFORMS = []
 
+SECTIONS = ("to_post", "posted")
+
+# Parsed model of BWE_FILE, reused until the file's stat signature changes.
+_cache = {"key": None, "model": None}
+_lock = threading.RLock()
+
 _LINK_RE = re.compile(r"^\[(.+?)\]\((.+?)\)(?:\s+\{([A-Z,]+)\})?$")
 _POSTED_RE = re.compile(
     r"^(\d{4}-\d{2}-\d{2}) \[(.+?)\]\((.+?)\)(?:\s+\{([A-Z,]+)\})?(?: — (.+))?$"
@@ -34,7 +44,10 @@ def _extract_platforms_from_status(status):
 
 
 def parse_bwe_file():
-    """Parse the BWE markdown file into to_post and posted lists."""
+    """Parse the BWE markdown file into to_post and posted lists.
+
+    Always reads from disk; most callers want the cached ``load_bwe()`` instead.
+    """
     if not os.path.exists(BWE_FILE):
         return [], []
 
@@ -109,13 +122,217 @@ def _write_bwe_file(to_post, posted):
         lines.append(line)
     lines.append("")
 
-    with open(BWE_FILE, "w") as f:
-        f.write("\n".join(lines))
+    with _lock:
+        _cache["key"] = None
+        with open(BWE_FILE, "w") as f:
+            f.write("\n".join(lines))
+
 
+class BweList:
+    """Parsed BWE file with (name, url) and normalized-URL indexes for both sections.
+
+    Instances returned by ``load_bwe()`` are shared; mutate only inside
+    ``update_bwe()``, which writes the file once when the block exits.
+    """
+
+    def __init__(self, to_post, posted):
+        self.to_post = to_post
+        self.posted = posted
+        self.dirty = False
+        self._keys = {section: {} for section in SECTIONS}
+        self._urls = {section: {} for section in SECTIONS}
+        for section in SECTIONS:
+            for entry in getattr(self, section):
+                self._index(section, entry)
+
+    def _index(self, section, entry):
+        self._keys[section].setdefault((entry["name"], entry["url"]), entry)
+        self._urls[section].setdefault(normalize_link(entry["url"]), entry)
+
+    def find(self, section, name, url):
+        """Return the first entry in *section* with this name and URL, or None."""
+        return self._keys[section].get((name, url))
+
+    def find_url(self, url):
+        """Return (section, entry) for the first entry whose normalized URL matches.
+
+        TO BE POSTED is checked before ALREADY POSTED. Returns (None, None) if absent.
+        """
+        key = normalize_link(url)
+        for section in SECTIONS:
+            entry = self._urls[section].get(key)
+            if entry is not None:
+                return section, entry
+        return None, None
+
+    def add_to_post(self, name, url, platforms=None):
+        """Append an entry to TO BE POSTED and return it."""
+        entry = {
+            "name": name,
+            "url": url,
+            "platforms": sorted(platforms) if platforms is not None else list(DEFAULT_PLATFORMS),
+        }
+        self.to_post.append(entry)
+        self._index("to_post", entry)
+        self.dirty = True
+        return entry
+
+    def remove(self, section, name, url):
+        """Remove every entry in *section* with this name and URL. Returns True if any were removed."""
+        if (name, url) not in self._keys[section]:
+            return False
+        entries = [e for e in getattr(self, section) if not (e["name"] == name and e["url"] == url)]
+        setattr(self, section, entries)
+        del self._keys[section][(name, url)]
+        # Another entry may share the normalized URL under a different name.
+        norm = normalize_link(url)
+        self._urls[section].pop(norm, None)
+        for e in entries:
+            if normalize_link(e["url"]) == norm:
+                self._urls[section][norm] = e
+                break
+        self.dirty = True
+        return True
+
+    def set_platforms(self, name, url, platforms):
+        """Replace the pending platforms of a TO BE POSTED entry. Returns True if found."""
+        entry = self.find("to_post", name, url)
+        if entry is None:
+            return False
+        entry["platforms"] = sorted(p for p in platforms if p in ALL_PLATFORMS)
+        self.dirty = True
+        return True
+
+    def record_post(self, name, url, posted_platforms, timestamp):
+        """Move posted platforms from TO BE POSTED onto the ALREADY POSTED entry."""
+        posted_date = timestamp[:10] if timestamp else date.today().isoformat()
 
-def get_bwe_lists():
-    """Return to_post and posted lists, with formatted dates on posted items."""
-    to_post, posted = parse_bwe_file()
+        entry = self.find("to_post", name, url)
+        if entry is not None:
+            original_platforms = entry.get("platforms", list(DEFAULT_PLATFORMS))
+            remaining = sorted([p for p in original_platforms if p not in posted_platforms])
+            if remaining:
+                entry["platforms"] = remaining
+            else:
+                self._remove_first("to_post", entry)
+
+        # Check if already in posted (previous partial post)
+        existing_posted = self.find("posted", name, url)
+        if existing_posted:
+            merged = sorted(set(existing_posted.get("platforms", []) + posted_platforms))
+            existing_posted["platforms"] = merged
+            existing_posted["date"] = posted_date
+            existing_posted["status"] = ""
+        else:
+            self._prepend_posted({
+                "date": posted_date,
+                "name": name,
+                "url": url,
+                "status": "",
+                "platforms": sorted(posted_platforms),
+            })
+        self.dirty = True
+
+    def record_status(self, name, url, timestamp, status_string):
+        """Legacy move: drop from TO BE POSTED and prepend a status-only posted entry."""
+        self.remove("to_post", name, url)
+        posted_date = timestamp[:10] if timestamp else date.today().isoformat()
+        self._prepend_posted({
+            "date": posted_date,
+            "name": name,
+            "url": url,
+            "status": status_string,
+            "platforms": [],
+        })
+        self.dirty = True
+
+    def _remove_first(self, section, entry):
+        """Remove exactly *entry* (by identity) and repair the indexes."""
+        entries = getattr(self, section)
+        for i, e in enumerate(entries):
+            if e is entry:
+                entries.pop(i)
+                break
+        key = (entry["name"], entry["url"])
+        norm = normalize_link(entry["url"])
+        if self._keys[section].get(key) is entry:
+            del self._keys[section][key]
+            replacement = next((e for e in entries if (e["name"], e["url"]) == key), None)
+            if replacement is not None:
+                self._keys[section][key] = replacement
+        if self._urls[section].get(norm) is entry:
+            del self._urls[section][norm]
+            replacement = next((e for e in entries if normalize_link(e["url"]) == norm), None)
+            if replacement is not None:
+                self._urls[section][norm] = replacement
+
+    def _prepend_posted(self, entry):
+        self.posted.insert(0, entry)
+        # Newest entry wins the indexes, matching a top-down scan of the file.
+        self._keys["posted"][(entry["name"], entry["url"])] = entry
+        self._urls["posted"][normalize_link(entry["url"])] = entry
+
+
+def _stat_key(path):
+    st = os.stat(path)
+    return (path, st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+def load_bwe():
+    """Return the parsed BWE file, re-parsing only when its mtime or size changed.
+
+    The returned BweList is shared -- treat it as read-only outside ``update_bwe()``.
+    """
+    with _lock:
+        try:
+            key = _stat_key(BWE_FILE)
+        except OSError:
+            return BweList([], [])
+        if _cache["key"] == key:
+            return _cache["model"]
+        model = BweList(*parse_bwe_file())
+        _cache["key"] = key
+        _cache["model"] = model
+        return model
+
+
+@contextmanager
+def update_bwe():
+    """Yield the cached BweList for mutation and write the file once on exit.
+
+    Nothing is written if the block made no changes. If the block raises, the
+    cache is dropped so the half-applied changes are never seen.
+    """
+    with _lock:
+        model = load_bwe()
+        try:
+            yield model
+        except BaseException:
+            _cache["key"] = None
+            raise
+        if model.dirty:
+            _write_bwe_file(model.to_post, model.posted)
+            model.dirty = False
+            try:
+                _cache["key"] = _stat_key(BWE_FILE)
+                _cache["model"] = model
+            except OSError:
+                pass
+
+
+def get_bwe_lists(posted_limit=None):
+    """Return to_post and posted lists, with formatted dates on posted items.
+
+    The lists are a snapshot copied under the lock, so an ``update_bwe()`` in
+    another thread is never seen half-applied, and safe for callers to
+    annotate. ``posted_limit`` caps how many ALREADY POSTED entries are copied
+    (newest first) for pages that only show the most recent ones.
+    """
+    with _lock:
+        model = load_bwe()
+        to_post = [dict(e, platforms=list(e.get("platforms", []))) for e in model.to_post]
+        source = model.posted if posted_limit is None else model.posted[:posted_limit]
+        posted = [dict(e, platforms=list(e.get("platforms", []))) for e in source]
     for entry in posted:
         try:
             d = date.fromisoformat(entry["date"])
@@ -134,47 +351,8 @@ def update_bwe_after_post(name, url, posted_platforms, timestamp):
         posted_platforms: List of platform letters that were successfully posted (e.g. ["M", "B"])
         timestamp: ISO timestamp string
     """
-    to_post, posted = parse_bwe_file()
-    posted_date = timestamp[:10] if timestamp else date.today().isoformat()
-
-    # Find the to_post entry
-    original_platforms = None
-    entry_idx = None
-    for i, e in enumerate(to_post):
-        if e["name"] == name and e["url"] == url:
-            original_platforms = e.get("platforms", list(DEFAULT_PLATFORMS))
-            entry_idx = i
-            break
-
-    if entry_idx is not None:
-        remaining = sorted([p for p in original_platforms if p not in posted_platforms])
-        if remaining:
-            to_post[entry_idx]["platforms"] = remaining
-        else:
-            to_post.pop(entry_idx)
-
-    # Check if already in posted (previous partial post)
-    existing_posted = None
-    for e in posted:
-        if e["name"] == name and e["url"] == url:
-            existing_posted = e
-            break
-
-    if existing_posted:
-        merged = sorted(set(existing_posted.get("platforms", []) + posted_platforms))
-        existing_posted["platforms"] = merged
-        existing_posted["date"] = posted_date
-        existing_posted["status"] = ""
-    else:
-        posted.insert(0, {
-            "date": posted_date,
-            "name": name,
-            "url": url,
-            "status": "",
-            "platforms": sorted(posted_platforms),
-        })
-
-    _write_bwe_file(to_post, posted)
+    with update_bwe() as bwe:
+        bwe.record_post(name, url, posted_platforms, timestamp)
 
 
 def mark_bwe_posted(name, url, timestamp, status_string):
@@ -184,39 +362,107 @@ def mark_bwe_posted(name, url, timestamp, status_string):
     """
     # Extract platform letters from the status string for the new format
     posted_platforms = _extract_platforms_from_status(status_string)
-    if posted_platforms:
-        update_bwe_after_post(name, url, posted_platforms, timestamp)
-    else:
-        # Fallback for unknown status strings: remove from to_post, add to posted
-        to_post, posted = parse_bwe_file()
-        to_post = [e for e in to_post if not (e["name"] == name and e["url"] == url)]
-        posted_date = timestamp[:10] if timestamp else date.today().isoformat()
-        posted.insert(0, {
-            "date": posted_date,
-            "name": name,
-            "url": url,
-            "status": status_string,
-            "platforms": [],
-        })
-        _write_bwe_file(to_post, posted)
+    with update_bwe() as bwe:
+        if posted_platforms:
+            bwe.record_post(name, url, posted_platforms, timestamp)
+        else:
+            # Fallback for unknown status strings: remove from to_post, add to posted
+            bwe.record_status(name, url, timestamp, status_string)
 
 
 def add_bwe_to_post(title, url):
     """Append a new entry to the TO BE POSTED section."""
-    to_post, posted = parse_bwe_file()
-    to_post.append({"name": title, "url": url, "platforms": list(DEFAULT_PLATFORMS)})
-    _write_bwe_file(to_post, posted)
+    with update_bwe() as bwe:
+        bwe.add_to_post(title, url)
 
 
 def delete_bwe_to_post(name, url):
     """Remove an entry from the TO BE POSTED section."""
-    to_post, posted = parse_bwe_file()
-    to_post = [e for e in to_post if not (e["name"] == name and e["url"] == url)]
-    _write_bwe_file(to_post, posted)
+    with update_bwe() as bwe:
+        bwe.remove("to_post", name, url)
 
 
 def delete_bwe_posted(name, url):
     """Remove an entry from the ALREADY POSTED section."""
-    to_post, posted = parse_bwe_file()
-    posted = [e for e in posted if not (e["name"] == name and e["url"] == url)]
-    _write_bwe_file(to_post, posted)
+    with update_bwe() as bwe:
+        bwe.remove("posted", name, url)
+
+
+BULK_OPS = ("add", "remove", "platforms", "mark_posted")
+
+
+def operation_error(operation):
+    """Why *operation* is not a well-formed bulk operation, or "" if it is.
+
+    Checks only shapes (an object, string fields, a list of platform
+    strings); ``apply_bwe_operations`` reports unknown ops and missing values.
+    """
+    if not isinstance(operation, dict):
+        return "operation must be an object"
+    for key in ("op", "name", "url", "section", "timestamp"):
+        if operation.get(key) is not None and not isinstance(operation[key], str):
+            return f"{key} must be a string"
+    platforms = operation.get("platforms")
+    if platforms is not None and not (isinstance(platforms, list) and all(isinstance(p, str) for p in platforms)):
+        return "platforms must be a list of strings"
+    return ""
+
+
+def apply_bwe_operations(operations, timestamp=None):
+    """Apply a batch of BWE queue operations with one read and one write.
+
+    Each operation is a dict with ``op`` (one of BULK_OPS), ``name`` and ``url``:
+
+    - ``add``: append to TO BE POSTED (optional ``platforms``); skipped when the
+      normalized URL is already in either section, including earlier adds in
+      the same batch
+    - ``remove``: delete from ``section`` (``to_post`` by default, or ``posted``)
+    - ``platforms``: replace the pending ``platforms`` of a TO BE POSTED entry
+    - ``mark_posted``: record ``platforms`` as posted on ``timestamp`` (per-op
+      value, falling back to the batch *timestamp*)
+
+    Returns a list of ``{"op", "name", "url", "ok", "reason"}`` dicts in input order.
+    """
+    results = []
+    with update_bwe() as bwe:
+        for operation in operations:
+            op = operation.get("op", "")
+            name = (operation.get("name") or "").strip()
+            url = (operation.get("url") or "").strip()
+            result = {"op": op, "name": name, "url": url, "ok": False, "reason": ""}
+            results.append(result)
+
+            if op not in BULK_OPS:
+                result["reason"] = f"unknown op: {op}"
+                continue
+            if not name or not url:
+                result["reason"] = "name and url are required"
+                continue
+            platforms = _parse_platform_spec(",".join(operation.get("platforms") or []))
+
+            if op == "add":
+                section, existing = bwe.find_url(url)
+                if existing is not None:
+                    result["reason"] = f"duplicate of {existing['name']} in {section}"
+                    continue
+                bwe.add_to_post(name, url, platforms)
+                result["ok"] = True
+            elif op == "remove":
+                section = operation.get("section") or "to_post"
+                if section not in SECTIONS:
+                    result["reason"] = f"unknown section: {section}"
+                    continue
+                result["ok"] = bwe.remove(section, name, url)
+                if not result["ok"]:
+                    result["reason"] = "not found"
+            elif op == "platforms":
+                result["ok"] = bwe.set_platforms(name, url, platforms)
+                if not result["ok"]:
+                    result["reason"] = "not found"
+            elif op == "mark_posted":
+                if not platforms:
+                    result["reason"] = "platforms are required"
+                    continue
+                bwe.record_post(name, url, platforms, operation.get("timestamp") or timestamp)
+                result["ok"] = True
+    return results
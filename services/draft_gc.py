@@ -0,0 +1,195 @@
+"""Reclaim orphaned ``posts/draft_images/<id>/`` directories.
+
+Drafts and failed posts persist their images under a directory named after the
+history entry id. A crash (or any exception) between ``shutil.copy2`` and
+``_write_history`` leaves a directory that no history entry points at, and
+nothing else ever removes it. This pass builds the set of referenced ids from
+history, the post queue and the schedule (a queued or scheduled post still
+reads the images of the draft it came from, after ``use_draft`` has removed
+that draft from history), walks the draft directory with ``os.scandir`` and
+removes whatever is unreferenced.
+
+Run as: python -m services.draft_gc [--dry-run] [--budget=SECONDS] [--min-age=SECONDS]
+"""
+
+import argparse
+import json
+import os
+import shutil
+import time
+
+_BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HISTORY_FILE = os.path.join(_BASE_DIR, "posts", "history.json")
+DRAFT_IMAGES_DIR = os.path.join(_BASE_DIR, "posts", "draft_images")
+
+# A directory younger than this may belong to a /post request that has copied
+# its images but not yet written history, so it is left for a later pass.
+DEFAULT_MIN_AGE_SECONDS = 3600
+
+
+def referenced_ids(history):
+    """Return the set of entry ids in *history* (a list of history entries)."""
+    return {entry["id"] for entry in history if entry.get("id")}
+
+
+def pending_draft_ids(items):
+    """Return the draft ids still needed by unfinished post queue jobs or schedule entries."""
+    return {
+        item["payload"]["draft_id_to_clean"]
+        for item in items
+        if item.get("status") not in ("done", "failed") and (item.get("payload") or {}).get("draft_id_to_clean")
+    }
+
+
+def _load_history(path):
+    """Read a JSON list (history, queue or schedule). Returns None when it exists but cannot be parsed."""
+    if not os.path.exists(path):
+        return []
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+
+def _dir_size(path):
+    """Total size in bytes of the regular files under *path*."""
+    total = 0
+    try:
+        with os.scandir(path) as it:
+            for item in it:
+                try:
+                    if item.is_dir(follow_symlinks=False):
+                        total += _dir_size(item.path)
+                    elif item.is_file(follow_symlinks=False):
+                        total += item.stat(follow_symlinks=False).st_size
+                except OSError:
+                    continue
+    except OSError:
+        pass
+    return total
+
+
+def collect_orphaned_draft_images(history_path=None, draft_dir=None, time_budget=None,
+                                  min_age=DEFAULT_MIN_AGE_SECONDS, dry_run=False, also_keep=None,
+                                  queue_path=None, schedule_path=None):
+    """Remove draft image directories that no history entry references.
+
+    Args:
+        history_path: history.json to read (defaults to posts/history.json)
+        draft_dir: directory holding one sub-directory per entry id
+        time_budget: stop after this many seconds (None = no limit); the
+            remaining directories are picked up by the next pass
+        min_age: skip directories modified less than this many seconds ago
+        dry_run: report what would be removed without deleting anything
+        also_keep: further ids to keep
+        queue_path: post-queue.json to read (defaults to the one beside history)
+        schedule_path: post-schedule.json to read (defaults to the one beside history)
+
+    Returns a report dict: ``scanned``, ``removed`` (list of ids),
+    ``reclaimed_bytes``, ``kept``, ``skipped_recent``, ``timed_out`` and
+    ``error`` (set when history, the queue or the schedule could not be read,
+    in which case nothing is removed).
+    """
+    history_path = history_path or HISTORY_FILE
+    draft_dir = draft_dir or DRAFT_IMAGES_DIR
+    queue_path = queue_path or os.path.join(os.path.dirname(history_path), "post-queue.json")
+    schedule_path = schedule_path or os.path.join(os.path.dirname(history_path), "post-schedule.json")
+    report = {
+        "scanned": 0,
+        "removed": [],
+        "reclaimed_bytes": 0,
+        "kept": 0,
+        "skipped_recent": 0,
+        "timed_out": False,
+        "error": "",
+    }
+
+    keep = set(also_keep or ())
+    for path in (history_path, queue_path, schedule_path):
+        items = _load_history(path)
+        if items is None:
+            # Never guess: an unreadable file would make the directories it references look orphaned.
+            report["error"] = f"Could not read {path}"
+            return report
+        keep |= referenced_ids(items) if path == history_path else pending_draft_ids(items)
+
+    if not os.path.isdir(draft_dir):
+        return report
+
+    started = time.monotonic()
+    now = time.time()
+    with os.scandir(draft_dir) as it:
+        for item in it:
+            if time_budget is not None and time.monotonic() - started >= time_budget:
+                report["timed_out"] = True
+                break
+            try:
+                if not item.is_dir(follow_symlinks=False):
+                    continue
+                mtime = item.stat(follow_symlinks=False).st_mtime
+            except OSError:
+                continue
+            report["scanned"] += 1
+
+            if item.name in keep:
+                report["kept"] += 1
+                continue
+            if now - mtime < min_age:
+                report["skipped_recent"] += 1
+                continue
+
+            # Only directories being removed are sized, so the budget bounds the whole pass
+            size = _dir_size(item.path)
+            if not dry_run:
+                shutil.rmtree(item.path, ignore_errors=True)
+            report["removed"].append(item.name)
+            report["reclaimed_bytes"] += size
+
+    return report
+
+
+def format_report(report, dry_run=False):
+    """Render a report dict as a one-line summary."""
+    if report["error"]:
+        return f"Draft image GC skipped: {report['error']}"
+    verb = "Would reclaim" if dry_run else "Reclaimed"
+    line = (
+        f"{verb} {report['reclaimed_bytes']:,} bytes from {len(report['removed'])} "
+        f"orphaned draft image dirs ({report['scanned']} scanned, {report['kept']} in use, "
+        f"{report['skipped_recent']} too recent)"
+    )
+    if report["timed_out"]:
+        line += " -- time budget reached, rest left for next run"
+    return line
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Remove orphaned draft image directories")
+    parser.add_argument("--dry-run", action="store_true", help="Report without deleting")
+    parser.add_argument("--budget", type=float, default=None, help="Time budget in seconds (default: none)")
+    parser.add_argument("--min-age", type=float, default=DEFAULT_MIN_AGE_SECONDS,
+                        help=f"Skip dirs modified within this many seconds (default: {DEFAULT_MIN_AGE_SECONDS})")
+    parser.add_argument("--history", type=str, default=None, help="Path to history.json")
+    parser.add_argument("--draft-dir", type=str, default=None, help="Path to draft_images directory")
+    parser.add_argument("--queue", type=str, default=None, help="Path to post-queue.json")
+    parser.add_argument("--schedule", type=str, default=None, help="Path to post-schedule.json")
+
+    args = parser.parse_args()
+
+    report = collect_orphaned_draft_images(
+        history_path=args.history,
+        draft_dir=args.draft_dir,
+        time_budget=args.budget,
+        min_age=args.min_age,
+        dry_run=args.dry_run,
+        queue_path=args.queue,
+        schedule_path=args.schedule,
+    )
+    print(format_report(report, dry_run=args.dry_run))
+    for entry_id in report["removed"]:
+        print(f"  {entry_id}")
+
+
+if __name__ == "__main__":
+    main()
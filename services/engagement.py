@@ -0,0 +1,200 @@
+"""Engagement counts for recently published posts.
+
+The compose sidebar shows favourites, boosts and replies (Mastodon) and likes,
+reposts, replies and quotes (Bluesky) next to each recent post.
+``EngagementCollector`` keeps the counts in a JSON file keyed by post URL.
+Each count expires after a TTL that grows with the post's age, since a post's
+numbers settle within days. A background thread refreshes whatever has
+expired.
+
+A refresh only looks at the newest WINDOW published entries and fetches at
+most MAX_POSTS_PER_REFRESH of them. Each platform is asked once, with its
+own batching and conditional requests (``PlatformClient.engagement``), so
+the cost of a refresh does not grow with the length of history.
+"""
+
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from platforms import get_platform
+
+WINDOW = 50  # newest published history entries that get stats
+MAX_POSTS_PER_REFRESH = 50
+REFRESH_INTERVAL = 300
+# (post age up to, TTL) in seconds; older posts get MAX_TTL
+TTL_STEPS = (
+    (3600, 300),
+    (24 * 3600, 1800),
+    (7 * 24 * 3600, 6 * 3600),
+)
+MAX_TTL = 24 * 3600
+ERROR_TTL = 600  # after a failed fetch, wait this long before asking again
+STATS_PLATFORMS = ("mastodon", "bluesky")
+
+
+def ttl_for(age):
+    """Seconds until counts for a post *age* seconds old should be fetched again."""
+    for max_age, ttl in TTL_STEPS:
+        if age <= max_age:
+            return ttl
+    return MAX_TTL
+
+
+def _posted_at(entry):
+    try:
+        return datetime.fromisoformat(entry["timestamp"]).timestamp()
+    except (KeyError, TypeError, ValueError):
+        return 0.0
+
+
+def recent_posts(history, window=WINDOW):
+    """``[(platform, post_url, posted_at)]`` for the newest *window* published entries."""
+    posts = []
+    published = [e for e in history if not e.get("is_draft") and not e.get("is_failed") and e.get("platforms")]
+    for entry in published[:window]:
+        for p in entry["platforms"]:
+            if p.get("name") in STATS_PLATFORMS and p.get("post_url"):
+                posts.append((p["name"], p["post_url"], _posted_at(entry)))
+    return posts
+
+
+class EngagementCollector:
+    """Engagement counts persisted at *path*, refreshed from ``load_history()``'s posts.
+
+    With ``threaded=False`` no thread is started; call ``refresh()``.
+    """
+
+    def __init__(self, path, load_history, threaded=True, interval=REFRESH_INTERVAL,
+                 max_posts=MAX_POSTS_PER_REFRESH):
+        self.path = path
+        self.load_history = load_history
+        self.threaded = threaded
+        self.interval = interval
+        self.max_posts = max_posts
+        self._entries = None  # post_url -> {"platform", "counts", "fetched", "expires"}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        self._stop = False
+
+    # --- Persistence (caller holds the lock) ---
+
+    def _load(self):
+        if self._entries is not None:
+            return
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+            self._entries = data if isinstance(data, dict) else {}
+        except (OSError, json.JSONDecodeError):
+            self._entries = {}
+
+    def _save(self, keep):
+        """Write the entries for the post URLs in *keep*, dropping the rest."""
+        self._entries = {url: e for url, e in self._entries.items() if url in keep}
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self._entries, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+    # --- Public API ---
+
+    def counts(self, entries):
+        """``{post_url: counts}`` for the platform posts of history *entries*, from the store only."""
+        with self._lock:
+            self._load()
+            return {
+                p["post_url"]: self._entries[p["post_url"]]["counts"]
+                for entry in entries
+                for p in entry.get("platforms") or []
+                if p.get("post_url") in self._entries and self._entries[p["post_url"]].get("counts")
+            }
+
+    def due(self, posts, now=None):
+        """The *posts* whose counts have expired, never-fetched first, capped at ``max_posts``."""
+        now = time.time() if now is None else now
+        with self._lock:
+            self._load()
+            stale = [
+                (self._entries.get(url, {}).get("expires", 0), -posted_at, name, url, posted_at)
+                for name, url, posted_at in posts
+                if self._entries.get(url, {}).get("expires", 0) <= now
+            ]
+        stale.sort()
+        return [(name, url, posted_at) for _, _, name, url, posted_at in stale[:self.max_posts]]
+
+    def refresh(self, now=None):
+        """Fetch counts for the posts that are due. Returns ``{"fetched", "errors"}``.
+
+        Platforms are asked concurrently, once each. A platform that fails
+        keeps its old counts and is retried after ERROR_TTL.
+        """
+        now = time.time() if now is None else now
+        posts = recent_posts(self.load_history())
+        groups = {}
+        for name, url, posted_at in self.due(posts, now):
+            groups.setdefault(name, []).append((url, posted_at))
+
+        def fetch(name):
+            client = get_platform(name)
+            if not client.validate_credentials():
+                return name, {}, f"{name} credentials not configured"
+            try:
+                return name, client.engagement([url for url, _ in groups[name]]), ""
+            except Exception as e:
+                return name, {}, str(e)
+
+        results = []
+        if groups:
+            with ThreadPoolExecutor(max_workers=len(groups), thread_name_prefix="engagement") as pool:
+                results = list(pool.map(fetch, groups))
+
+        fetched, errors = 0, {}
+        with self._lock:
+            self._load()
+            for name, counts, error in results:
+                if error:
+                    errors[name] = error
+                for url, posted_at in groups[name]:
+                    entry = self._entries.setdefault(url, {"platform": name, "counts": None, "fetched": 0})
+                    if error:
+                        entry["expires"] = now + ERROR_TTL
+                        continue
+                    # A post missing from the response was deleted; keep its last counts
+                    if url in counts:
+                        entry["counts"] = counts[url]
+                        fetched += 1
+                    entry["fetched"] = now
+                    entry["expires"] = now + ttl_for(now - posted_at)
+            if groups:
+                self._save({url for _, url, _ in posts})
+        return {"fetched": fetched, "errors": errors}
+
+    def start(self):
+        """Start the refresh thread (if threaded)."""
+        if not self.threaded or self._thread is not None:
+            return
+        self._stop = False
+        self._wake.clear()
+        self._thread = threading.Thread(target=self._loop, name="engagement", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop = True
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(5)
+            self._thread = None
+
+    def _loop(self):
+        while not self._stop:
+            try:
+                self.refresh()
+            except Exception:
+                pass  # a bad history read or disk error; try again next round
+            self._wake.wait(self.interval)
@@ -1,12 +1,32 @@
-from urllib.parse import urljoin
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import replace
+from urllib.parse import urljoin, urlsplit, urlunsplit
 
 import requests
 from bs4 import BeautifulSoup
+
+import config
 from platforms.base import LinkCard
+from services.media import normalize_thumbnail
+
+CARD_TTL = 3600
+MAX_CARDS = 128
+# prune() leaves image files younger than this alone; put() may not have indexed them yet
+PRUNE_GRACE = 60
 
 
 def fetch_og_metadata(url):
     """Fetch Open Graph metadata from a URL. Returns a LinkCard."""
+    return _fetch_card(url)[0]
+
+
+def _fetch_card(url):
+    """Fetch a LinkCard for *url*. Returns ``(card, ok)``; ok is False when the
+    page itself could not be fetched (the card then carries the error)."""
     try:
         headers = {
             "User-Agent": "Mozilla/5.0 (compatible; SocialPoster/1.0)"
@@ -33,6 +53,7 @@ def fetch_og_metadata(url):
         # Fetch thumbnail image data if available
         image_data = b""
         image_mime = ""
+        image_width = image_height = 0
         if image_url:
             try:
                 # Resolve relative URLs (path-relative, absolute-path, protocol-relative)
@@ -42,9 +63,8 @@ def fetch_og_metadata(url):
                     image_url, headers=headers, timeout=10
                 )
                 img_resp.raise_for_status()
-                image_data = img_resp.content
-                image_mime = img_resp.headers.get(
-                    "content-type", "image/jpeg"
+                image_data, image_mime, (image_width, image_height) = normalize_thumbnail(
+                    img_resp.content, img_resp.headers.get("content-type", "image/jpeg")
                 )
             except Exception:
                 pass
@@ -56,6 +76,144 @@ def fetch_og_metadata(url):
             image_url=image_url or "",
             image_data=image_data,
             image_mime=image_mime,
-        )
+            image_width=image_width,
+            image_height=image_height,
+        ), True
     except Exception as e:
-        return LinkCard(url=url, title="", description=str(e))
+        return LinkCard(url=url, title="", description=str(e)), False
+
+
+def cache_key(url):
+    """Normalize *url* for the card cache: lowercase scheme and host, no
+    fragment, no trailing slash. The path and query keep their case."""
+    parts = urlsplit(url.strip())
+    path = parts.path.rstrip("/")
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, parts.query, ""))
+
+
+class LinkCardCache:
+    """TTL cache of LinkCards keyed by normalized URL.
+
+    Card text stays in memory; image bytes are written to *cache_dir* (one
+    file per URL) and read back on a hit, so a handful of multi-megabyte OG
+    images don't sit in the process. Only cards whose page fetched cleanly
+    are cached. A file is deleted when its card expires or is evicted;
+    ``prune()`` removes files the index no longer knows, such as those left
+    by an earlier run.
+    """
+
+    def __init__(self, cache_dir=None, ttl=CARD_TTL, max_entries=MAX_CARDS):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._cards = OrderedDict()  # key -> (expires_at, card without image_data, image path or "")
+        self._lock = threading.Lock()
+
+    def _dir(self):
+        return self.cache_dir or config.LINK_CARD_CACHE_DIR
+
+    def _drop(self, key):
+        """Forget *key* and delete its image file. Caller holds the lock."""
+        _, _, image_path = self._cards.pop(key)
+        if image_path:
+            try:
+                os.remove(image_path)
+            except OSError:
+                pass
+
+    def get(self, url):
+        """Return the cached LinkCard for *url* (with its image bytes), or None."""
+        key = cache_key(url)
+        with self._lock:
+            hit = self._cards.get(key)
+            if hit is None:
+                return None
+            expires_at, card, image_path = hit
+            if expires_at < time.monotonic():
+                self._drop(key)
+                return None
+            self._cards.move_to_end(key)
+        image_data = b""
+        if image_path:
+            try:
+                with open(image_path, "rb") as f:
+                    image_data = f.read()
+            except OSError:
+                with self._lock:
+                    if key in self._cards:
+                        self._drop(key)
+                return None
+        return replace(card, url=url, image_data=image_data)
+
+    def put(self, url, card):
+        key = cache_key(url)
+        image_path = ""
+        if card.image_data:
+            cache_dir = self._dir()
+            image_path = os.path.join(cache_dir, hashlib.sha256(key.encode("utf-8")).hexdigest())
+            try:
+                os.makedirs(cache_dir, exist_ok=True)
+                tmp_path = f"{image_path}.{threading.get_ident()}.tmp"
+                with open(tmp_path, "wb") as f:
+                    f.write(card.image_data)
+                os.replace(tmp_path, image_path)
+            except OSError:
+                return
+        with self._lock:
+            if key in self._cards:
+                _, _, old_path = self._cards.pop(key)
+                if old_path and old_path != image_path:
+                    try:
+                        os.remove(old_path)
+                    except OSError:
+                        pass
+            now = time.monotonic()
+            for old_key in [k for k, (expires_at, _, _) in self._cards.items() if expires_at < now]:
+                self._drop(old_key)
+            self._cards[key] = (now + self.ttl, replace(card, image_data=b""), image_path)
+            while len(self._cards) > self.max_entries:
+                self._drop(next(iter(self._cards)))
+
+    def prune(self):
+        """Delete image files in the cache dir that no cached card uses. Returns the count removed."""
+        cache_dir = self._dir()
+        cutoff = time.time() - PRUNE_GRACE
+        with self._lock:
+            in_use = {image_path for _, _, image_path in self._cards.values()}
+        removed = 0
+        try:
+            names = os.listdir(cache_dir)
+        except OSError:
+            return 0
+        for name in names:
+            path = os.path.join(cache_dir, name)
+            try:
+                if path not in in_use and os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+                    removed += 1
+            except OSError:
+                pass
+        return removed
+
+    def clear(self):
+        with self._lock:
+            for key in list(self._cards):
+                self._drop(key)
+
+
+card_cache = LinkCardCache()
+
+
+def get_link_card(url):
+    """LinkCard for *url*, from the cache when fresh, else fetched and cached.
+
+    ``/link-preview`` and ``/post`` both go through here, so submitting a post
+    reuses the card (and OG image) the preview already downloaded.
+    """
+    card = card_cache.get(url)
+    if card is not None:
+        return card
+    card, ok = _fetch_card(url)
+    if ok:
+        card_cache.put(url, card)
+    return card
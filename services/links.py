@@ -0,0 +1,16 @@
+"""Normalize entry links so the same page compares equal however it was typed.
+
+``/editor/check-url``, ``/editor/data``, the prebuild sync and stash ingestion
+all match links against bundledb.json and showcase-data.json with this, and
+the BWE list (services/bwe_list.py) indexes its entries by it.
+"""
+
+import re
+
+
+def normalize_link(url):
+    """Lowercase, strip trailing slash, ensure protocol, strip www."""
+    s = (url or "").strip().lower().rstrip("/")
+    if s and not s.startswith(("http://", "https://")):
+        s = "https://" + s
+    return re.sub(r"^(https?://)www\.", r"\1", s)
@@ -1,7 +1,16 @@
+import hashlib
+import io
+import math
 import os
+import struct
+import threading
+import time
 import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
 
-from PIL import Image
+from PIL import Image, ImageOps
 from werkzeug.utils import secure_filename
 
 import config
@@ -15,60 +24,426 @@ def allowed_file(filename):
     )
 
 
-def get_mime_type(file_path):
+# Bytes kept from the start of an image for sniffing. A JPEG's frame header
+# follows its EXIF and ICC segments, which fit in this for camera and phone files.
+SNIFF_BYTES = 256 * 1024
+COPY_CHUNK = 64 * 1024
+
+_PIL_MIME = {
+    "jpeg": "image/jpeg",
+    "jpg": "image/jpeg",
+    "png": "image/png",
+    "gif": "image/gif",
+    "webp": "image/webp",
+}
+# JPEG start-of-frame markers (C4, C8 and CC are other segment types)
+_JPEG_SOF = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+
+
+def _sniff_jpeg(head):
+    i = 2
+    while i + 4 <= len(head):
+        if head[i] != 0xFF:
+            return None
+        marker = head[i + 1]
+        if marker == 0xFF:  # fill byte
+            i += 1
+            continue
+        if marker == 0x01 or 0xD0 <= marker <= 0xD8:  # standalone markers
+            i += 2
+            continue
+        if marker in _JPEG_SOF:
+            if i + 9 > len(head):
+                return None
+            height, width = struct.unpack(">HH", head[i + 5:i + 9])
+            return "image/jpeg", width, height
+        if marker == 0xDA:  # scan data before any frame header
+            return None
+        i += 2 + struct.unpack(">H", head[i + 2:i + 4])[0]
+    return None
+
+
+def _sniff_webp(head):
+    chunk = head[12:16]
+    if chunk == b"VP8 " and len(head) >= 30 and head[23:26] == b"\x9d\x01\x2a":
+        width, height = struct.unpack("<HH", head[26:30])
+        return "image/webp", width & 0x3FFF, height & 0x3FFF
+    if chunk == b"VP8L" and len(head) >= 25 and head[20] == 0x2F:
+        bits = int.from_bytes(head[21:25], "little")
+        return "image/webp", (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+    if chunk == b"VP8X" and len(head) >= 30:
+        width = int.from_bytes(head[24:27], "little") + 1
+        height = int.from_bytes(head[27:30], "little") + 1
+        return "image/webp", width, height
+    return None
+
+
+def sniff_image(head):
+    """Format and pixel size from an image's leading bytes, without decoding it.
+
+    Returns ``(mime_type, width, height)`` for PNG, GIF, WebP and JPEG, or
+    None if *head* is something else or too short to tell. JPEG sizes are as
+    stored, before any EXIF rotation.
+    """
     try:
-        img = Image.open(file_path)
-        fmt = img.format.lower()
-        mime_map = {
-            "jpeg": "image/jpeg",
-            "jpg": "image/jpeg",
-            "png": "image/png",
-            "gif": "image/gif",
-            "webp": "image/webp",
-        }
-        return mime_map.get(fmt, "image/jpeg")
+        if head[:8] == b"\x89PNG\r\n\x1a\n" and head[12:16] == b"IHDR":
+            width, height = struct.unpack(">II", head[16:24])
+            return "image/png", width, height
+        if head[:6] in (b"GIF87a", b"GIF89a"):
+            width, height = struct.unpack("<HH", head[6:10])
+            return "image/gif", width, height
+        if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+            return _sniff_webp(head)
+        if head[:3] == b"\xff\xd8\xff":
+            return _sniff_jpeg(head)
+    except struct.error:
+        pass
+    return None
+
+
+def image_info(file_path, head=None):
+    """``(mime_type, width, height)`` for an image file, read from its header.
+
+    Uses *head* (the file's first bytes) if given, else reads up to
+    SNIFF_BYTES. Falls back to PIL, which also only parses the header, and
+    finally to ``("image/jpeg", 0, 0)``.
+    """
+    try:
+        if head is None:
+            with open(file_path, "rb") as f:
+                head = f.read(SNIFF_BYTES)
+        info = sniff_image(head)
+        if info:
+            return info
+        with Image.open(file_path) as img:
+            return _PIL_MIME.get((img.format or "").lower(), "image/jpeg"), img.width, img.height
     except Exception:
-        return "image/jpeg"
+        return "image/jpeg", 0, 0
+
+
+def get_mime_type(file_path):
+    return image_info(file_path)[0]
+
+
+def describe_image(file_path, alt_text="", head=None):
+    """A MediaAttachment for an image on disk, with its format, size and dimensions."""
+    mime_type, width, height = image_info(file_path, head)
+    try:
+        size = os.path.getsize(file_path)
+    except OSError:
+        size = 0
+    return MediaAttachment(file_path=file_path, mime_type=mime_type, alt_text=alt_text,
+                           width=width, height=height, size=size)
 
 
-def compress_for_bluesky(file_path, mime_type):
-    """Compress image to fit under Bluesky's 1MB limit. Returns new path."""
+# JPEG quality bounds for Bluesky compression, searched in QUALITY_STEP steps
+QUALITY_MAX = 85
+QUALITY_MIN = 20
+QUALITY_STEP = 5
+# A photo's encode typically shrinks by this factor per QUALITY_STEP; only
+# the first guess uses it, later ones interpolate between measured encodes
+QUALITY_STEP_RATIO = 0.85
+# Quality alone is expected to shrink a q85 encode by about this much; past
+# that, pre-size the image so q85 lands near PRESIZE_TARGET x the limit. A
+# pre-size whose q85 lands outside PRESIZE_FLOOR..PRESIZE_CEILING x the limit
+# is redone once, since bytes per pixel change with the scale
+PRESIZE_THRESHOLD = 1.5
+PRESIZE_TARGET = 0.95
+PRESIZE_FLOOR = 0.8
+PRESIZE_CEILING = 1.15
+MIN_DIMENSION = 512
+
+
+def _encode_jpeg(img, quality):
+    buf = io.BytesIO()
+    img.save(buf, "JPEG", quality=quality, optimize=True)
+    return buf.getvalue()
+
+
+def _scaled(img, scale):
+    """*img* resized by *scale*, or None if that would go below MIN_DIMENSION."""
+    size = (max(1, round(img.width * scale)), max(1, round(img.height * scale)))
+    if max(size) < MIN_DIMENSION:
+        return None
+    return img.resize(size, Image.LANCZOS)
+
+
+def _guess_quality(sizes, limit, fit, miss):
+    """The grid quality strictly between *fit* and *miss* expected to land just under *limit*.
+
+    Interpolates log(size) against quality between the measured encodes at
+    *fit* and *miss* (or the two lowest misses while nothing has fit); with
+    only one encode measured, assumes QUALITY_STEP_RATIO.
+    """
+    other = fit if fit in sizes else min((q for q in sizes if q > miss), default=None)
+    if other is None:
+        slope = -math.log(QUALITY_STEP_RATIO) / QUALITY_STEP
+    else:
+        slope = max(math.log(sizes[other] / sizes[miss]) / (other - miss), 1e-3)
+    quality = miss - (math.log(sizes[miss]) - math.log(limit)) / slope
+    quality = QUALITY_MIN + round((quality - QUALITY_MIN) / QUALITY_STEP) * QUALITY_STEP
+    return max(fit + QUALITY_STEP, min(miss - QUALITY_STEP, quality))
+
+
+def _best_quality(img, limit, top_size):
+    """The highest grid quality whose encode fits *limit*. Returns bytes or None.
+
+    *top_size* is the size of the QUALITY_MAX encode, which did not fit. Each
+    guess interpolates between the closest encodes that fit and missed, so
+    the search usually settles in one or two encodes.
+    """
+    sizes = {QUALITY_MAX: top_size}
+    fit, miss = QUALITY_MIN - QUALITY_STEP, QUALITY_MAX  # nothing fits below QUALITY_MIN
+    best = None
+    while miss - fit > QUALITY_STEP:
+        quality = _guess_quality(sizes, limit, fit, miss)
+        data = _encode_jpeg(img, quality)
+        sizes[quality] = len(data)
+        if len(data) <= limit:
+            fit, best = quality, data
+        else:
+            miss = quality
+    return best
+
+
+def compress_for_bluesky(file_path, mime_type, output_path=None):
+    """Compress image to fit under Bluesky's 1MB limit. Returns new path.
+
+    Encodes happen in memory and only the result is written, to *output_path*
+    (default: ``<file_path>.compressed.jpg``). One encode at QUALITY_MAX
+    measures bytes per pixel; images that quality alone can't bring under the
+    limit are resized to the estimated pixel budget and measured again (and
+    resized once more if that estimate was well off), then the quality is
+    searched from the measured sizes. A 12 MP phone photo takes two to four
+    encodes and keeps QUALITY_MAX or one step below.
+    """
+    limit = config.BLUESKY_MAX_IMAGE_SIZE
     file_size = os.path.getsize(file_path)
-    if file_size <= config.BLUESKY_MAX_IMAGE_SIZE:
+    if file_size <= limit:
         return file_path
+    compressed_path = output_path or file_path + ".compressed.jpg"
 
-    img = Image.open(file_path)
+    img = ImageOps.exif_transpose(Image.open(file_path))
 
     # Convert to RGB if needed (for JPEG saving)
-    if img.mode in ("RGBA", "P"):
+    if img.mode not in ("RGB", "L"):
+        img = img.convert("RGB")
+
+    data = _encode_jpeg(img, QUALITY_MAX)
+    if len(data) > limit * PRESIZE_THRESHOLD:
+        # The first pre-size assumes bytes scale with pixels. When its q85
+        # lands well off target, redo it once with the exponent it measured
+        original, full_size = img, len(data)
+        scale = math.sqrt(limit * PRESIZE_TARGET / full_size)
+        for refit in (False, True):
+            resized = _scaled(original, scale)
+            if resized is None:
+                break
+            img = resized
+            data = _encode_jpeg(img, QUALITY_MAX)
+            if refit or limit * PRESIZE_FLOOR <= len(data) <= limit * PRESIZE_CEILING:
+                break
+            exponent = math.log(full_size / len(data)) / math.log(1 / scale ** 2)  # bytes ~ pixels ** exponent
+            if exponent <= 0:
+                break
+            scale = min(1.0, scale * (limit * PRESIZE_TARGET / len(data)) ** (0.5 / exponent))
+    if len(data) > limit:
+        data = _best_quality(img, limit, len(data))
+
+    # Last resort: keep shrinking at a fixed quality
+    while data is None and max(img.size) * 3 // 4 >= MIN_DIMENSION:
+        img = img.resize((img.width * 3 // 4, img.height * 3 // 4), Image.LANCZOS)
+        data = _encode_jpeg(img, 60)
+        if len(data) > limit:
+            data = None
+
+    if data is None:
+        return file_path
+    with open(compressed_path, "wb") as f:
+        f.write(data)
+    return compressed_path
+
+
+# Link-card thumbnails: Bluesky shows external-embed thumbs at card size, so
+# anything past this box or byte count is wasted upload
+THUMB_MAX_SIZE = (1200, 1200)
+THUMB_MAX_BYTES = 300_000
+
+
+def normalize_thumbnail(data, mime_type=""):
+    """Bound a link-card image's resolution and size, once, before caching.
+
+    Returns ``(data, mime_type, (width, height))`` where the dimensions are
+    the original image's. Images already within THUMB_MAX_SIZE and
+    THUMB_MAX_BYTES in a format Bluesky accepts are returned unchanged;
+    anything else is downscaled and re-encoded as JPEG. Bytes PIL can't read
+    are passed through with ``(0, 0)``.
+    """
+    try:
+        img = Image.open(io.BytesIO(data))
+        size = img.size
+        fmt = (img.format or "").lower()
+    except Exception:
+        return data, mime_type, (0, 0)
+
+    fits = size[0] <= THUMB_MAX_SIZE[0] and size[1] <= THUMB_MAX_SIZE[1]
+    if fits and len(data) <= THUMB_MAX_BYTES and fmt in ("jpeg", "png", "webp"):
+        return data, f"image/{fmt}", size
+
+    img = ImageOps.exif_transpose(img)
+    if img.mode in ("RGBA", "LA", "P"):
+        # Flatten transparency onto white rather than JPEG's default black
+        img = img.convert("RGBA")
+        background = Image.new("RGB", img.size, "white")
+        background.paste(img, mask=img.getchannel("A"))
+        img = background
+    elif img.mode not in ("RGB", "L"):
         img = img.convert("RGB")
+    img.thumbnail(THUMB_MAX_SIZE, Image.LANCZOS)
+
+    encoded = _encode_jpeg(img, QUALITY_MAX)
+    if len(encoded) > THUMB_MAX_BYTES:
+        encoded = _best_quality(img, THUMB_MAX_BYTES, len(encoded)) or _encode_jpeg(img, QUALITY_MIN)
+    return encoded, "image/jpeg", size
+
+
+# Which variant each platform gets. Platforms not listed post the originals.
+PLATFORM_PROFILES = {
+    "bluesky": "bluesky-1mb",
+}
+DERIVATIVE_WORKERS = 4
+MAX_DIGESTS = 256  # memoized file digests kept, least recently used evicted first
 
-    # Progressively reduce quality
-    quality = 85
-    while quality >= 20:
-        compressed_path = file_path + ".compressed.jpg"
-        img.save(compressed_path, "JPEG", quality=quality, optimize=True)
-        if os.path.getsize(compressed_path) <= config.BLUESKY_MAX_IMAGE_SIZE:
-            return compressed_path
-        os.remove(compressed_path)
-        quality -= 10
-
-    # Last resort: resize
-    max_dim = 2048
-    while max_dim >= 512:
-        img.thumbnail((max_dim, max_dim), Image.LANCZOS)
-        compressed_path = file_path + ".compressed.jpg"
-        img.save(compressed_path, "JPEG", quality=60, optimize=True)
-        if os.path.getsize(compressed_path) <= config.BLUESKY_MAX_IMAGE_SIZE:
-            return compressed_path
-        os.remove(compressed_path)
-        max_dim -= 512
-
-    return file_path
-
-
-def save_upload(file_storage):
-    """Save an uploaded file to the uploads directory. Returns the file path."""
+_digests = OrderedDict()  # (path, mtime_ns, size) -> sha256 hex
+_digests_lock = threading.Lock()
+
+
+def file_digest(file_path):
+    """SHA-256 of a file's contents, memoized on path, mtime and size."""
+    st = os.stat(file_path)
+    key = (file_path, st.st_mtime_ns, st.st_size)
+    with _digests_lock:
+        if key in _digests:
+            _digests.move_to_end(key)
+            return _digests[key]
+    h = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    digest = h.hexdigest()
+    with _digests_lock:
+        _digests[key] = digest
+        while len(_digests) > MAX_DIGESTS:
+            _digests.popitem(last=False)
+    return digest
+
+
+def _derive_bluesky(att, cache_dir):
+    if (att.size or os.path.getsize(att.file_path)) <= config.BLUESKY_MAX_IMAGE_SIZE:
+        return att
+    cached = os.path.join(cache_dir, f"{file_digest(att.file_path)}-bluesky-1mb.jpg")
+    if not os.path.exists(cached):
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_path = f"{cached}.{uuid.uuid4().hex}.tmp"
+        result = compress_for_bluesky(att.file_path, att.mime_type, output_path=tmp_path)
+        if result != tmp_path:
+            # Could not get under the limit; post the original and let Bluesky decide
+            return att
+        os.replace(tmp_path, cached)
+    else:
+        # Mark it used so prune_derivatives() keeps variants that are still retried
+        os.utime(cached)
+    return describe_image(cached, att.alt_text)
+
+
+_DERIVERS = {
+    "bluesky-1mb": _derive_bluesky,
+}
+
+
+def derive(att, profile, cache_dir=None):
+    """Return a new MediaAttachment holding *att* rendered for *profile*.
+
+    Variants are cached in MEDIA_DERIVATIVES_DIR by source hash and profile,
+    so posting or retrying the same image again skips the re-encode. Falls
+    back to the original if the variant cannot be produced.
+    """
+    deriver = _DERIVERS.get(profile)
+    if deriver is None:
+        return att
+    try:
+        return deriver(att, cache_dir or config.MEDIA_DERIVATIVES_DIR)
+    except Exception:
+        return att
+
+
+def prune_derivatives(cache_dir=None, max_age=None):
+    """Delete cached variants not used for *max_age* seconds. Returns the count removed."""
+    cache_dir = cache_dir or config.MEDIA_DERIVATIVES_DIR
+    max_age = config.MEDIA_DERIVATIVES_MAX_AGE if max_age is None else max_age
+    cutoff = time.time() - max_age
+    removed = 0
+    try:
+        names = os.listdir(cache_dir)
+    except OSError:
+        return 0
+    for name in names:
+        path = os.path.join(cache_dir, name)
+        try:
+            if os.path.getmtime(path) < cutoff:
+                os.remove(path)
+                removed += 1
+        except OSError:
+            pass
+    return removed
+
+
+def prepare_platform_media(platform_names, attachments, cache_dir=None, timings=None):
+    """Compute every platform's image variants up front, in a worker pool.
+
+    Returns ``{platform: tuple_of_attachments}``. Each platform gets its own
+    copies, so nothing a client does to its attachments leaks into another's,
+    and the caller's *attachments* are never modified. If *timings* is a
+    dict, it receives the seconds until each platform's variants were ready.
+    """
+    attachments = list(attachments or [])
+    profiles = {PLATFORM_PROFILES.get(name) for name in platform_names} - {None}
+    variants = {}
+    ready_at = {}  # profile -> seconds after start when its last variant finished
+    if attachments and profiles:
+        tasks = [(i, profile) for profile in sorted(profiles) for i in range(len(attachments))]
+        started = time.perf_counter()
+
+        def run(task):
+            variant = derive(attachments[task[0]], task[1], cache_dir)
+            elapsed = time.perf_counter() - started
+            ready_at[task[1]] = max(ready_at.get(task[1], 0.0), elapsed)
+            return variant
+
+        with ThreadPoolExecutor(max_workers=min(DERIVATIVE_WORKERS, len(tasks))) as pool:
+            results = pool.map(run, tasks)
+            variants = dict(zip(tasks, results))
+    if timings is not None:
+        for name in platform_names:
+            if PLATFORM_PROFILES.get(name) in ready_at:
+                timings[name] = ready_at[PLATFORM_PROFILES[name]]
+
+    prepared = {}
+    for name in platform_names:
+        profile = PLATFORM_PROFILES.get(name)
+        prepared[name] = tuple(
+            replace(variants.get((i, profile), att)) for i, att in enumerate(attachments)
+        )
+    return prepared
+
+
+def save_upload(file_storage, alt_text=""):
+    """Stream an upload to the uploads directory, sniffing its header on the way.
+
+    Returns a MediaAttachment with the image's format, dimensions and byte
+    size, so nothing has to reopen the file to find them, or None if the
+    upload is missing or has a disallowed extension.
+    """
     if not file_storage or not file_storage.filename:
         return None
     if not allowed_file(file_storage.filename):
@@ -77,8 +452,17 @@ def save_upload(file_storage):
     filename = secure_filename(file_storage.filename)
     unique_name = f"{uuid.uuid4().hex}_{filename}"
     file_path = os.path.join(config.UPLOAD_FOLDER, unique_name)
-    file_storage.save(file_path)
-    return file_path
+    head = bytearray()
+    size = 0
+    with open(file_path, "wb") as out:
+        for chunk in iter(lambda: file_storage.stream.read(COPY_CHUNK), b""):
+            if len(head) < SNIFF_BYTES:
+                head += chunk[:SNIFF_BYTES - len(head)]
+            out.write(chunk)
+            size += len(chunk)
+    mime_type, width, height = image_info(file_path, bytes(head))
+    return MediaAttachment(file_path=file_path, mime_type=mime_type, alt_text=alt_text,
+                           width=width, height=height, size=size)
 
 
 def process_uploads(files, alt_texts):
@@ -87,18 +471,11 @@ def process_uploads(files, alt_texts):
     for i, f in enumerate(files):
         if not f or not f.filename:
             continue
-        file_path = save_upload(f)
-        if file_path is None:
-            continue
-        mime_type = get_mime_type(file_path)
         alt_text = alt_texts[i] if i < len(alt_texts) else ""
-        attachments.append(
-            MediaAttachment(
-                file_path=file_path,
-                mime_type=mime_type,
-                alt_text=alt_text,
-            )
-        )
+        attachment = save_upload(f, alt_text)
+        if attachment is None:
+            continue
+        attachments.append(attachment)
         if len(attachments) >= config.MAX_IMAGES:
             break
     return attachments
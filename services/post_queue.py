@@ -0,0 +1,246 @@
+"""Durable background queue for posts.
+
+A queued post is one job with a status per platform. Jobs are kept in a JSON
+file, so posts still waiting when the app stops are picked up again on the
+next start. Worker threads run only the platforms that are still pending:
+a platform that fails with a transient error is retried with exponential
+backoff, and a platform that already succeeded is never posted twice. Once
+every platform has either succeeded or given up, the job's ``on_complete``
+callback runs (the app writes the history entry there).
+"""
+
+import json
+import os
+import threading
+import time
+import uuid
+
+from services.post_telemetry import classify_error
+
+MAX_ATTEMPTS = 4
+BASE_DELAY = 5  # seconds before the first retry; doubles each attempt
+MAX_DELAY = 300
+KEEP_FINISHED = 24 * 3600  # finished jobs stay pollable for a day
+
+# Error classes (services.post_telemetry) that a retry cannot fix, or whose
+# post may already have gone out ("deadline": publish stopped waiting on it)
+PERMANENT_ERROR_CLASSES = ("config", "auth", "client", "deadline")
+
+FINISHED = ("done", "failed")
+
+
+def is_retryable(error_class):
+    """True when a failed platform result of *error_class* is worth another attempt."""
+    return error_class not in PERMANENT_ERROR_CLASSES
+
+
+def _error_class(result):
+    """The class recorded for a failed result (its message's class if it has no telemetry)."""
+    return (result.get("telemetry") or {}).get("error_class") or classify_error(result.get("error"))
+
+
+def backoff_delay(attempt, base_delay=BASE_DELAY, max_delay=MAX_DELAY):
+    """Seconds to wait after the *attempt*-th failure (1-based)."""
+    return min(max_delay, base_delay * 2 ** (attempt - 1))
+
+
+class PostQueue:
+    """Jobs persisted at *path*, worked by *workers* threads.
+
+    *run_platforms(payload, platform_names)* posts the job's payload to the
+    given platforms and returns result dicts (``platform``, ``success``,
+    ``post_url``, ``error``), as ``services.posting.publish`` does.
+    *on_complete(job)* is called once per job when it finishes. With
+    ``workers=0`` nothing runs in the background; call ``run_pending()``.
+    """
+
+    def __init__(self, path, run_platforms, on_complete=None, workers=2,
+                 max_attempts=MAX_ATTEMPTS, base_delay=BASE_DELAY, max_delay=MAX_DELAY):
+        self.path = path
+        self.run_platforms = run_platforms
+        self.on_complete = on_complete
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._jobs = None  # job id -> job dict, in enqueue order
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._threads = []
+
+    # --- Persistence (caller holds the lock) ---
+
+    def _load(self):
+        if self._jobs is not None:
+            return
+        try:
+            with open(self.path, "r") as f:
+                jobs = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            jobs = []
+        self._jobs = {job["id"]: job for job in jobs}
+        # A job left "running" was interrupted by a restart; run it again
+        for job in self._jobs.values():
+            if job["status"] == "running":
+                job["status"] = "queued"
+
+    def _save(self):
+        cutoff = time.time() - KEEP_FINISHED
+        self._jobs = {
+            job_id: job for job_id, job in self._jobs.items()
+            if job["status"] not in FINISHED or job["updated"] > cutoff
+        }
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(list(self._jobs.values()), f, indent=2)
+        os.replace(tmp_path, self.path)
+
+    # --- Public API ---
+
+    def enqueue(self, payload, platform_names):
+        """Add a post for *platform_names* and return a copy of its job."""
+        now = time.time()
+        job = {
+            "id": str(uuid.uuid4()),
+            "status": "queued",
+            "created": now,
+            "updated": now,
+            "next_attempt": now,
+            "payload": payload,
+            "platforms": {
+                name: {"status": "pending", "attempts": 0, "post_url": "", "error": ""}
+                for name in platform_names
+            },
+        }
+        with self._lock:
+            self._load()
+            self._jobs[job["id"]] = job
+            self._save()
+            snapshot = json.loads(json.dumps(job))
+        self.start()
+        self._wake.set()
+        return snapshot
+
+    def get(self, job_id):
+        """Return a copy of the job, or None."""
+        with self._lock:
+            self._load()
+            job = self._jobs.get(job_id)
+            return json.loads(json.dumps(job)) if job else None
+
+    def jobs(self):
+        """Copies of every job still on file, oldest first."""
+        with self._lock:
+            self._load()
+            return json.loads(json.dumps(list(self._jobs.values())))
+
+    def start(self):
+        """Start the worker threads (once). No-op when ``workers`` is 0."""
+        with self._lock:
+            if self._threads or not self.workers:
+                return
+            self._stop.clear()
+            for i in range(self.workers):
+                thread = threading.Thread(target=self._work, name=f"post-queue-{i}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def stop(self, timeout=5):
+        """Ask the workers to exit and wait up to *timeout* seconds for them."""
+        self._stop.set()
+        self._wake.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def run_pending(self, now=None):
+        """Run every job that is due, in the calling thread. Returns how many ran."""
+        ran = 0
+        while True:
+            job_id = self._claim(now)
+            if job_id is None:
+                return ran
+            self._run(job_id)
+            ran += 1
+
+    # --- Workers ---
+
+    def _claim(self, now=None):
+        """Mark the oldest due job as running and return its id, or None."""
+        now = time.time() if now is None else now
+        with self._lock:
+            self._load()
+            for job in self._jobs.values():
+                if job["status"] in ("queued", "waiting") and job["next_attempt"] <= now:
+                    job["status"] = "running"
+                    job["updated"] = time.time()
+                    self._save()
+                    return job["id"]
+        return None
+
+    def _seconds_until_due(self):
+        with self._lock:
+            self._load()
+            due = [job["next_attempt"] for job in self._jobs.values()
+                   if job["status"] in ("queued", "waiting")]
+        return max(0.0, min(due) - time.time()) if due else None
+
+    def _work(self):
+        while not self._stop.is_set():
+            job_id = self._claim()
+            if job_id is not None:
+                self._run(job_id)
+                continue
+            self._wake.wait(self._seconds_until_due())
+            self._wake.clear()
+
+    def _run(self, job_id):
+        with self._lock:
+            job = self._jobs[job_id]
+            payload = job["payload"]
+            pending = [name for name, state in job["platforms"].items() if state["status"] == "pending"]
+
+        try:
+            results = self.run_platforms(payload, pending)
+        except Exception as e:
+            results = [{"platform": name, "success": False, "error": str(e)} for name in pending]
+
+        with self._lock:
+            now = time.time()
+            attempt = 0
+            for result in results:
+                state = job["platforms"].get(result["platform"])
+                if state is None:
+                    continue
+                state["attempts"] += 1
+                attempt = max(attempt, state["attempts"])
+                if result.get("telemetry"):
+                    state["telemetry"] = result["telemetry"]  # the latest attempt's
+                if result["success"]:
+                    state.update(status="success", post_url=result.get("post_url") or "", error="")
+                else:
+                    state["error"] = result.get("error") or "Unknown error"
+                    if state["attempts"] >= self.max_attempts or not is_retryable(_error_class(result)):
+                        state["status"] = "failed"
+
+            still_pending = any(s["status"] == "pending" for s in job["platforms"].values())
+            if still_pending:
+                job["status"] = "waiting"
+                job["next_attempt"] = now + backoff_delay(attempt, self.base_delay, self.max_delay)
+            else:
+                all_ok = all(s["status"] == "success" for s in job["platforms"].values())
+                job["status"] = "done" if all_ok else "failed"
+            job["updated"] = now
+            self._save()
+            finished = not still_pending
+            snapshot = json.loads(json.dumps(job))
+
+        if finished and self.on_complete:
+            try:
+                self.on_complete(snapshot)
+            except Exception as e:
+                with self._lock:
+                    job["complete_error"] = str(e)
+                    self._save()
@@ -0,0 +1,124 @@
+"""Per-platform posting telemetry.
+
+Every platform attempt reports how long each phase took (``auth``,
+``compress``, ``upload``, ``create``, plus platform extras such as Mastodon's
+``processing`` or Discord's ``rate_limit_wait``), the media bytes it sent, the
+requests its client retried, and a coarse error class. The app stores this on
+the history entry under ``telemetry``; ``summarize()`` rolls recent entries up
+per platform for /db-mgmt.
+"""
+
+import re
+import statistics
+
+from platforms.base import status_error_class
+
+# An HTTP status where the message carries one as a status: Mastodon's
+# ('Mastodon API returned error', 422, ...) tuple, requests' "404 Client
+# Error", atproto's "400 ExpiredToken: ...", Discord's "API error 503: ...".
+# Bare numbers elsewhere in the text (ports, character limits) are ignored.
+_STATUS_PATTERN = re.compile(
+    r"^\('[^']*', (\d{3}),|^(\d{3})\b|\b(?:API error|status(?: code)?|HTTP)[ :=]+(\d{3})\b", re.I
+)
+
+# A session token that ran out; the client logs in again on the next attempt
+_SESSION_PATTERN = re.compile(r"ExpiredToken|InvalidToken|token (?:has )?expired", re.I)
+
+# First match wins; checked against the error message when it carries no status
+_ERROR_CLASSES = (
+    ("timeout", re.compile(r"timed? ?out|TimeoutError|still processing", re.I)),
+    ("network", re.compile(r"connection|network|resolve|reset by peer|ssl", re.I)),
+    ("rate_limit", re.compile(r"rate.?limit|too many requests", re.I)),
+    ("auth", re.compile(r"unauthori[sz]ed|forbidden|authentication|login|invalid identifier|expired", re.I)),
+    ("server", re.compile(r"bad gateway|service unavailable|internal server error", re.I)),
+    ("client", re.compile(r"invalid|too large|not found", re.I)),
+)
+
+SUMMARY_WINDOW = 200  # most recent history entries with telemetry
+
+
+def classify_error(error):
+    """A coarse class for a failed attempt's error message ("" on success)."""
+    if not error:
+        return ""
+    if "credentials not configured" in error:
+        return "config"
+    if _SESSION_PATTERN.search(error):
+        return "session"
+    match = _STATUS_PATTERN.search(error)
+    by_status = status_error_class(int(next(filter(None, match.groups())))) if match else ""
+    if by_status:
+        return by_status
+    for name, pattern in _ERROR_CLASSES:
+        if pattern.search(error):
+            return name
+    return "other"
+
+
+def build(seconds, phases=None, bytes_uploaded=0, retries=0, error="", error_class=None):
+    """The telemetry dict stored for one platform attempt.
+
+    *error_class* (from the exception type or HTTP status, see
+    ``PlatformClient.error_class``) overrides the class ``classify_error``
+    would give *error*.
+    """
+    return {
+        "seconds": round(seconds, 3),
+        "phases": {name: round(value, 3) for name, value in (phases or {}).items()},
+        "bytes_uploaded": bytes_uploaded,
+        "retries": retries,
+        "error_class": classify_error(error) if error_class is None else error_class,
+    }
+
+
+def _percentile(values, pct):
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method="inclusive")[pct - 1]
+
+
+def summarize(history, window=SUMMARY_WINDOW):
+    """Per-platform rollup of the newest *window* entries that carry telemetry.
+
+    Returns ``[{"platform", "attempts", "succeeded", "p50", "p95",
+    "phases": {name: mean seconds}, "avg_bytes", "retries", "errors":
+    {class: count}}]`` ordered by platform name.
+    """
+    samples = {}
+    seen = 0
+    for entry in history:
+        telemetry = entry.get("telemetry")
+        if not telemetry:
+            continue
+        seen += 1
+        if seen > window:
+            break
+        for platform, t in telemetry.items():
+            samples.setdefault(platform, []).append(t)
+
+    rows = []
+    for platform in sorted(samples):
+        items = samples[platform]
+        seconds = [t.get("seconds", 0.0) for t in items]
+        phase_values = {}
+        for t in items:
+            for name, value in t.get("phases", {}).items():
+                phase_values.setdefault(name, []).append(value)
+        errors = {}
+        for t in items:
+            if t.get("error_class"):
+                errors[t["error_class"]] = errors.get(t["error_class"], 0) + 1
+        uploads = [t.get("bytes_uploaded", 0) for t in items if t.get("bytes_uploaded")]
+        rows.append({
+            "platform": platform,
+            "attempts": len(items),
+            "succeeded": len(items) - sum(errors.values()),
+            "p50": _percentile(seconds, 50),
+            "p95": _percentile(seconds, 95),
+            "phases": {name: statistics.fmean(values) for name, values in sorted(phase_values.items())},
+            "avg_bytes": int(statistics.fmean(uploads)) if uploads else 0,
+            # Client retries plus extra attempts the post queue made
+            "retries": sum(t.get("retries", 0) + max(t.get("attempts", 1) - 1, 0) for t in items),
+            "errors": errors,
+        })
+    return rows
@@ -0,0 +1,188 @@
+"""Fan a post out to the selected platforms concurrently.
+
+``post()`` used to call each platform client in turn, so a request took the sum
+of every platform's latency. ``publish()`` runs one job per platform on its own
+thread, waits for each up to its platform deadline (and never past the overall
+budget), and returns results in the order the platforms were selected. A
+platform that fails or runs out of time does not affect the others. The same
+fan-out deletes or edits a post already published (``remote_jobs()``).
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+from platforms import get_platform
+from platforms.base import PlatformClient
+from services import post_telemetry
+from services.media import prepare_platform_media
+
+PLATFORM_ORDER = ["mastodon", "bluesky", "discord", "discord_content"]
+
+# Seconds each platform may take, and the ceiling for the whole fan-out.
+PLATFORM_DEADLINES = {
+    "mastodon": 60,
+    "bluesky": 60,
+    "discord": 30,
+    "discord_content": 30,
+}
+DEFAULT_DEADLINE = 60
+POST_BUDGET = 90
+
+
+def build_jobs(platform_names, text, platform_texts=None, attachments=None, link_card=None,
+               content_warnings=None):
+    """Build one job dict per platform with that platform's text, media and card.
+
+    Mastodon gets the link URL appended to its text instead of a card, since it
+    does not embed cards via the API. Image variants (Bluesky's 1 MB JPEGs) are
+    computed here, before the fan-out, and each job gets its own tuple; the
+    time that took is carried as the job's ``compress_seconds``.
+    """
+    compress = {}
+    media = prepare_platform_media(platform_names, attachments, timings=compress)
+    jobs = []
+    for name in platform_names:
+        post_text = (platform_texts or {}).get(name, text)
+        card = link_card
+        if name == "mastodon":
+            if link_card and link_card.url and link_card.url not in post_text:
+                post_text = f"{post_text}\n\n{link_card.url}"
+            card = None
+        jobs.append({
+            "platform": name,
+            "text": post_text,
+            "media": media[name],
+            "content_warning": (content_warnings or {}).get(name) or None,
+            "link_card": card,
+            "compress_seconds": compress.get(name, 0.0),
+        })
+    return jobs
+
+
+def post_to_platform(job):
+    """Run one platform job in the calling thread. Returns a result dict; never raises.
+
+    The dict carries the attempt's ``telemetry`` (see services.post_telemetry).
+    """
+    platform_name = job["platform"]
+    phases = {}
+    if job.get("compress_seconds"):
+        phases["compress"] = job["compress_seconds"]
+    # The attempt's clock includes the image variants built for it before the fan-out
+    started = time.perf_counter() - phases.get("compress", 0.0)
+
+    def failed(error, error_class=None):
+        return {
+            "platform": platform_name,
+            "success": False,
+            "error": error,
+            "telemetry": post_telemetry.build(time.perf_counter() - started, phases, error=error,
+                                              error_class=error_class),
+        }
+
+    try:
+        client = get_platform(platform_name)
+        if not client.validate_credentials():
+            return failed(f"{platform_name} credentials not configured")
+        result = client.post(
+            text=job["text"],
+            media=list(job["media"]) or None,
+            content_warning=job["content_warning"],
+            link_card=job["link_card"],
+        )
+        phases.update(result.phases)
+        return {
+            "platform": result.platform,
+            "success": result.success,
+            "post_url": result.post_url,
+            "error": result.error,
+            "telemetry": post_telemetry.build(
+                time.perf_counter() - started, phases,
+                result.bytes_uploaded, result.retries, result.error,
+                error_class=result.error_class or None,
+            ),
+        }
+    except Exception as e:
+        return failed(str(e), PlatformClient.error_class(e) or None)
+
+
+def remote_jobs(action, platform_entries, texts=None):
+    """Jobs that delete or edit (*action*) the published posts in *platform_entries*.
+
+    *platform_entries* are history ``platforms`` items (``name``, ``post_url``);
+    entries without a URL are skipped. Edits take each platform's new text
+    from *texts*.
+    """
+    return [
+        {"platform": p["name"], "action": action, "post_url": p["post_url"],
+         "text": (texts or {}).get(p["name"], "")}
+        for p in platform_entries
+        if p.get("post_url")
+    ]
+
+
+def update_platform(job):
+    """Run one delete or edit job in the calling thread. Returns a result dict; never raises."""
+    platform_name = job["platform"]
+    started = time.perf_counter()
+
+    def finished(success, error="", phases=None, retries=0, error_class=None):
+        return {
+            "platform": platform_name,
+            "success": success,
+            "post_url": job["post_url"],
+            "error": error,
+            "telemetry": post_telemetry.build(time.perf_counter() - started, phases, retries=retries, error=error,
+                                              error_class=error_class),
+        }
+
+    try:
+        client = get_platform(platform_name)
+        if not client.validate_credentials():
+            return finished(False, f"{platform_name} credentials not configured")
+        if job["action"] == "delete":
+            result = client.delete(job["post_url"])
+        else:
+            result = client.edit(job["post_url"], job["text"])
+        return finished(result.success, result.error, result.phases, result.retries, result.error_class or None)
+    except Exception as e:
+        return finished(False, str(e), error_class=PlatformClient.error_class(e) or None)
+
+
+def publish(jobs, deadlines=None, budget=POST_BUDGET, run=post_to_platform):
+    """Run *jobs* concurrently and return their result dicts in job order.
+
+    Each job is handed to *run*: ``post_to_platform`` for new posts, or
+    ``update_platform`` for deleting and editing published ones.
+
+    Each job gets ``deadlines[platform]`` seconds (DEFAULT_DEADLINE if absent),
+    capped by *budget* measured from the start of the fan-out. A job that
+    overruns is reported as failed; its thread is left to finish in the
+    background, so the platform may still publish.
+    """
+    if not jobs:
+        return []
+    deadlines = PLATFORM_DEADLINES if deadlines is None else deadlines
+    started = time.monotonic()
+    executor = ThreadPoolExecutor(max_workers=len(jobs), thread_name_prefix="post")
+    try:
+        futures = [executor.submit(run, job) for job in jobs]
+        results = []
+        for job, future in zip(jobs, futures):
+            limit = min(deadlines.get(job["platform"], DEFAULT_DEADLINE), budget)
+            remaining = started + limit - time.monotonic()
+            try:
+                results.append(future.result(timeout=max(remaining, 0)))
+            except FutureTimeout:
+                error = f"Timed out after {limit}s (the post may still complete)"
+                results.append({
+                    "platform": job["platform"],
+                    "success": False,
+                    "error": error,
+                    # The platform call is still running and may yet post
+                    "telemetry": post_telemetry.build(time.monotonic() - started, error=error,
+                                                      error_class="deadline"),
+                })
+        return results
+    finally:
+        executor.shutdown(wait=False)
@@ -2,10 +2,11 @@
 
 import json
 import os
-import re
 import shutil
 import subprocess
 
+from services.links import normalize_link
+
 BUNDLEDB_DIR = "/Users/Bob/Dropbox/Docs/Sites/11tybundle/11tybundledb"
 BUNDLEDB_PATH = os.path.join(BUNDLEDB_DIR, "bundledb.json")
 SHOWCASE_PATH = os.path.join(BUNDLEDB_DIR, "showcase-data.json")
@@ -122,15 +123,6 @@ def sync_bundledb_repo(commit_message="Added new entries"):
     return {"success": True, "message": "; ".join(messages)}
 
 
-def _normalize_link(url):
-    """Normalize URL for comparison: lowercase, strip trailing slash, add protocol, strip www."""
-    s = (url or "").strip().lower().rstrip("/")
-    if s and not s.startswith(("http://", "https://")):
-        s = "https://" + s
-    s = re.sub(r"^(https?://)www\.", r"\1", s)
-    return s
-
-
 def _issue_as_int(val):
     """Convert an Issue field value to int, or return None."""
     if val is None or val == "":
@@ -165,7 +157,7 @@ def load_recent_issue_entries(bundledb_path=None, showcase_path=None):
     """
     bundledb = _load_bundledb(bundledb_path)
     showcase = _load_showcase(showcase_path)
-    showcase_by_link = {_normalize_link(s.get("link", "")): s for s in showcase if s.get("link")}
+    showcase_by_link = {normalize_link(s.get("link", "")): s for s in showcase if s.get("link")}
 
     # Find all unique issue numbers
     issue_set = set()
@@ -192,7 +184,7 @@ def load_recent_issue_entries(bundledb_path=None, showcase_path=None):
 
         # Merge showcase data for sites
         if e.get("Type") == "site":
-            sc = showcase_by_link.get(_normalize_link(e.get("Link", "")))
+            sc = showcase_by_link.get(normalize_link(e.get("Link", "")))
             if sc:
                 e["screenshotpath"] = sc.get("screenshotpath", "")
                 e["ogImagePath"] = sc.get("ogImagePath", "")
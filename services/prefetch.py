@@ -0,0 +1,127 @@
+"""Background warm-up of editor metadata for queued entries.
+
+When the stash or the SveltiaCMS queue hands the editor its next entry, the
+editor immediately asks for favicon, description and leaderboard results one
+after another. ``MetadataPrefetcher`` starts those lookups for the next few
+queued URLs on a small thread pool, so the editor's requests find a finished
+(or already in-flight) result instead of paying the network latency while the
+user waits.
+
+Only lookups that read are warmed. Screenshots write files into the site's
+content directories and content reviews are paid API calls, so those run
+only when the editor asks for them.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+SITE_KINDS = ("favicon", "description", "leaderboard")
+DEFAULT_KINDS = ("description",)
+
+
+def kinds_for_type(entry_type):
+    """Which lookups to warm for an entry of *entry_type*."""
+    return SITE_KINDS if entry_type == "site" else DEFAULT_KINDS
+
+
+class MetadataPrefetcher:
+    """TTL cache of per-URL lookups, filled ahead of time by a thread pool.
+
+    *fetchers* maps a kind (e.g. ``"favicon"``) to a function of one URL.
+    Results are cached per ``(kind, url)`` for *ttl* seconds; at most
+    *max_entries* results are kept (least recently used evicted first).
+    Exceptions, ``None`` and dicts carrying an ``error`` key are handed back
+    but not cached, so a transient failure is retried on the next request.
+    """
+
+    def __init__(self, fetchers, max_workers=4, ttl=1800, max_entries=256):
+        self.fetchers = fetchers
+        self.max_workers = max_workers
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._results = OrderedDict()  # (kind, url) -> (expires_at, value)
+        self._inflight = {}  # (kind, url) -> Future
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def _pool(self):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                thread_name_prefix="prefetch")
+        return self._executor
+
+    def _fresh(self, key):
+        """Cached value for *key* as ``(True, value)``, or ``(False, None)``. Caller holds the lock."""
+        hit = self._results.get(key)
+        if hit is None:
+            return False, None
+        expires_at, value = hit
+        if expires_at < time.monotonic():
+            del self._results[key]
+            return False, None
+        self._results.move_to_end(key)
+        return True, value
+
+    def _store(self, key, value):
+        if value is None or (isinstance(value, dict) and value.get("error")):
+            return
+        with self._lock:
+            self._results[key] = (time.monotonic() + self.ttl, value)
+            self._results.move_to_end(key)
+            while len(self._results) > self.max_entries:
+                self._results.popitem(last=False)
+
+    def _run(self, kind, url):
+        key = (kind, url)
+        try:
+            value = self.fetchers[kind](url)
+            self._store(key, value)
+            return value
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def warm(self, url, kinds=SITE_KINDS):
+        """Start background lookups of *kinds* for *url* that are not cached or running."""
+        url = (url or "").strip()
+        if not url:
+            return
+        with self._lock:
+            for kind in kinds:
+                key = (kind, url)
+                if kind not in self.fetchers or key in self._inflight or self._fresh(key)[0]:
+                    continue
+                self._inflight[key] = self._pool().submit(self._run, kind, url)
+
+    def peek(self, kind, url):
+        """Return ``(True, value)`` if a finished result is cached, else ``(False, None)``. Never blocks."""
+        with self._lock:
+            return self._fresh((kind, (url or "").strip()))
+
+    def get(self, kind, url, timeout=None, refresh=False):
+        """Return the result for *kind* and *url*, waiting on an in-flight warm-up if there is one.
+
+        Falls back to calling the fetcher in the request thread when nothing is
+        cached or running, or when *refresh* is set. Exceptions from the
+        fetcher propagate.
+        """
+        url = (url or "").strip()
+        key = (kind, url)
+        future = None
+        if not refresh:
+            with self._lock:
+                found, value = self._fresh(key)
+                if found:
+                    return value
+                future = self._inflight.get(key)
+        if future is not None:
+            return future.result(timeout=timeout)
+        value = self.fetchers[kind](url)
+        self._store(key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._results.clear()
@@ -0,0 +1,85 @@
+"""Pre-flight checks for a post, run before any upload or network request.
+
+``post()`` used to find out a post was doomed only from the platform's
+response, after images had been compressed and uploaded. ``check()`` applies
+each platform's limits to the text it would get (graphemes against
+``char_limit``, with Mastodon counting URLs as 23), the image count and byte
+size, alt text, and images sent alongside a link card. Platforms that would
+fail are rejected up front with a reason; the rest post as before.
+"""
+
+import os
+
+import config
+from platforms import PLATFORMS
+
+
+# Platforms that get a post's link appended to its text rather than as an embed
+LINK_IN_TEXT = ("mastodon", "discord", "discord_content")
+
+
+def platform_text(name, text, platform_texts=None, link_url="", attachments=None):
+    """The text platform *name* will show, including a link appended to it."""
+    post_text = (platform_texts or {}).get(name, text)
+    if name in LINK_IN_TEXT and link_url and not attachments and link_url not in post_text:
+        post_text = f"{post_text}\n\n{link_url}"
+    return post_text
+
+
+def _file_size(path):
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+
+def platform_errors(name, text, attachments=None, link_url=""):
+    """Reasons a post of *text* and *attachments* would fail on *name* (empty if none)."""
+    cls = PLATFORMS[name]
+    attachments = attachments or []
+    errors = []
+
+    length = cls.text_length(text)
+    if length > cls.char_limit:
+        errors.append(f"Text is {length} characters; {name} allows {cls.char_limit}")
+
+    if len(attachments) > cls.max_images:
+        errors.append(f"{len(attachments)} images attached; {name} allows {cls.max_images}")
+    for i, att in enumerate(attachments, start=1):
+        size = att.size or _file_size(att.file_path)
+        if cls.max_image_bytes and size > cls.max_image_bytes:
+            errors.append(
+                f"Image {i} is {size / 1e6:.1f} MB; {name} allows {cls.max_image_bytes / 1e6:.1f} MB"
+            )
+        alt = (att.alt_text or "").strip()
+        if not alt and config.REQUIRE_ALT_TEXT:
+            errors.append(f"Image {i} has no alt text")
+        elif cls.max_alt_text and len(alt) > cls.max_alt_text:
+            errors.append(f"Image {i} alt text is {len(alt)} characters; {name} allows {cls.max_alt_text}")
+
+    if link_url and attachments:
+        # The compose form disables one when the other is set; mirror that here
+        errors.append("A post takes images or a link card, not both")
+    return errors
+
+
+def check(platform_names, text, platform_texts=None, attachments=None, link_url=""):
+    """Split *platform_names* into those that can post and those that cannot.
+
+    Returns ``(accepted, rejected)``: a list of platform names in selection
+    order, and ``[{"platform", "success": False, "error"}]`` result dicts for
+    the rest, in the shape ``publish()`` returns.
+    """
+    accepted, rejected = [], []
+    for name in platform_names:
+        if name not in PLATFORMS:
+            rejected.append({"platform": name, "success": False, "error": f"Unknown platform: {name}"})
+            continue
+        post_text = platform_text(name, text, platform_texts, link_url, attachments)
+        errors = platform_errors(name, post_text, attachments, link_url)
+        if errors:
+            rejected.append({"platform": name, "success": False,
+                             "error": "Not posted: " + "; ".join(errors)})
+        else:
+            accepted.append(name)
+    return accepted, rejected
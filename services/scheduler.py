@@ -0,0 +1,190 @@
+"""In-process scheduler for posts with a ``post_at`` time.
+
+Scheduled posts are kept in a JSON file and in a heap ordered by due time. One
+thread sleeps until the earliest entry is due and hands it to ``fire`` (the
+app enqueues it on the post queue). Entries that came due while the app was
+stopped fire on the next start. When several posts fall due together, a post
+is pushed back until ``min_interval`` seconds have passed since the last post
+fired on each of its platforms, so a burst doesn't trip rate limits.
+"""
+
+import heapq
+import itertools
+import json
+import os
+import threading
+import time
+import uuid
+
+# Minimum spacing between two scheduled posts on the same platform (seconds)
+PLATFORM_MIN_INTERVAL = {
+    "mastodon": 30,
+    "bluesky": 30,
+    "discord": 10,
+    "discord_content": 10,
+}
+DEFAULT_MIN_INTERVAL = 30
+
+
+class PostScheduler:
+    """Scheduled posts persisted at *path*; ``fire(entry)`` runs each one when due.
+
+    With ``threaded=False`` no thread is started; call ``run_due()``.
+    """
+
+    def __init__(self, path, fire, min_interval=None, threaded=True):
+        self.path = path
+        self.fire = fire
+        self.threaded = threaded
+        self.min_interval = PLATFORM_MIN_INTERVAL if min_interval is None else min_interval
+        self._entries = None  # id -> entry
+        self._heap = []  # (due, seq, id)
+        self._seq = itertools.count()
+        self._last_fired = {}  # platform -> epoch seconds
+        self._cond = threading.Condition()
+        self._thread = None
+        self._stop = False
+
+    # --- Persistence (caller holds the condition's lock) ---
+
+    def _load(self):
+        if self._entries is not None:
+            return
+        try:
+            with open(self.path, "r") as f:
+                entries = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            entries = []
+        self._entries = {entry["id"]: entry for entry in entries}
+        self._heap = [(entry["due"], next(self._seq), entry["id"]) for entry in entries]
+        heapq.heapify(self._heap)
+
+    def _save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(sorted(self._entries.values(), key=lambda e: e["due"]), f, indent=2)
+        os.replace(tmp_path, self.path)
+
+    # --- Public API ---
+
+    def schedule(self, payload, platform_names, post_at):
+        """Schedule a post for *post_at* (epoch seconds). Returns the entry."""
+        entry = {
+            "id": str(uuid.uuid4()),
+            "post_at": post_at,
+            "due": post_at,
+            "platforms": list(platform_names),
+            "payload": payload,
+        }
+        with self._cond:
+            self._load()
+            self._entries[entry["id"]] = entry
+            heapq.heappush(self._heap, (entry["due"], next(self._seq), entry["id"]))
+            self._save()
+            self._cond.notify_all()
+        self.start()
+        return dict(entry)
+
+    def cancel(self, entry_id):
+        """Drop a scheduled post. Returns the removed entry, or None."""
+        with self._cond:
+            self._load()
+            entry = self._entries.pop(entry_id, None)
+            if entry is not None:
+                # The heap item is skipped lazily when it surfaces
+                self._save()
+            return entry
+
+    def entries(self):
+        """Scheduled posts, soonest first."""
+        with self._cond:
+            self._load()
+            return [dict(e) for e in sorted(self._entries.values(), key=lambda e: e["due"])]
+
+    def run_due(self, now=None):
+        """Fire every entry due at *now*, in the calling thread. Returns how many fired."""
+        fired = 0
+        while True:
+            entry = self._pop_due(time.time() if now is None else now)
+            if entry is None:
+                return fired
+            self._fire(entry)
+            fired += 1
+
+    def start(self):
+        """Start the scheduler thread (once). No-op when not ``threaded``."""
+        with self._cond:
+            if self._thread is not None or not self.threaded:
+                return
+            self._stop = False
+            self._thread = threading.Thread(target=self._loop, name="post-scheduler", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout=5):
+        with self._cond:
+            self._stop = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self._thread = None
+
+    # --- Internals ---
+
+    def _spacing_delay(self, entry, now):
+        """Seconds *entry* must still wait so each platform keeps its interval."""
+        delay = 0.0
+        for name in entry["platforms"]:
+            last = self._last_fired.get(name)
+            if last is not None:
+                interval = self.min_interval.get(name, DEFAULT_MIN_INTERVAL)
+                delay = max(delay, last + interval - now)
+        return delay
+
+    def _pop_due(self, now):
+        """Remove and return the next entry due at *now*, or None. Re-queues
+        entries held back by platform spacing."""
+        with self._cond:
+            self._load()
+            while self._heap and self._heap[0][0] <= now:
+                due, _, entry_id = heapq.heappop(self._heap)
+                entry = self._entries.get(entry_id)
+                if entry is None or entry["due"] != due:
+                    continue  # cancelled, or superseded by a later push
+                delay = self._spacing_delay(entry, now)
+                if delay > 0:
+                    entry["due"] = now + delay
+                    heapq.heappush(self._heap, (entry["due"], next(self._seq), entry_id))
+                    self._save()
+                    continue
+                del self._entries[entry_id]
+                for name in entry["platforms"]:
+                    self._last_fired[name] = now
+                self._save()
+                return entry
+            return None
+
+    def _fire(self, entry):
+        try:
+            self.fire(entry)
+        except Exception:
+            # Put it back a minute later rather than lose the post
+            with self._cond:
+                entry["due"] = time.time() + 60
+                self._entries[entry["id"]] = entry
+                heapq.heappush(self._heap, (entry["due"], next(self._seq), entry["id"]))
+                self._save()
+
+    def _loop(self):
+        while True:
+            with self._cond:
+                if self._stop:
+                    return
+                self._load()
+                while self._heap and self._heap[0][2] not in self._entries:
+                    heapq.heappop(self._heap)
+                timeout = max(0.0, self._heap[0][0] - time.time()) if self._heap else None
+                if timeout is None or timeout > 0:
+                    self._cond.wait(timeout)
+                    continue
+            self.run_due()
@@ -0,0 +1,225 @@
+"""Bulk-load candidate links into the editor stash (data/stashed-entries.json).
+
+Reads CSV, NDJSON or OPML as a stream, normalizes each link, drops anything
+already in bundledb.json, showcase-data.json or the stash itself, and appends
+the survivors with a single write.
+
+Run as: python -m services.stash_ingest FILE [--format=csv|ndjson|opml] [--type=TYPE] [--dry-run]
+"""
+
+import argparse
+import csv
+import io
+import json
+import os
+import sys
+import xml.etree.ElementTree as ET
+
+from services.links import normalize_link
+
+_BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STASH_PATH = os.path.join(_BASE_DIR, "data", "stashed-entries.json")
+BUNDLEDB_PATH = "/Users/Bob/Dropbox/Docs/Sites/11tybundle/11tybundledb/bundledb.json"
+SHOWCASE_PATH = "/Users/Bob/Dropbox/Docs/Sites/11tybundle/11tybundledb/showcase-data.json"
+
+ENTRY_TYPES = ("blog post", "site", "release", "starter")
+FORMATS = ("csv", "ndjson", "opml")
+DEFAULT_TYPE = "blog post"
+
+
+def guess_format(filename="", content_type=""):
+    """Pick an input format from a filename extension or MIME type. Returns None if unknown."""
+    ext = os.path.splitext(filename or "")[1].lower().lstrip(".")
+    if ext in ("csv", "opml"):
+        return ext
+    if ext in ("ndjson", "jsonl"):
+        return "ndjson"
+    content_type = (content_type or "").lower()
+    if "csv" in content_type:
+        return "csv"
+    if "ndjson" in content_type or "jsonl" in content_type:
+        return "ndjson"
+    if "opml" in content_type or "xml" in content_type:
+        return "opml"
+    return None
+
+
+def _text_stream(stream):
+    """Wrap a binary stream for the line-oriented readers; pass text streams through."""
+    if isinstance(stream, io.TextIOBase):
+        return stream
+    return io.TextIOWrapper(stream, encoding="utf-8", newline="")
+
+
+def iter_csv(stream):
+    """Yield candidate dicts from CSV with a header row (title, link or url, type, date)."""
+    for row in csv.DictReader(_text_stream(stream)):
+        row = {(k or "").strip().lower(): (v or "").strip() for k, v in row.items()}
+        yield {
+            "title": row.get("title", ""),
+            "link": row.get("link") or row.get("url", ""),
+            "type": row.get("type", ""),
+            "date": row.get("date", ""),
+        }
+
+
+def iter_ndjson(stream):
+    """Yield candidate dicts from newline-delimited JSON objects. Bad lines yield an empty link."""
+    for line in _text_stream(stream):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            obj = json.loads(line)
+        except json.JSONDecodeError:
+            yield {"title": "", "link": "", "type": "", "date": ""}
+            continue
+        if not isinstance(obj, dict):
+            continue
+        yield {
+            "title": str(obj.get("title") or "").strip(),
+            "link": str(obj.get("link") or obj.get("url") or "").strip(),
+            "type": str(obj.get("type") or "").strip(),
+            "date": str(obj.get("date") or "").strip(),
+        }
+
+
+def iter_opml(stream):
+    """Yield candidate dicts from OPML <outline> elements, preferring htmlUrl over xmlUrl."""
+    for _, elem in ET.iterparse(stream, events=("end",)):
+        if elem.tag != "outline":
+            continue
+        link = elem.get("htmlUrl") or elem.get("url") or elem.get("xmlUrl") or ""
+        if link:
+            yield {
+                "title": (elem.get("title") or elem.get("text") or "").strip(),
+                "link": link.strip(),
+                "type": "",
+                "date": "",
+            }
+        elem.clear()
+
+
+_READERS = {"csv": iter_csv, "ndjson": iter_ndjson, "opml": iter_opml}
+
+
+def _load_json_list(path):
+    try:
+        with open(path, "r") as f:
+            data = json.load(f)
+        return data if isinstance(data, list) else []
+    except (FileNotFoundError, json.JSONDecodeError):
+        return []
+
+
+def known_links(bundledb, showcase, stash):
+    """Return the set of normalized links already in the database or the stash."""
+    links = set()
+    for item in bundledb:
+        links.add(normalize_link(item.get("Link")))
+    for item in showcase:
+        links.add(normalize_link(item.get("link")))
+    for item in stash:
+        links.add(normalize_link(item.get("link")))
+    links.discard("")
+    return links
+
+
+def ingest(stream, fmt, stash_path=None, bundledb_path=None, showcase_path=None,
+           default_type=DEFAULT_TYPE, dry_run=False):
+    """Stream candidates from *stream* into the stash. Returns a report dict.
+
+    Report keys: ``added`` (count), ``in_database``, ``already_stashed``,
+    ``duplicates`` (repeats within the input), ``invalid`` and ``count``
+    (stash length afterwards). Raises ValueError for an unknown format and
+    ET.ParseError for malformed OPML.
+    """
+    if fmt not in _READERS:
+        raise ValueError(f"Unknown format: {fmt}")
+    if default_type not in ENTRY_TYPES:
+        raise ValueError(f"Unknown type: {default_type}")
+    stash_path = stash_path or STASH_PATH
+
+    stash = _load_json_list(stash_path)
+    stashed = known_links([], [], stash)
+    in_db = known_links(
+        _load_json_list(bundledb_path or BUNDLEDB_PATH),
+        _load_json_list(showcase_path or SHOWCASE_PATH),
+        [],
+    )
+
+    report = {"added": 0, "in_database": 0, "already_stashed": 0, "duplicates": 0, "invalid": 0}
+    seen = set()
+    new_entries = []
+    for candidate in _READERS[fmt](stream):
+        link = candidate["link"]
+        key = normalize_link(link)
+        entry_type = candidate["type"].lower() or default_type
+        if not key or entry_type not in ENTRY_TYPES:
+            report["invalid"] += 1
+            continue
+        if key in in_db:
+            report["in_database"] += 1
+            continue
+        if key in stashed:
+            report["already_stashed"] += 1
+            continue
+        if key in seen:
+            report["duplicates"] += 1
+            continue
+        seen.add(key)
+
+        entry = {"title": candidate["title"] or link, "link": link, "type": entry_type}
+        if candidate["date"]:
+            entry["date"] = candidate["date"]
+        new_entries.append(entry)
+
+    report["added"] = len(new_entries)
+    if new_entries and not dry_run:
+        stash.extend(new_entries)
+        with open(stash_path, "w") as f:
+            json.dump(stash, f, indent=2)
+    report["count"] = len(stash) + (len(new_entries) if dry_run else 0)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk-load links into the editor stash")
+    parser.add_argument("file", help="Input file, or - for stdin")
+    parser.add_argument("--format", choices=FORMATS, default=None, help="Input format (default: from extension)")
+    parser.add_argument("--type", default=DEFAULT_TYPE, choices=ENTRY_TYPES,
+                        help=f"Type for rows without one (default: {DEFAULT_TYPE})")
+    parser.add_argument("--stash", default=None, help="Path to stashed-entries.json")
+    parser.add_argument("--bundledb", default=None, help="Path to bundledb.json")
+    parser.add_argument("--showcase", default=None, help="Path to showcase-data.json")
+    parser.add_argument("--dry-run", action="store_true", help="Report without writing the stash")
+
+    args = parser.parse_args()
+
+    fmt = args.format or guess_format(args.file)
+    if fmt is None:
+        print("Could not tell the input format; pass --format.", file=sys.stderr)
+        sys.exit(1)
+
+    stream = sys.stdin.buffer if args.file == "-" else open(args.file, "rb")
+    try:
+        report = ingest(
+            stream, fmt,
+            stash_path=args.stash,
+            bundledb_path=args.bundledb,
+            showcase_path=args.showcase,
+            default_type=args.type,
+            dry_run=args.dry_run,
+        )
+    finally:
+        if stream is not sys.stdin.buffer:
+            stream.close()
+
+    verb = "Would add" if args.dry_run else "Added"
+    print(f"{verb} {report['added']} entries (stash now {report['count']})")
+    print(f"  {report['in_database']} already in the database, {report['already_stashed']} already stashed, "
+          f"{report['duplicates']} repeated in input, {report['invalid']} invalid")
+
+
+if __name__ == "__main__":
+    main()
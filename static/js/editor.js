@@ -1636,7 +1636,7 @@
         btn.textContent = allPopulated
           ? "Refresh Description, Favicon, Screenshot & Leaderboard"
           : "Fetch Description, Favicon, Screenshot & Leaderboard";
-        btn.addEventListener("click", () => { lastFetchedUrl = ""; fetchSiteData(); });
+        btn.addEventListener("click", () => { lastFetchedUrl = ""; fetchSiteData(allPopulated); });
         editFormFields.appendChild(btn);
       }
       if (field === "Date" && currentType === "release") {
@@ -1644,7 +1644,7 @@
         btn.type = "button";
         btn.className = "btn-action btn-fetch-data";
         btn.textContent = item.description ? "Refresh Description" : "Fetch Description";
-        btn.addEventListener("click", () => { lastFetchedUrl = ""; fetchDescriptionOnly(); });
+        btn.addEventListener("click", () => { lastFetchedUrl = ""; fetchDescriptionOnly(!!item.description); });
         editFormFields.appendChild(btn);
       }
       if (field === "Demo" && currentType === "starter") {
@@ -1655,7 +1655,7 @@
         btn.textContent = allPopulated
           ? "Refresh Description & Screenshot"
           : "Fetch Description & Screenshot";
-        btn.addEventListener("click", () => { lastFetchedUrl = ""; fetchStarterData(); });
+        btn.addEventListener("click", () => { lastFetchedUrl = ""; fetchStarterData(allPopulated); });
         editFormFields.appendChild(btn);
       }
       if (field === "Categories" && currentType === "blog post" && !item.description) {
@@ -2522,7 +2522,8 @@
 
   let lastFetchedUrl = "";
 
-  function fetchSiteData() {
+  // refresh: skip the server's cached (possibly prefetched) lookups
+  function fetchSiteData(refresh) {
     const linkEl = document.getElementById("field-Link");
     const url = linkEl ? linkEl.value.trim() : "";
     if (!url) {
@@ -2549,7 +2550,7 @@
     const faviconPromise = fetch("/editor/favicon", {
       method: "POST",
       headers: { "Content-Type": "application/json" },
-      body: JSON.stringify({ url: url })
+      body: JSON.stringify({ url: url, refresh: !!refresh })
     }).then((r) => r.json()).catch(() => ({ success: false }));
 
     const screenshotPromise = fetch("/editor/screenshot", {
@@ -2561,13 +2562,13 @@
     const descriptionPromise = fetch("/editor/description", {
       method: "POST",
       headers: { "Content-Type": "application/json" },
-      body: JSON.stringify({ url: url })
+      body: JSON.stringify({ url: url, refresh: !!refresh })
     }).then((r) => r.json()).catch(() => ({ success: false }));
 
     const leaderboardPromise = fetch("/editor/leaderboard", {
       method: "POST",
       headers: { "Content-Type": "application/json" },
-      body: JSON.stringify({ url: url })
+      body: JSON.stringify({ url: url, refresh: !!refresh })
     }).then((r) => r.json()).catch(() => ({ success: false }));
 
     const titleEl = document.getElementById("field-Title");
@@ -2665,7 +2666,7 @@
     });
   }
 
-  function fetchStarterData() {
+  function fetchStarterData(refresh) {
     const demoEl = document.getElementById("field-Demo");
     const url = demoEl ? demoEl.value.trim() : "";
     if (!url) {
@@ -2688,7 +2689,7 @@
     const descriptionPromise = fetch("/editor/description", {
       method: "POST",
       headers: { "Content-Type": "application/json" },
-      body: JSON.stringify({ url: url })
+      body: JSON.stringify({ url: url, refresh: !!refresh })
     }).then((r) => r.json()).catch(() => ({ success: false }));
 
     const screenshotPromise = fetch("/editor/screenshot", {
@@ -2733,7 +2734,7 @@
     });
   }
 
-  function fetchDescriptionOnly() {
+  function fetchDescriptionOnly(refresh) {
     const linkEl = document.getElementById("field-Link");
     const url = linkEl ? linkEl.value.trim() : "";
     if (!url) {
@@ -2755,7 +2756,7 @@
     fetch("/editor/description", {
       method: "POST",
       headers: { "Content-Type": "application/json" },
-      body: JSON.stringify({ url: url })
+      body: JSON.stringify({ url: url, refresh: !!refresh })
     }).then((r) => r.json()).then((result) => {
       if (result.success && result.description) {
         const descEl = document.getElementById("field-description");
@@ -4,6 +4,7 @@ import os
 import pytest
 
 import app as app_module
+from services import link_card
 
 
 @pytest.fixture
@@ -32,13 +33,27 @@ def app(tmp_path):
     flask_app.config["DRAFT_IMAGES_DIR"] = str(draft_images_dir)
     flask_app.config["BUNDLEDB_BACKUP_DIR"] = str(backup_dir)
     flask_app.config["SHOWCASE_BACKUP_DIR"] = str(showcase_backup_dir)
+    # No background network lookups from tests; start each test with a cold cache
+    flask_app.config["PREFETCH_AHEAD"] = 0
+    app_module.prefetcher.clear()
+    link_card.card_cache.clear()
+    link_card.card_cache.cache_dir = str(tmp_path / "link-cards")
+    # Queued posts run only when a test calls run_pending()
+    flask_app.config["POST_QUEUE_FILE"] = str(tmp_path / "post-queue.json")
+    flask_app.config["POST_SCHEDULE_FILE"] = str(tmp_path / "post-schedule.json")
+    flask_app.config["POST_QUEUE_WORKERS"] = 0
+    flask_app.config["ENGAGEMENT_FILE"] = str(tmp_path / "engagement.json")
 
     yield flask_app
 
+    link_card.card_cache.clear()
+    link_card.card_cache.cache_dir = None
+
     # Clean up config overrides
     for key in ("BUNDLEDB_PATH", "SHOWCASE_PATH", "HISTORY_FILE",
                 "DRAFT_IMAGES_DIR", "BUNDLEDB_BACKUP_DIR", "SHOWCASE_BACKUP_DIR",
-                "BUNDLEDB_DIR", "STASH_PATH", "TESTING"):
+                "BUNDLEDB_DIR", "STASH_PATH", "PREFETCH_AHEAD", "POST_QUEUE_FILE",
+                "POST_SCHEDULE_FILE", "POST_QUEUE_WORKERS", "ENGAGEMENT_FILE", "TESTING"):
         flask_app.config.pop(key, None)
 
 
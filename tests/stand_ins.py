@@ -0,0 +1,623 @@
+"""Local HTTP stand-ins for the Mastodon, Bluesky (atproto) and Discord APIs.
+
+Each stand-in is a small threaded HTTP server on 127.0.0.1 that answers the
+endpoints the platform clients call with well-formed responses, so the real
+clients (Mastodon.py, atproto, requests) run their whole network path:
+sessions, uploads, polling, retries and rate-limit handling. Latency, a
+random error rate and 429s every Nth request are configurable. Used by
+tests/test_stand_ins.py and scripts/bench-posting.py.
+"""
+
+import base64
+import hashlib
+import io
+import itertools
+import json
+import random
+import re
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from PIL import Image
+
+
+_MAGIC = ((b"\xff\xd8\xff", "image/jpeg"), (b"\x89PNG", "image/png"), (b"GIF8", "image/gif"),
+          (b"RIFF", "image/webp"))
+
+
+def _cid(data, codec=0x55):
+    """A CIDv1 (sha2-256, base32) for *data*, as a PDS would return."""
+    raw = bytes([0x01, codec, 0x12, 0x20]) + hashlib.sha256(data).digest()
+    return "b" + base64.b32encode(raw).decode("ascii").lower().rstrip("=")
+
+
+def _b64url(obj):
+    return base64.urlsafe_b64encode(json.dumps(obj).encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def _jwt(payload):
+    """An unsigned-looking JWT; clients only decode the payload for ``exp``."""
+    return ".".join([_b64url({"typ": "at+jwt", "alg": "ES256K"}), _b64url(payload), "c3RhbmQtaW4"])
+
+
+def _payload(body):
+    """The JSON payload of a webhook request: the body, or its ``payload_json`` part."""
+    match = re.search(rb'name="payload_json"\r\nContent-Type: application/json\r\n\r\n(.*?)\r\n', body, re.S)
+    return json.loads(match.group(1) if match else body)
+
+
+def _handler(stand_in):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive, like the real APIs
+
+        def _dispatch(self, method):
+            parts = urlsplit(self.path)
+            length = int(self.headers.get("Content-Length") or 0)
+            body = self.rfile.read(length) if length else b""
+            status, headers, payload = stand_in.handle(
+                method, parts.path, parse_qs(parts.query), self.headers, body,
+            )
+            data = payload if isinstance(payload, bytes) else json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            headers = {"Content-Type": "application/json", **headers}
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            self._dispatch("GET")
+
+        def do_POST(self):
+            self._dispatch("POST")
+
+        def do_PUT(self):
+            self._dispatch("PUT")
+
+        def do_PATCH(self):
+            self._dispatch("PATCH")
+
+        def do_DELETE(self):
+            self._dispatch("DELETE")
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+class StandIn:
+    """Base stand-in server; subclasses list their endpoints in ``routes``.
+
+    *latency* is added to every response: seconds, or a ``(low, high)`` range
+    drawn uniformly. *error_rate* is the fraction of requests answered with a
+    502. With *rate_limit_every* = N, every Nth request gets a 429 asking the
+    client to wait *retry_after* seconds.
+    """
+
+    routes = ()  # (method, path regex, handler method name)
+
+    def __init__(self, latency=0.0, error_rate=0.0, rate_limit_every=0, retry_after=0.05, seed=0):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rate_limit_every = rate_limit_every
+        self.retry_after = retry_after
+        self.requests = []  # (method, path), in arrival order
+        self.bytes_received = 0
+        self._counter = itertools.count(1)
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+        self.url = None  # set by start(); kept after stop() for assertions
+
+    def start(self):
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), _handler(self))
+        host, port = self._server.server_address[:2]
+        self.url = f"http://{host}:{port}"
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name=type(self).__name__, daemon=True,
+        )
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread.join(5)
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def count(self, path_pattern, method=None):
+        """How many requests so far matched *path_pattern* (a regex)."""
+        with self._lock:
+            return sum(
+                1 for m, path in self.requests
+                if re.fullmatch(path_pattern, path) and method in (None, m)
+            )
+
+    # --- Faults ---
+
+    def _delay(self):
+        if isinstance(self.latency, (tuple, list)):
+            with self._lock:
+                return self._random.uniform(*self.latency)
+        return self.latency
+
+    def _fault(self):
+        """"rate_limit", "error" or None for the request being answered."""
+        with self._lock:
+            n = next(self._counter)
+            if self.rate_limit_every and n % self.rate_limit_every == 0:
+                return "rate_limit"
+            if self.error_rate and self._random.random() < self.error_rate:
+                return "error"
+        return None
+
+    def rate_limited(self):
+        """(status, headers, body) for a 429; subclasses add their platform's headers."""
+        return 429, {"Retry-After": str(self.retry_after)}, {"error": "RateLimitExceeded"}
+
+    def server_error(self):
+        return 502, {}, {"error": "BadGateway", "message": "Stand-in fault"}
+
+    def extra_headers(self):
+        """Headers sent with every successful response."""
+        return {}
+
+    # --- Dispatch (server threads) ---
+
+    def handle(self, method, path, query, headers, body):
+        with self._lock:
+            self.requests.append((method, path))
+            self.bytes_received += len(body)
+        delay = self._delay()
+        if delay:
+            time.sleep(delay)
+        for route_method, pattern, name in self.routes:
+            match = re.fullmatch(pattern, path) if route_method == method else None
+            if match is None:
+                continue
+            fault = self._fault()
+            if fault == "rate_limit":
+                return self.rate_limited()
+            if fault == "error":
+                return self.server_error()
+            status, response_headers, payload = getattr(self, name)(match, query, headers, body)
+            return status, {**self.extra_headers(), **response_headers}, payload
+        return 404, {}, {"error": "NotFound", "message": f"{method} {path}"}
+
+
+class MastodonStandIn(StandIn):
+    """Mastodon status and media APIs.
+
+    Uploaded media reports ``url: null`` for the first *processing_polls*
+    fetches, like an instance still transcoding a large image. Status reads
+    carry an ETag and answer a matching If-None-Match with a 304; set
+    *multi_status* to False to mimic an instance without the multi-status
+    endpoint (before 4.3). Set ``counts[status_id]`` to
+    ``(favourites, boosts, replies)``.
+    """
+
+    routes = (
+        ("GET", r"/api/v[12]/instance/?", "instance"),
+        ("POST", r"/api/v2/media", "upload_media"),
+        ("GET", r"/api/v1/media/(\d+)", "get_media"),
+        ("POST", r"/api/v1/statuses", "create_status"),
+        ("GET", r"/api/v1/statuses", "get_statuses"),
+        ("GET", r"/api/v1/statuses/(\d+)", "get_status"),
+        ("PUT", r"/api/v1/statuses/(\d+)", "update_status"),
+        ("DELETE", r"/api/v1/statuses/(\d+)", "delete_status"),
+    )
+
+    def __init__(self, processing_polls=0, multi_status=True, **kwargs):
+        super().__init__(**kwargs)
+        self.processing_polls = processing_polls
+        self.multi_status = multi_status
+        self.counts = {}
+        self.statuses = []
+        self.status_ids = []  # parallel to statuses
+        self.edits = []  # (status id, fields)
+        self.deleted = []  # status ids
+        self._ids = itertools.count(1)
+        self._pending = {}  # media id -> polls left before it is ready
+
+    def instance(self, match, query, headers, body):
+        # Mastodon.py reads the version before its first media upload
+        return 200, {}, {"uri": "127.0.0.1", "domain": "127.0.0.1", "title": "Stand-in",
+                         "version": "4.3.0", "api_versions": {"mastodon": 2}}
+
+    def _media(self, media_id, ready):
+        return {
+            "id": media_id,
+            "type": "image",
+            "url": f"{self.url}/media/{media_id}.jpg" if ready else None,
+            "preview_url": f"{self.url}/media/{media_id}-small.jpg",
+            "description": None,
+        }
+
+    def upload_media(self, match, query, headers, body):
+        with self._lock:
+            media_id = str(next(self._ids))
+            self._pending[media_id] = self.processing_polls
+        ready = not self.processing_polls
+        return (200 if ready else 202), {}, self._media(media_id, ready)
+
+    def get_media(self, match, query, headers, body):
+        media_id = match.group(1)
+        with self._lock:
+            left = self._pending.get(media_id, 0)
+            if left:
+                self._pending[media_id] = left - 1
+        return (206 if left else 200), {}, self._media(media_id, not left)
+
+    @staticmethod
+    def _fields(headers, body):
+        if "json" in headers.get("Content-Type", ""):
+            return json.loads(body)
+        return {k: v[0] if len(v) == 1 else v for k, v in parse_qs(body.decode("utf-8")).items()}
+
+    def _status(self, status_id, fields):
+        url = f"{self.url}/@bench/{status_id}"
+        media_ids = fields.get("media_ids[]") or fields.get("media_ids") or []
+        return {
+            "id": status_id,
+            "uri": url,
+            "url": url,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "content": fields.get("status", ""),
+            "spoiler_text": fields.get("spoiler_text", ""),
+            "visibility": "public",
+            "favourites_count": self.counts.get(status_id, (0, 0, 0))[0],
+            "reblogs_count": self.counts.get(status_id, (0, 0, 0))[1],
+            "replies_count": self.counts.get(status_id, (0, 0, 0))[2],
+            "media_attachments": [self._media(m, True) for m in
+                                  (media_ids if isinstance(media_ids, list) else [media_ids])],
+            "account": {"id": "1", "username": "bench", "acct": "bench", "url": f"{self.url}/@bench"},
+        }
+
+    def _find(self, status_id):
+        """The fields of a live status, or None."""
+        with self._lock:
+            if status_id in self.status_ids and status_id not in self.deleted:
+                return self.statuses[self.status_ids.index(status_id)]
+        return None
+
+    def create_status(self, match, query, headers, body):
+        fields = self._fields(headers, body)
+        with self._lock:
+            status_id = str(next(self._ids))
+            self.statuses.append(fields)
+            self.status_ids.append(status_id)
+        return 200, {}, self._status(status_id, fields)
+
+    @staticmethod
+    def _conditional(headers, payload):
+        """200 with an ETag for *payload*, or 304 if the client already has it."""
+        etag = 'W/"' + hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()[:16] + '"'
+        if headers.get("If-None-Match") == etag:
+            return 304, {"ETag": etag}, b""
+        return 200, {"ETag": etag}, payload
+
+    def _read(self, status_id):
+        fields = self._find(status_id)
+        if fields is None:
+            return None
+        status = self._status(status_id, fields)
+        status["created_at"] = "2026-01-01T00:00:00+00:00"  # stable, so the ETag only changes with the counts
+        return status
+
+    def get_statuses(self, match, query, headers, body):
+        if not self.multi_status:
+            return 404, {}, {"error": "Record not found"}
+        statuses = [self._read(i) for i in query.get("id[]", [])]
+        return self._conditional(headers, [s for s in statuses if s])
+
+    def get_status(self, match, query, headers, body):
+        status = self._read(match.group(1))
+        if status is None:
+            return 404, {}, {"error": "Record not found"}
+        return self._conditional(headers, status)
+
+    def update_status(self, match, query, headers, body):
+        if self._find(match.group(1)) is None:
+            return 404, {}, {"error": "Record not found"}
+        fields = self._fields(headers, body)
+        with self._lock:
+            self.edits.append((match.group(1), fields))
+        return 200, {}, self._status(match.group(1), fields)
+
+    def delete_status(self, match, query, headers, body):
+        fields = self._find(match.group(1))
+        if fields is None:
+            return 404, {}, {"error": "Record not found"}
+        with self._lock:
+            self.deleted.append(match.group(1))
+        return 200, {}, self._status(match.group(1), fields)
+
+    def extra_headers(self):
+        reset = datetime.now(timezone.utc) + timedelta(minutes=5)
+        return {"X-RateLimit-Limit": "300", "X-RateLimit-Remaining": "299",
+                "X-RateLimit-Reset": reset.isoformat()}
+
+    def rate_limited(self):
+        reset = datetime.now(timezone.utc) + timedelta(seconds=self.retry_after)
+        return 429, {"X-RateLimit-Limit": "300", "X-RateLimit-Remaining": "0",
+                     "X-RateLimit-Reset": reset.isoformat()}, {"error": "Too many requests"}
+
+
+class BlueskyStandIn(StandIn):
+    """An atproto PDS: sessions, blobs, records and handle resolution.
+
+    *handles* maps the handles that resolve to their DIDs; by default every
+    handle resolves to a DID derived from it. getPosts serves the created
+    records that are not deleted, with ``counts[rkey]`` as
+    ``(likes, reposts, replies, quotes)``.
+    """
+
+    routes = (
+        ("POST", r"/xrpc/com\.atproto\.server\.createSession", "create_session"),
+        ("POST", r"/xrpc/com\.atproto\.server\.refreshSession", "refresh_session"),
+        ("GET", r"/xrpc/app\.bsky\.actor\.getProfile", "get_profile"),
+        ("GET", r"/xrpc/com\.atproto\.identity\.resolveHandle", "resolve_handle"),
+        ("POST", r"/xrpc/com\.atproto\.repo\.uploadBlob", "upload_blob"),
+        ("POST", r"/xrpc/com\.atproto\.repo\.createRecord", "create_record"),
+        ("POST", r"/xrpc/com\.atproto\.repo\.deleteRecord", "delete_record"),
+        ("GET", r"/xrpc/app\.bsky\.feed\.getPosts", "get_posts"),
+    )
+
+    def __init__(self, identifier="bench.test", password="app-password", handles=None, **kwargs):
+        super().__init__(**kwargs)
+        self.identifier = identifier
+        self.password = password
+        self.did = "did:plc:" + hashlib.sha256(identifier.encode()).hexdigest()[:24]
+        self.handles = handles
+        self.records = []
+        self.rkeys = []  # parallel to records
+        self.deleted = []  # deleteRecord bodies
+        self.counts = {}
+        self._rkeys = itertools.count(1)
+
+    def _session(self):
+        now = int(time.time())
+        return {
+            "did": self.did,
+            "handle": self.identifier,
+            "active": True,
+            "accessJwt": _jwt({"scope": "com.atproto.appPass", "sub": self.did, "aud": "did:web:127.0.0.1",
+                               "iat": now, "exp": now + 7200}),
+            "refreshJwt": _jwt({"scope": "com.atproto.refresh", "sub": self.did, "aud": "did:web:127.0.0.1",
+                                "iat": now, "exp": now + 90 * 86400, "jti": str(now)}),
+        }
+
+    def create_session(self, match, query, headers, body):
+        data = json.loads(body or b"{}")
+        if data.get("identifier") != self.identifier or data.get("password") != self.password:
+            return 401, {}, {"error": "AuthenticationRequired", "message": "Invalid identifier or password"}
+        return 200, {}, self._session()
+
+    def refresh_session(self, match, query, headers, body):
+        return 200, {}, self._session()
+
+    def get_profile(self, match, query, headers, body):
+        return 200, {}, {"did": self.did, "handle": self.identifier}
+
+    def resolve_handle(self, match, query, headers, body):
+        handle = query.get("handle", [""])[0]
+        if self.handles is None:
+            did = "did:plc:" + hashlib.sha256(handle.encode()).hexdigest()[:24]
+        else:
+            did = self.handles.get(handle)
+        if not did:
+            return 400, {}, {"error": "InvalidRequest", "message": "Unable to resolve handle"}
+        return 200, {}, {"did": did}
+
+    def upload_blob(self, match, query, headers, body):
+        mime_type = headers.get("Content-Type") or "*/*"
+        if mime_type == "*/*":
+            # The PDS sniffs blobs sent without a type
+            mime_type = next((m for magic, m in _MAGIC if body.startswith(magic)), "application/octet-stream")
+        return 200, {}, {"blob": {
+            "$type": "blob",
+            "ref": {"$link": _cid(body)},
+            "mimeType": mime_type,
+            "size": len(body),
+        }}
+
+    def create_record(self, match, query, headers, body):
+        data = json.loads(body)
+        with self._lock:
+            rkey = f"3stand{next(self._rkeys):07d}"
+            self.records.append(data)
+            self.rkeys.append(rkey)
+        return 200, {}, {
+            "uri": f"at://{data['repo']}/{data['collection']}/{rkey}",
+            "cid": _cid(body, codec=0x71),
+        }
+
+    def get_posts(self, match, query, headers, body):
+        uris = query.get("uris", [])
+        if len(uris) > 25:
+            return 400, {}, {"error": "InvalidRequest", "message": "uris must not have more than 25 elements"}
+        deleted = {d["rkey"] for d in self.deleted}
+        posts = []
+        with self._lock:
+            for uri in uris:
+                rkey = uri.rsplit("/", 1)[-1]
+                if rkey not in self.rkeys or rkey in deleted:
+                    continue
+                likes, reposts, replies, quotes = self.counts.get(rkey, (0, 0, 0, 0))
+                posts.append({
+                    "uri": uri,
+                    "cid": _cid(rkey.encode(), codec=0x71),
+                    "author": {"did": self.did, "handle": self.identifier},
+                    "record": self.records[self.rkeys.index(rkey)]["record"],
+                    "indexedAt": "2026-01-01T00:00:00.000Z",
+                    "likeCount": likes, "repostCount": reposts, "replyCount": replies, "quoteCount": quotes,
+                })
+        return 200, {}, {"posts": posts}
+
+    def delete_record(self, match, query, headers, body):
+        with self._lock:
+            self.deleted.append(json.loads(body))
+        return 200, {}, {}
+
+    def rate_limited(self):
+        reset = int(time.time() + self.retry_after) + 1
+        return 429, {"RateLimit-Limit": "3000", "RateLimit-Remaining": "0", "RateLimit-Reset": str(reset)}, {
+            "error": "RateLimitExceeded", "message": "Rate Limit Exceeded",
+        }
+
+
+class DiscordStandIn(StandIn):
+    """Discord webhooks, with a shared bucket of *bucket_size* posts per
+    *bucket_window* seconds reported in X-RateLimit-* headers (a post over
+    the bucket gets a 429, as on Discord)."""
+
+    routes = (
+        ("POST", r"/api/webhooks/(\d+)/([\w-]+)", "execute_webhook"),
+        ("GET", r"/api/webhooks/(\d+)/([\w-]+)/messages/(\d+)", "get_message"),
+        ("PATCH", r"/api/webhooks/(\d+)/([\w-]+)/messages/(\d+)", "edit_message"),
+        ("DELETE", r"/api/webhooks/(\d+)/([\w-]+)/messages/(\d+)", "delete_message"),
+    )
+
+    def __init__(self, bucket_size=5, bucket_window=2.0, **kwargs):
+        super().__init__(**kwargs)
+        self.bucket_size = bucket_size
+        self.bucket_window = bucket_window
+        self.messages = []
+        self.contents = {}  # message id -> current content
+        self.edits = []  # (message id, body)
+        self.deleted = []  # message ids
+        self._ids = itertools.count(1)
+        self._window_start = 0.0
+        self._used = 0
+
+    @property
+    def webhook_url(self):
+        return f"{self.url}/api/webhooks/1234/stand-in-token"
+
+    def _take(self):
+        """Spend one request from the bucket; returns (remaining, reset_after)."""
+        with self._lock:
+            now = time.monotonic()
+            if now - self._window_start >= self.bucket_window:
+                self._window_start, self._used = now, 0
+            self._used += 1
+            reset_after = self.bucket_window - (now - self._window_start)
+            return self.bucket_size - self._used, reset_after
+
+    def _bucket_headers(self, remaining, reset_after):
+        return {"X-RateLimit-Limit": str(self.bucket_size), "X-RateLimit-Remaining": str(max(remaining, 0)),
+                "X-RateLimit-Reset-After": f"{reset_after:.3f}"}
+
+    def execute_webhook(self, match, query, headers, body):
+        remaining, reset_after = self._take()
+        if remaining < 0:
+            return 429, self._bucket_headers(remaining, reset_after), {
+                "message": "You are being rate limited.", "retry_after": reset_after, "global": False,
+            }
+        with self._lock:
+            message_id = str(1_000_000 + next(self._ids))
+            self.messages.append(body)
+            self.contents[message_id] = _payload(body).get("content", "")
+        return 200, self._bucket_headers(remaining, reset_after), {
+            "id": message_id, "channel_id": "100", "webhook_id": match.group(1),
+        }
+
+    def _message_op(self, match, log, item):
+        remaining, reset_after = self._take()
+        if remaining < 0:
+            return 429, self._bucket_headers(remaining, reset_after), {
+                "message": "You are being rate limited.", "retry_after": reset_after, "global": False,
+            }
+        message_id = match.group(3)
+        with self._lock:
+            known = 1_000_000 < int(message_id) <= 1_000_000 + len(self.messages)
+            if not known or message_id in self.deleted:
+                return 404, self._bucket_headers(remaining, reset_after), {"message": "Unknown Message", "code": 10008}
+            log.append(item)
+        return 200, self._bucket_headers(remaining, reset_after), {"id": message_id, "channel_id": "100"}
+
+    def get_message(self, match, query, headers, body):
+        status, headers, payload = self._message_op(match, [], None)
+        if status == 200:
+            payload["content"] = self.contents[match.group(3)]
+        return status, headers, payload
+
+    def edit_message(self, match, query, headers, body):
+        status, headers, payload = self._message_op(match, self.edits, (match.group(3), json.loads(body)))
+        if status == 200:
+            self.contents[match.group(3)] = json.loads(body)["content"]
+        return status, headers, payload
+
+    def delete_message(self, match, query, headers, body):
+        status, headers, payload = self._message_op(match, self.deleted, match.group(3))
+        # Discord answers a deleted message with 204 No Content
+        return (204, headers, b"") if status == 200 else (status, headers, payload)
+
+    def rate_limited(self):
+        return 429, {"Retry-After": str(self.retry_after)}, {
+            "message": "You are being rate limited.", "retry_after": self.retry_after, "global": False,
+        }
+
+
+class SiteStandIn(StandIn):
+    """A web page with Open Graph tags and a 1200x630 JPEG, for link cards."""
+
+    routes = (
+        ("GET", r"/page/([\w-]+)", "page"),
+        ("GET", r"/og\.jpg", "og_image"),
+    )
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        buf = io.BytesIO()
+        Image.new("RGB", (1200, 630), (200, 60, 40)).save(buf, "JPEG", quality=85)
+        self.image = buf.getvalue()
+
+    def page_url(self, slug="post"):
+        return f"{self.url}/page/{slug}"
+
+    def page(self, match, query, headers, body):
+        html = (
+            "<html><head>"
+            f'<meta property="og:title" content="Stand-in page {match.group(1)}">'
+            '<meta property="og:description" content="A page served by the stand-in site.">'
+            f'<meta property="og:image" content="{self.url}/og.jpg">'
+            "</head><body></body></html>"
+        )
+        return 200, {"Content-Type": "text/html; charset=utf-8"}, html.encode("utf-8")
+
+    def og_image(self, match, query, headers, body):
+        return 200, {"Content-Type": "image/jpeg"}, self.image
+
+
+def stand_in_config(mastodon=None, bluesky=None, discord=None, discord_content=None):
+    """``config`` attribute values that point the platform clients at stand-ins.
+
+    Apply them (``monkeypatch.setattr(config, name, value)`` in tests) and
+    call ``platforms.reset_platforms()`` so the pooled clients are rebuilt.
+    """
+    values = {}
+    if mastodon is not None:
+        values.update(MASTODON_INSTANCE_URL=mastodon.url, MASTODON_ACCESS_TOKEN="stand-in-token")
+    if bluesky is not None:
+        values.update(BLUESKY_PDS_URL=bluesky.url, BLUESKY_IDENTIFIER=bluesky.identifier,
+                      BLUESKY_APP_PASSWORD=bluesky.password)
+    if discord is not None:
+        values.update(DISCORD_WEBHOOK_URL=discord.webhook_url, DISCORD_GUILD_ID="42")
+    if discord_content is not None:
+        values.update(DISCORD_WEBHOOK_URL_CONTENT=discord_content.webhook_url, DISCORD_GUILD_ID_CONTENT="42")
+    return values
@@ -0,0 +1,125 @@
+import json
+import threading
+import time
+
+from atproto_client.exceptions import BadRequestError, NetworkError, UnauthorizedError
+from atproto_client.models.common import XrpcError
+from atproto_client.request import Response
+
+from platforms.bluesky_handles import HandleCache
+
+
+class FakeResolved:
+    def __init__(self, did):
+        self.did = did
+
+
+def _xrpc_error(cls, status, error, message):
+    return cls(Response(success=False, status_code=status, headers={},
+                        content=XrpcError(error=error, message=message)))
+
+
+class FakeResolver:
+    """Resolves handles from a dict, counting calls and tracking concurrency."""
+
+    def __init__(self, dids, delay=0.0, fail=None):
+        self.dids = dids
+        self.delay = delay
+        self.fail = fail or {}
+        self.calls = []
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def resolve_handle(self, handle):
+        with self._lock:
+            self.calls.append(handle)
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            time.sleep(self.delay)
+            if handle in self.fail:
+                raise self.fail[handle]
+            if handle not in self.dids:
+                raise _xrpc_error(BadRequestError, 400, "InvalidRequest", "Unable to resolve handle")
+            return FakeResolved(self.dids[handle])
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+def test_hits_skip_the_network(tmp_path):
+    cache = HandleCache(str(tmp_path / "handles.json"))
+    resolver = FakeResolver({"11ty.dev": "did:plc:eleventy"})
+
+    assert cache.resolve_many(resolver, ["11ty.dev", "11ty.dev"]) == {"11ty.dev": "did:plc:eleventy"}
+    assert cache.resolve_many(resolver, ["11ty.dev"]) == {"11ty.dev": "did:plc:eleventy"}
+    assert resolver.calls == ["11ty.dev"]
+
+
+def test_unresolvable_handles_are_negative_cached(tmp_path):
+    cache = HandleCache(str(tmp_path / "handles.json"), negative_ttl=60)
+    resolver = FakeResolver({})
+
+    assert cache.resolve_many(resolver, ["nobody.example"]) == {"nobody.example": None}
+    assert cache.resolve_many(resolver, ["nobody.example"]) == {"nobody.example": None}
+    assert resolver.calls == ["nobody.example"]
+
+
+def test_network_errors_are_not_cached(tmp_path):
+    cache = HandleCache(str(tmp_path / "handles.json"))
+    resolver = FakeResolver({"11ty.dev": "did:plc:eleventy"}, fail={"11ty.dev": NetworkError()})
+
+    assert cache.resolve_many(resolver, ["11ty.dev"]) == {"11ty.dev": None}
+    resolver.fail = {}
+    assert cache.resolve_many(resolver, ["11ty.dev"]) == {"11ty.dev": "did:plc:eleventy"}
+    assert resolver.calls == ["11ty.dev", "11ty.dev"]
+
+
+def test_session_and_server_errors_are_not_cached(tmp_path):
+    cache = HandleCache(str(tmp_path / "handles.json"))
+    resolver = FakeResolver({"11ty.dev": "did:plc:eleventy"}, fail={
+        "11ty.dev": _xrpc_error(UnauthorizedError, 401, "AuthenticationRequired", "Invalid token"),
+    })
+
+    assert cache.resolve_many(resolver, ["11ty.dev"]) == {"11ty.dev": None}
+    resolver.fail = {"11ty.dev": _xrpc_error(BadRequestError, 400, "ExpiredToken", "Token has expired")}
+    assert cache.resolve_many(resolver, ["11ty.dev"]) == {"11ty.dev": None}
+    resolver.fail = {}
+    assert cache.resolve_many(resolver, ["11ty.dev"]) == {"11ty.dev": "did:plc:eleventy"}
+    assert len(resolver.calls) == 3
+
+
+def test_expired_entries_are_resolved_again(tmp_path):
+    cache = HandleCache(str(tmp_path / "handles.json"), ttl=0.05)
+    resolver = FakeResolver({"11ty.dev": "did:plc:eleventy"})
+
+    cache.resolve_many(resolver, ["11ty.dev"])
+    time.sleep(0.1)
+    cache.resolve_many(resolver, ["11ty.dev"])
+    assert len(resolver.calls) == 2
+
+
+def test_cache_survives_restart(tmp_path):
+    path = str(tmp_path / "handles.json")
+    HandleCache(path).resolve_many(FakeResolver({"zachleat.com": "did:plc:zach"}), ["zachleat.com"])
+
+    saved = json.loads((tmp_path / "handles.json").read_text())
+    assert saved["zachleat.com"]["did"] == "did:plc:zach"
+
+    resolver = FakeResolver({})
+    assert HandleCache(path).resolve_many(resolver, ["ZachLeat.com"]) == {"ZachLeat.com": "did:plc:zach"}
+    assert resolver.calls == []
+
+
+def test_misses_resolve_concurrently(tmp_path):
+    cache = HandleCache(str(tmp_path / "handles.json"))
+    handles = ["a.dev", "b.dev", "c.dev", "d.dev"]
+    resolver = FakeResolver({h: f"did:plc:{h}" for h in handles}, delay=0.2)
+
+    started = time.monotonic()
+    result = cache.resolve_many(resolver, handles)
+
+    assert time.monotonic() - started < 0.6
+    assert resolver.peak > 1
+    assert result == {h: f"did:plc:{h}" for h in handles}
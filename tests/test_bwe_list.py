@@ -1,3 +1,5 @@
+import threading
+
 import services.bwe_list as bwe_list
 
 
@@ -249,3 +251,127 @@ def test_update_bwe_after_post_three_platforms(tmp_path, monkeypatch):
     assert len(to_post) == 0
     assert len(posted) == 1
     assert posted[0]["platforms"] == ["B", "D", "M"]
+
+
+# --- Cached model and batched updates ---
+
+
+def test_load_bwe_reuses_parse_until_file_changes(bwe_file, monkeypatch):
+    monkeypatch.setattr(bwe_list, "BWE_FILE", str(bwe_file))
+    calls = []
+    real_parse = bwe_list.parse_bwe_file
+    monkeypatch.setattr(bwe_list, "parse_bwe_file", lambda: calls.append(1) or real_parse())
+
+    first = bwe_list.load_bwe()
+    assert bwe_list.load_bwe() is first
+    assert len(calls) == 1
+
+    # An external edit (different size) invalidates the cache
+    bwe_file.write_text(bwe_file.read_text() + "[Hand Edited](https://hand.dev)\n")
+    bwe_list.load_bwe()
+    assert len(calls) == 2
+
+
+def test_update_bwe_applies_several_mutations_with_one_write(bwe_file, monkeypatch):
+    monkeypatch.setattr(bwe_list, "BWE_FILE", str(bwe_file))
+    writes = []
+    real_write = bwe_list._write_bwe_file
+    monkeypatch.setattr(bwe_list, "_write_bwe_file", lambda t, p: writes.append(1) or real_write(t, p))
+
+    with bwe_list.update_bwe() as bwe:
+        bwe.add_to_post("New Site", "https://newsite.dev")
+        bwe.remove("to_post", "Another Site", "https://another.dev")
+        bwe.record_post("My Cool Site", "https://mycoolsite.dev", ["M"], "2026-03-01T00:00:00Z")
+
+    assert len(writes) == 1
+    to_post, posted = bwe_list.parse_bwe_file()
+    assert [e["name"] for e in to_post] == ["New Site"]
+    assert [e["name"] for e in posted] == ["My Cool Site", "Posted Site"]
+
+
+def test_update_bwe_without_changes_does_not_write(bwe_file, monkeypatch):
+    monkeypatch.setattr(bwe_list, "BWE_FILE", str(bwe_file))
+    before = bwe_file.stat().st_mtime_ns
+    bwe_list.delete_bwe_to_post("Nonexistent", "https://nope.dev")
+    assert bwe_file.stat().st_mtime_ns == before
+
+
+def test_find_url_checks_both_sections(bwe_file, monkeypatch):
+    monkeypatch.setattr(bwe_list, "BWE_FILE", str(bwe_file))
+    bwe = bwe_list.load_bwe()
+    section, entry = bwe.find_url("https://www.MyCoolSite.dev/")
+    assert section == "to_post"
+    assert entry["name"] == "My Cool Site"
+    section, entry = bwe.find_url("https://posted.dev")
+    assert section == "posted"
+    assert bwe.find_url("https://unknown.dev") == (None, None)
+
+
+def test_get_bwe_lists_returns_copies_and_limits_posted(bwe_file, monkeypatch):
+    monkeypatch.setattr(bwe_list, "BWE_FILE", str(bwe_file))
+    to_post, posted = bwe_list.get_bwe_lists(posted_limit=0)
+    assert posted == []
+    to_post[0]["draft_id"] = "annotated"
+    assert "draft_id" not in bwe_list.load_bwe().to_post[0]
+
+
+
+def test_get_bwe_lists_copies_under_the_lock(bwe_file, monkeypatch):
+    monkeypatch.setattr(bwe_list, "BWE_FILE", str(bwe_file))
+    model = bwe_list.load_bwe()
+    writer = threading.Thread(target=bwe_list.add_bwe_to_post, args=("Late", "https://late.dev"))
+
+    class CopiedList(list):
+        def __iter__(self):
+            # An update arriving while the lists are copied has to wait for the copy
+            if writer.ident is None:
+                writer.start()
+                writer.join(0.2)
+            return super().__iter__()
+
+    model.to_post = CopiedList(model.to_post)
+    to_post, _ = bwe_list.get_bwe_lists()
+    writer.join(5)
+
+    assert "https://late.dev" not in [e["url"] for e in to_post]
+    assert bwe_list.load_bwe().to_post[-1]["url"] == "https://late.dev"
+
+# --- Bulk operations ---
+
+
+def test_apply_bwe_operations_mixed_batch(bwe_file, monkeypatch):
+    monkeypatch.setattr(bwe_list, "BWE_FILE", str(bwe_file))
+    results = bwe_list.apply_bwe_operations([
+        {"op": "add", "name": "Fresh", "url": "https://fresh.dev", "platforms": ["M", "B"]},
+        {"op": "add", "name": "Fresh Again", "url": "https://www.fresh.dev/"},
+        {"op": "add", "name": "Old", "url": "https://posted.dev"},
+        {"op": "platforms", "name": "Another Site", "url": "https://another.dev", "platforms": ["D"]},
+        {"op": "mark_posted", "name": "My Cool Site", "url": "https://mycoolsite.dev", "platforms": ["B"]},
+        {"op": "remove", "name": "Posted Site", "url": "https://posted.dev", "section": "posted"},
+        {"op": "bogus", "name": "X", "url": "https://x.dev"},
+    ], timestamp="2026-03-02T08:00:00Z")
+
+    assert [r["ok"] for r in results] == [True, False, False, True, True, True, False]
+    assert "duplicate" in results[1]["reason"]
+    assert "posted" in results[2]["reason"]
+
+    to_post, posted = bwe_list.parse_bwe_file()
+    assert [(e["name"], e["platforms"]) for e in to_post] == [
+        ("Another Site", ["D"]),
+        ("Fresh", ["B", "M"]),
+    ]
+    assert [(e["name"], e["date"]) for e in posted] == [("My Cool Site", "2026-03-02")]
+
+
+def test_apply_bwe_operations_writes_once(bwe_file, monkeypatch):
+    monkeypatch.setattr(bwe_list, "BWE_FILE", str(bwe_file))
+    writes = []
+    real_write = bwe_list._write_bwe_file
+    monkeypatch.setattr(bwe_list, "_write_bwe_file", lambda t, p: writes.append(1) or real_write(t, p))
+
+    ops = [{"op": "add", "name": f"Site {i}", "url": f"https://site{i}.dev"} for i in range(50)]
+    results = bwe_list.apply_bwe_operations(ops)
+
+    assert all(r["ok"] for r in results)
+    assert len(writes) == 1
+    assert len(bwe_list.parse_bwe_file()[0]) == 52
@@ -0,0 +1,122 @@
+import json
+import os
+import time
+
+import pytest
+
+from services.draft_gc import collect_orphaned_draft_images, format_report
+
+
+@pytest.fixture
+def draft_setup(tmp_path):
+    """A history file referencing one draft plus a draft_images dir with an orphan."""
+    history_path = tmp_path / "history.json"
+    draft_dir = tmp_path / "draft_images"
+    draft_dir.mkdir()
+    history_path.write_text(json.dumps([{"id": "kept-1", "is_draft": True}]))
+
+    for entry_id, payload in (("kept-1", b"a" * 100), ("orphan-1", b"b" * 250)):
+        d = draft_dir / entry_id
+        d.mkdir()
+        (d / "img.png").write_bytes(payload)
+    return history_path, draft_dir
+
+
+def _age(path, seconds):
+    old = time.time() - seconds
+    os.utime(path, (old, old))
+
+
+def test_removes_unreferenced_dirs_and_reports_bytes(draft_setup):
+    history_path, draft_dir = draft_setup
+    _age(draft_dir / "orphan-1", 7200)
+
+    report = collect_orphaned_draft_images(str(history_path), str(draft_dir))
+
+    assert report["removed"] == ["orphan-1"]
+    assert report["reclaimed_bytes"] == 250
+    assert report["kept"] == 1
+    assert not (draft_dir / "orphan-1").exists()
+    assert (draft_dir / "kept-1").exists()
+
+
+def test_also_keep_protects_queued_posts(draft_setup):
+    history_path, draft_dir = draft_setup
+    _age(draft_dir / "orphan-1", 7200)
+
+    report = collect_orphaned_draft_images(str(history_path), str(draft_dir), also_keep={"orphan-1"})
+
+    assert report["removed"] == []
+    assert (draft_dir / "orphan-1").exists()
+
+
+@pytest.mark.parametrize("filename", ["post-queue.json", "post-schedule.json"])
+def test_queued_and_scheduled_posts_keep_their_draft_images(draft_setup, filename):
+    history_path, draft_dir = draft_setup
+    _age(draft_dir / "orphan-1", 7200)
+    (history_path.parent / filename).write_text(json.dumps([
+        {"id": "job-1", "status": "queued", "payload": {"draft_id_to_clean": "orphan-1"}},
+    ]))
+
+    report = collect_orphaned_draft_images(str(history_path), str(draft_dir))
+
+    assert report["removed"] == []
+    assert (draft_dir / "orphan-1").exists()
+
+
+def test_unreadable_queue_removes_nothing(draft_setup):
+    history_path, draft_dir = draft_setup
+    _age(draft_dir / "orphan-1", 7200)
+    (history_path.parent / "post-queue.json").write_text("{not json")
+
+    report = collect_orphaned_draft_images(str(history_path), str(draft_dir))
+
+    assert report["error"]
+    assert (draft_dir / "orphan-1").exists()
+
+
+def test_recent_orphans_are_left_alone(draft_setup):
+    history_path, draft_dir = draft_setup
+
+    report = collect_orphaned_draft_images(str(history_path), str(draft_dir))
+
+    assert report["removed"] == []
+    assert report["skipped_recent"] == 1
+    assert (draft_dir / "orphan-1").exists()
+
+
+def test_dry_run_reports_without_deleting(draft_setup):
+    history_path, draft_dir = draft_setup
+    _age(draft_dir / "orphan-1", 7200)
+
+    report = collect_orphaned_draft_images(str(history_path), str(draft_dir), dry_run=True)
+
+    assert report["removed"] == ["orphan-1"]
+    assert (draft_dir / "orphan-1").exists()
+    assert format_report(report, dry_run=True).startswith("Would reclaim 250 bytes")
+
+
+def test_unreadable_history_removes_nothing(draft_setup):
+    history_path, draft_dir = draft_setup
+    history_path.write_text("{not json")
+
+    report = collect_orphaned_draft_images(str(history_path), str(draft_dir), min_age=0)
+
+    assert report["error"]
+    assert report["removed"] == []
+    assert (draft_dir / "orphan-1").exists()
+
+
+def test_zero_time_budget_stops_immediately(draft_setup):
+    history_path, draft_dir = draft_setup
+
+    report = collect_orphaned_draft_images(str(history_path), str(draft_dir), time_budget=0, min_age=0)
+
+    assert report["timed_out"] is True
+    assert report["scanned"] == 0
+
+
+def test_missing_draft_dir(tmp_path):
+    report = collect_orphaned_draft_images(str(tmp_path / "history.json"), str(tmp_path / "nope"))
+    assert report["scanned"] == 0
+    assert report["removed"] == []
@@ -0,0 +1,102 @@
+import json
+from datetime import datetime, timezone
+
+import pytest
+
+import services.engagement as engagement
+from services.engagement import EngagementCollector, recent_posts, ttl_for
+
+NOW = datetime(2026, 3, 1, 12, 0, tzinfo=timezone.utc).timestamp()
+
+
+def _entry(i, age, platforms=("mastodon", "bluesky"), **extra):
+    return {
+        "id": f"post-{i}",
+        "timestamp": datetime.fromtimestamp(NOW - age, timezone.utc).isoformat(),
+        "platforms": [{"name": name, "post_url": f"https://{name}.example/{i}"} for name in platforms],
+        **extra,
+    }
+
+
+class FakeStats:
+    def __init__(self, name, fail=None):
+        self.name = name
+        self.fail = fail
+        self.calls = []
+
+    def validate_credentials(self):
+        return True
+
+    def engagement(self, post_urls):
+        self.calls.append(list(post_urls))
+        if self.fail:
+            raise RuntimeError(self.fail)
+        return {url: {"likes": len(url)} for url in post_urls}
+
+
+@pytest.fixture
+def clients(monkeypatch):
+    clients = {"mastodon": FakeStats("mastodon"), "bluesky": FakeStats("bluesky")}
+    monkeypatch.setattr(engagement, "get_platform", lambda name: clients[name])
+    return clients
+
+
+def test_ttl_grows_with_post_age():
+    assert ttl_for(60) == 300
+    assert ttl_for(6 * 3600) == 1800
+    assert ttl_for(3 * 86400) == 6 * 3600
+    assert ttl_for(30 * 86400) == engagement.MAX_TTL
+
+
+def test_recent_posts_skips_drafts_failures_and_discord():
+    history = [
+        _entry(1, 60, platforms=("mastodon", "discord")),
+        _entry(2, 60, is_draft=True),
+        _entry(3, 60, is_failed=True),
+        _entry(4, 120, platforms=("bluesky",)),
+        _entry(5, 180),
+    ]
+    assert [url for _, url, _ in recent_posts(history, window=2)] == [
+        "https://mastodon.example/1", "https://bluesky.example/4",
+    ]
+
+
+def test_refresh_fetches_only_what_has_expired(tmp_path, clients):
+    history = [_entry(1, 60), _entry(2, 30 * 86400)]
+    collector = EngagementCollector(str(tmp_path / "engagement.json"), lambda: history, threaded=False)
+
+    assert collector.refresh(now=NOW) == {"fetched": 4, "errors": {}}
+    assert clients["mastodon"].calls == [["https://mastodon.example/1", "https://mastodon.example/2"]]
+    assert collector.counts(history)["https://bluesky.example/2"] == {"likes": len("https://bluesky.example/2")}
+
+    # Ten minutes on, only the young post's 5-minute TTL has run out
+    assert collector.refresh(now=NOW + 600)["fetched"] == 2
+    assert clients["mastodon"].calls[-1] == ["https://mastodon.example/1"]
+    assert collector.refresh(now=NOW + 601)["fetched"] == 0
+
+    with open(tmp_path / "engagement.json") as f:
+        assert set(json.load(f)) == {f"https://{n}.example/{i}" for n in ("mastodon", "bluesky") for i in (1, 2)}
+
+
+def test_refresh_cost_is_bounded_and_failures_back_off(tmp_path, clients):
+    history = [_entry(i, 60 * i) for i in range(200)]
+    clients["bluesky"].fail = "getPosts: 502"
+    collector = EngagementCollector(str(tmp_path / "engagement.json"), lambda: history,
+                                    threaded=False, max_posts=30)
+
+    report = collector.refresh(now=NOW)
+
+    # Only the newest WINDOW entries are considered, and at most max_posts are fetched
+    assert sum(len(c) for c in clients["mastodon"].calls + clients["bluesky"].calls) == 30
+    assert report["errors"] == {"bluesky": "getPosts: 502"}
+    failed = set(clients["bluesky"].calls[0])
+    assert len(recent_posts(history)) == 2 * engagement.WINDOW
+
+    def due(now):
+        return {url for _, url, _ in collector.due(recent_posts(history), now=now)}
+
+    # The failed batch keeps no counts and is retried after ERROR_TTL, not on every refresh
+    collector.max_posts = len(recent_posts(history))
+    assert not failed & due(NOW + engagement.ERROR_TTL - 1)
+    assert failed <= due(NOW + engagement.ERROR_TTL)
+    assert all(collector.counts(history).get(url) is None for url in failed)
@@ -1,5 +1,7 @@
 import json
+import time
 
+import pytest
 import responses
 
 
@@ -100,6 +102,35 @@ def test_post_delete(client, app):
     assert len(history) == 0
 
 
+def test_remote_delete_requires_a_list_of_platforms(client, app):
+    post = {
+        "id": "remote-1",
+        "timestamp": "2026-01-01T00:00:00+00:00",
+        "text": "Posted text",
+        "platforms": [{"name": "discord", "post_url": "https://discord.com/channels/1/2/3"}],
+        "is_draft": False,
+        "images": [],
+    }
+    _write_json(app.config["HISTORY_FILE"], [post])
+    # A string would select "discord" by substring of "discord_content"
+    resp = client.post("/post/remote-1/remote-delete", json={"platforms": "discord_content"})
+    assert resp.status_code == 400
+    assert _read_json(app.config["HISTORY_FILE"]) == [post]
+
+
+def test_concurrent_history_writes_keep_every_entry(client, app):
+    import app as app_module
+    from concurrent.futures import ThreadPoolExecutor
+
+    def save(i):
+        app_module.save_post(text=f"Post {i}", platforms=[])
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(save, range(40)))
+    history = _read_json(app.config["HISTORY_FILE"])
+    assert sorted(e["text"] for e in history) == sorted(f"Post {i}" for i in range(40))
+
+
 # --- Failed post retry ---
 
 def test_retry_post(client, app):
@@ -237,3 +268,322 @@ def test_social_links_bundledb_no_match_falls_back(client, app):
     resp = client.post("/social-links", json={"url": "https://example.com/page"})
     data = resp.get_json()
     assert data["mastodon"] == "@scraped@mastodon.social"
+
+
+# --- BWE bulk queue operations ---
+
+def test_bwe_bulk_route(client, bwe_file, monkeypatch):
+    import services.bwe_list as bwe_list
+    monkeypatch.setattr(bwe_list, "BWE_FILE", str(bwe_file))
+
+    resp = client.post("/bwe/bulk", json={"operations": [
+        {"op": "add", "name": "Queued", "url": "https://queued.dev"},
+        {"op": "add", "name": "Dupe", "url": "https://mycoolsite.dev/"},
+        {"op": "remove", "name": "Another Site", "url": "https://another.dev"},
+    ]})
+    data = resp.get_json()
+    assert data["success"] is True
+    assert data["applied"] == 2
+    assert data["to_post_count"] == 2
+    assert data["results"][1]["ok"] is False
+
+
+def test_bwe_bulk_route_requires_operations(client):
+    resp = client.post("/bwe/bulk", json={})
+    assert resp.status_code == 400
+
+
+@pytest.mark.parametrize("body, error", [
+    (["not", "an", "object"], "Request body must be a JSON object"),
+    ({"operations": ["add"]}, "Operation 0: operation must be an object"),
+    ({"operations": [{"op": "add", "name": "A", "url": "https://a.dev", "platforms": "MB"}]},
+     "Operation 0: platforms must be a list of strings"),
+    ({"operations": [{"op": "add", "name": ["A"], "url": "https://a.dev"}]}, "Operation 0: name must be a string"),
+])
+def test_bwe_bulk_route_rejects_malformed_operations(client, bwe_file, monkeypatch, body, error):
+    import services.bwe_list as bwe_list
+    monkeypatch.setattr(bwe_list, "BWE_FILE", str(bwe_file))
+    before = bwe_file.read_text()
+
+    resp = client.post("/bwe/bulk", json=body)
+
+    assert resp.status_code == 400
+    assert resp.get_json()["error"] == error
+    assert bwe_file.read_text() == before
+
+
+# --- Normal post path ---
+
+def test_post_fans_out_and_records_successes(client, app, monkeypatch):
+    import services.posting as posting
+    from platforms.base import PostResult
+
+    class Ok:
+        def __init__(self, name):
+            self.name = name
+
+        def validate_credentials(self):
+            return True
+
+        def post(self, text, media=None, content_warning=None, link_card=None):
+            return PostResult(platform=self.name, success=True, post_url=f"https://{self.name}.example/1")
+
+    monkeypatch.setattr(posting, "get_platform", lambda name: Ok(name))
+    resp = client.post("/post", data={"text": "Hello", "platforms": ["mastodon", "discord"]})
+    assert resp.status_code == 200
+
+    history = _read_json(app.config["HISTORY_FILE"])
+    assert [p["name"] for p in history[0]["platforms"]] == ["mastodon", "discord"]
+    assert history[0].get("is_failed") is None
+    assert set(history[0]["telemetry"]) == {"mastodon", "discord"}
+    assert b"Posting Performance" in client.get("/db-mgmt").data
+
+
+def test_post_preflight_rejects_doomed_platforms_before_posting(client, app, monkeypatch):
+    import services.posting as posting
+    from platforms.base import PostResult
+
+    posted = []
+
+    class Ok:
+        def __init__(self, name):
+            self.name = name
+
+        def validate_credentials(self):
+            return True
+
+        def post(self, text, media=None, content_warning=None, link_card=None):
+            posted.append(self.name)
+            return PostResult(platform=self.name, success=True, post_url=f"https://{self.name}.example/1")
+
+    monkeypatch.setattr(posting, "get_platform", lambda name: Ok(name))
+    resp = client.post("/post", data={"text": "x" * 400, "platforms": ["bluesky", "mastodon"]})
+
+    assert posted == ["mastodon"]
+    assert b"400 characters; bluesky allows 300" in resp.data
+    history = _read_json(app.config["HISTORY_FILE"])
+    assert [p["name"] for p in history[0]["platforms"]] == ["mastodon"]
+    assert set(history[0]["telemetry"]) == {"mastodon"}
+
+    # Nothing left to post: no fan-out at all
+    posted.clear()
+    resp = client.post("/post", data={"text": "x" * 400, "platforms": ["bluesky"], "background": "on"})
+    assert posted == [] and b"Not posted" in resp.data
+
+
+def test_background_post_returns_immediately_and_completes_via_queue(client, app, monkeypatch):
+    import app as app_module
+    import services.posting as posting
+    from platforms.base import PostResult
+
+    attempts = {"bluesky": 0}
+
+    class Flaky:
+        def __init__(self, name):
+            self.name = name
+
+        def validate_credentials(self):
+            return True
+
+        def post(self, text, media=None, content_warning=None, link_card=None):
+            if self.name == "bluesky":
+                attempts["bluesky"] += 1
+                if attempts["bluesky"] == 1:
+                    return PostResult(platform=self.name, success=False, error="502 Bad Gateway")
+            return PostResult(platform=self.name, success=True, post_url=f"https://{self.name}.example/1")
+
+    monkeypatch.setattr(posting, "get_platform", lambda name: Flaky(name))
+    resp = client.post("/post", data={"text": "Hello", "platforms": ["mastodon", "bluesky"], "background": "on"})
+    assert resp.status_code == 200
+    assert b"data-job-id" in resp.data
+    assert _read_json(app.config["HISTORY_FILE"]) == []
+
+    queue = app_module._get_post_queue()
+    job_id = queue.jobs()[0]["id"]
+    queue.run_pending()
+    status = client.get(f"/post/jobs/{job_id}").get_json()
+    assert status["status"] == "waiting"
+    assert [p["status"] for p in status["platforms"]] == ["success", "pending"]
+
+    queue.run_pending(now=time.time() + 3600)
+    status = client.get(f"/post/jobs/{job_id}").get_json()
+    assert status["status"] == "done"
+    history = _read_json(app.config["HISTORY_FILE"])
+    assert [p["name"] for p in history[0]["platforms"]] == ["mastodon", "bluesky"]
+    assert history[0]["telemetry"]["bluesky"]["attempts"] == 2
+
+
+def test_post_job_status_unknown(client):
+    assert client.get("/post/jobs/nope").status_code == 404
+
+
+def test_post_at_schedules_then_queues(client, app, monkeypatch):
+    import app as app_module
+    import services.posting as posting
+    from platforms.base import PostResult
+
+    class Ok:
+        def __init__(self, name):
+            self.name = name
+
+        def validate_credentials(self):
+            return True
+
+        def post(self, text, media=None, content_warning=None, link_card=None):
+            return PostResult(platform=self.name, success=True, post_url=f"https://{self.name}.example/1")
+
+    monkeypatch.setattr(posting, "get_platform", lambda name: Ok(name))
+    resp = client.post("/post", data={
+        "text": "Later", "platforms": ["mastodon"], "background": "on", "post_at": "2099-01-01T09:30",
+    })
+    assert resp.status_code == 200
+    assert b"Scheduled" in resp.data
+
+    scheduled = client.get("/post/scheduled").get_json()
+    assert [s["text"] for s in scheduled] == ["Later"]
+    assert b"Scheduled" in client.get("/social").data
+
+    app_module._get_post_scheduler().run_due(now=4102444800 + 86400)
+    app_module._get_post_queue().run_pending()
+    history = _read_json(app.config["HISTORY_FILE"])
+    assert history[0]["text"] == "Later"
+    assert client.get("/post/scheduled").get_json() == []
+
+
+def test_cancel_scheduled_post(client, app):
+    import app as app_module
+
+    entry = app_module._get_post_scheduler().schedule(
+        {"text": "x", "images": [], "draft_id_to_clean": None}, ["mastodon"], time.time() + 3600,
+    )
+    resp = client.post(f"/post/scheduled/{entry['id']}/cancel")
+    assert resp.status_code == 302
+    assert client.get("/post/scheduled").get_json() == []
+
+
+def test_invalid_post_at(client):
+    resp = client.post("/post", data={"text": "x", "platforms": ["mastodon"], "post_at": "tomorrow-ish"})
+    assert b"Invalid post time" in resp.data
+
+
+@responses.activate
+def test_post_reuses_link_preview_card(client, app, monkeypatch):
+    import services.posting as posting
+    from platforms.base import PostResult
+
+    seen = []
+
+    class Ok:
+        def __init__(self, name):
+            self.name = name
+
+        def validate_credentials(self):
+            return True
+
+        def post(self, text, media=None, content_warning=None, link_card=None):
+            seen.append(link_card)
+            return PostResult(platform=self.name, success=True, post_url="https://bsky.example/1")
+
+    responses.add(responses.GET, "https://site.example/",
+                  body='<meta property="og:title" content="Site"><meta property="og:image" content="/og.jpg">')
+    responses.add(responses.GET, "https://site.example/og.jpg", body=b"JPEG", content_type="image/jpeg")
+    monkeypatch.setattr(posting, "get_platform", lambda name: Ok(name))
+
+    assert client.post("/link-preview", json={"url": "https://site.example/"}).get_json()["title"] == "Site"
+    client.post("/post", data={"text": "Hi", "platforms": ["bluesky"], "link_url": "https://site.example/"})
+
+    assert len(responses.calls) == 2
+    assert seen[0].title == "Site" and seen[0].image_data == b"JPEG"
+
+
+@responses.activate
+def test_link_preview_warns_on_wrong_og_size_for_bobmonsour(client):
+    from io import BytesIO
+    from PIL import Image
+
+    buf = BytesIO()
+    Image.new("RGB", (1600, 900), "white").save(buf, "PNG")
+    responses.add(responses.GET, "https://bobmonsour.com/posts/x/",
+                  body='<meta property="og:image" content="/og.png">')
+    responses.add(responses.GET, "https://bobmonsour.com/og.png", body=buf.getvalue(), content_type="image/png")
+
+    result = client.post("/link-preview", json={"url": "https://bobmonsour.com/posts/x/"}).get_json()
+
+    assert result["og_warning"] == "OG image is 1600x900px (expected ~1200x630)"
+
+
+# --- BWE batch posting ---
+
+def test_bwe_batch_post_schedules_spaced_posts_and_records_them(client, app, tmp_path, monkeypatch):
+    import app as app_module
+    import services.bwe_list as bwe_list
+    import services.posting as posting
+    from platforms.base import PostResult
+
+    bwe = tmp_path / "bwe.md"
+    bwe.write_text(
+        "- TO BE POSTED -\n"
+        "[First](https://first.dev) {B,M}\n"
+        "[Unselected](https://unselected.dev)\n"
+        "[Second](https://second.dev) {B}\n"
+        "[Third](https://third.dev) {M}\n"
+        "\n- ALREADY POSTED -\n"
+    )
+    monkeypatch.setattr(bwe_list, "BWE_FILE", str(bwe))
+    mentions = {"https://first.dev": {"mastodon": "@first@example.social", "bluesky": ""}}
+    monkeypatch.setattr(app_module, "_site_mentions", lambda url: mentions.get(url))
+
+    posted = []
+
+    class Ok:
+        def __init__(self, name):
+            self.name = name
+
+        def validate_credentials(self):
+            return True
+
+        def post(self, text, media=None, content_warning=None, link_card=None):
+            posted.append((self.name, text))
+            return PostResult(platform=self.name, success=True, post_url=f"https://{self.name}.example/1")
+
+    monkeypatch.setattr(posting, "get_platform", lambda name: Ok(name))
+    monkeypatch.setattr(app_module, "get_link_card", lambda url: None)
+
+    preview = client.post("/bwe/batch-post", json={"count": 2, "dry_run": True}).get_json()
+    assert [p["name"] for p in preview["posts"]] == ["First", "Second"]
+    assert preview["skipped"] == [
+        {"name": "Unselected", "url": "https://unselected.dev", "reason": "no platforms selected"},
+    ]
+    assert preview["posts"][0]["platform_texts"]["mastodon"] == (
+        "From the 11ty Bundle Showcase\n\nBuilt with Eleventy: First"
+        "\n\n#11ty @11ty@neighborhood.11ty.dev @first@example.social"
+    )
+    assert app_module._get_post_scheduler().entries() == []
+
+    data = client.post("/bwe/batch-post", json={"count": 2}).get_json()
+    assert [p["platforms"] for p in data["posts"]] == [["mastodon", "bluesky"], ["bluesky"]]
+
+    # A second batch skips the sites that are already scheduled
+    again = client.post("/bwe/batch-post", json={"count": 1}).get_json()
+    assert [p["name"] for p in again["posts"]] == ["Third"]
+    assert [s["reason"] for s in again["skipped"]] == ["already queued", "no platforms selected", "already queued"]
+
+    scheduler = app_module._get_post_scheduler()
+    queue = app_module._get_post_queue()
+    now = time.time()
+    # First holds both platforms, so Second and Third wait out the spacing
+    assert scheduler.run_due(now=now) == 1
+    queue.run_pending()
+    assert scheduler.run_due(now=now + 60) == 2
+    queue.run_pending()
+    assert sorted(name for name, _ in posted) == ["bluesky", "bluesky", "mastodon", "mastodon"]
+
+    to_post, posted_sites = bwe_list.get_bwe_lists()
+    assert [s["name"] for s in to_post] == ["Unselected"]
+    assert {s["name"]: s["platforms"] for s in posted_sites} == {
+        "First": ["B", "M"], "Second": ["B"], "Third": ["M"],
+    }
+
+
+def test_bwe_batch_post_rejects_bad_count(client):
+    assert client.post("/bwe/batch-post", json={"count": 0}).status_code == 400
@@ -1,6 +1,8 @@
 import responses
 
-from services.link_card import fetch_og_metadata
+import services.link_card as link_card
+from platforms.base import LinkCard
+from services.link_card import LinkCardCache, cache_key, fetch_og_metadata, get_link_card
 
 
 @responses.activate
@@ -75,3 +77,74 @@ def test_no_og_returns_empty_fields():
     assert card.title == ""
     assert card.description == ""
     assert card.image_url == ""
+
+
+# --- Link card cache ---
+
+OG_HTML = '''
+<html><head>
+<meta property="og:title" content="Cached Title">
+<meta property="og:image" content="/og.png">
+</head></html>
+'''
+
+
+def test_cache_key_normalization():
+    assert cache_key("HTTPS://Example.COM/Path/#frag") == "https://example.com/Path"
+    assert cache_key("https://example.com/") == cache_key("https://example.com")
+
+
+@responses.activate
+def test_link_card_cache_spills_image_and_reuses_it(tmp_path, monkeypatch):
+    cache = LinkCardCache(cache_dir=str(tmp_path), ttl=60)
+    monkeypatch.setattr(link_card, "card_cache", cache)
+    responses.add(responses.GET, "https://example.com/post/", body=OG_HTML)
+    responses.add(responses.GET, "https://example.com/og.png", body=b"PNGDATA", content_type="image/png")
+
+    first = get_link_card("https://example.com/post/")
+    second = get_link_card("https://EXAMPLE.com/post")
+
+    assert len(responses.calls) == 2  # page + image, once
+    assert second.title == "Cached Title"
+    assert second.image_data == b"PNGDATA"
+    assert second.url == "https://EXAMPLE.com/post"
+    assert first.image_data == b"PNGDATA"
+    assert [p.read_bytes() for p in tmp_path.iterdir()] == [b"PNGDATA"]
+
+
+@responses.activate
+def test_failed_fetches_are_not_cached(tmp_path, monkeypatch):
+    monkeypatch.setattr(link_card, "card_cache", LinkCardCache(cache_dir=str(tmp_path)))
+    responses.add(responses.GET, "https://down.example", status=503)
+    responses.add(responses.GET, "https://down.example", body=OG_HTML.replace("/og.png", ""))
+
+    assert get_link_card("https://down.example").title == ""
+    assert get_link_card("https://down.example").title == "Cached Title"
+
+
+def test_expired_and_evicted_entries_delete_their_images(tmp_path):
+    cache = LinkCardCache(cache_dir=str(tmp_path), ttl=60, max_entries=1)
+    cache.put("https://a.example", LinkCard(url="https://a.example", image_data=b"a"))
+    cache.put("https://b.example", LinkCard(url="https://b.example", image_data=b"b"))
+
+    assert cache.get("https://a.example") is None
+    assert cache.get("https://b.example").image_data == b"b"
+    assert [p.read_bytes() for p in tmp_path.iterdir()] == [b"b"]
+
+
+def test_expired_entries_are_dropped_on_put_and_prune_sweeps_strays(tmp_path):
+    import os
+    cache = LinkCardCache(cache_dir=str(tmp_path), ttl=-1)
+    cache.put("https://a.example", LinkCard(url="https://a.example", image_data=b"a"))
+    cache.put("https://b.example", LinkCard(url="https://b.example", image_data=b"b"))
+    assert [p.read_bytes() for p in tmp_path.iterdir()] == [b"b"]  # a expired, never read again
+
+    # Files an earlier run left behind are not in the index
+    stray = tmp_path / "left-by-last-run"
+    stray.write_bytes(b"old")
+    os.utime(stray, (1, 1))
+    cache.ttl = 60
+    cache.put("https://c.example", LinkCard(url="https://c.example", image_data=b"c"))
+
+    assert cache.prune() == 1
+    assert sorted(p.read_bytes() for p in tmp_path.iterdir()) == [b"c"]
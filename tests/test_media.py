@@ -0,0 +1,204 @@
+import io
+import os
+
+import pytest
+from PIL import Image
+
+import config
+import services.media as media
+from platforms.base import MediaAttachment
+
+
+@pytest.fixture
+def small_limit(monkeypatch):
+    # Keep test images tiny: anything over 2 KB "needs" compressing
+    monkeypatch.setattr(config, "BLUESKY_MAX_IMAGE_SIZE", 2_000)
+
+
+def _png(path, size=(64, 64)):
+    Image.effect_noise(size, 100).convert("RGB").save(path, "PNG")
+    return MediaAttachment(file_path=str(path), mime_type="image/png", alt_text="noise")
+
+
+def test_prepare_gives_each_platform_its_own_variants(tmp_path, small_limit):
+    att = _png(tmp_path / "big.png")
+
+    prepared = media.prepare_platform_media(["mastodon", "bluesky"], [att], cache_dir=str(tmp_path / "cache"))
+
+    assert isinstance(prepared["bluesky"], tuple)
+    assert prepared["mastodon"][0].file_path == att.file_path
+    assert prepared["mastodon"][0] is not att
+    bluesky = prepared["bluesky"][0]
+    assert bluesky.file_path.startswith(str(tmp_path / "cache"))
+    assert bluesky.mime_type == "image/jpeg"
+    assert bluesky.alt_text == "noise"
+    assert os.path.getsize(bluesky.file_path) <= 2_000
+    assert att.file_path == str(tmp_path / "big.png")
+
+
+def test_variants_are_cached_by_content_hash(tmp_path, small_limit, monkeypatch):
+    att = _png(tmp_path / "big.png")
+    copy = tmp_path / "retry.png"
+    copy.write_bytes((tmp_path / "big.png").read_bytes())
+    cache_dir = str(tmp_path / "cache")
+
+    first = media.derive(att, "bluesky-1mb", cache_dir)
+    calls = []
+    monkeypatch.setattr(media, "compress_for_bluesky", lambda *a, **kw: calls.append(a))
+    second = media.derive(MediaAttachment(file_path=str(copy), mime_type="image/png"), "bluesky-1mb", cache_dir)
+
+    assert second.file_path == first.file_path
+    assert calls == []
+
+
+def test_file_digest_memo_is_bounded(tmp_path, monkeypatch):
+    monkeypatch.setattr(media, "MAX_DIGESTS", 2)
+    monkeypatch.setattr(media, "_digests", type(media._digests)())
+    paths = []
+    for name in ("a", "b", "c"):
+        path = tmp_path / name
+        path.write_bytes(name.encode())
+        paths.append(str(path))
+        media.file_digest(str(path))
+
+    assert [key[0] for key in media._digests] == paths[1:]
+
+
+def test_small_images_pass_through(tmp_path):
+    att = _png(tmp_path / "small.png", size=(8, 8))
+    assert media.derive(att, "bluesky-1mb", str(tmp_path / "cache")) is att
+    assert not (tmp_path / "cache").exists()
+
+
+def test_prune_derivatives(tmp_path):
+    cache_dir = tmp_path / "cache"
+    cache_dir.mkdir()
+    old = cache_dir / "old-bluesky-1mb.jpg"
+    fresh = cache_dir / "fresh-bluesky-1mb.jpg"
+    old.write_bytes(b"x")
+    fresh.write_bytes(b"x")
+    os.utime(old, (0, 0))
+
+    assert media.prune_derivatives(str(cache_dir), max_age=3600) == 1
+    assert not old.exists() and fresh.exists()
+
+
+def _photo(path, size=(1600, 1200), grain=1):
+    base = Image.radial_gradient("L").resize(size).convert("RGB")
+    noise = Image.effect_noise((size[0] // grain, size[1] // grain), 40).resize(size).convert("RGB")
+    Image.blend(base, noise, 0.35).save(path, "JPEG", quality=95)
+    return str(path)
+
+
+def test_compress_large_photo_in_few_encodes(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "BLUESKY_MAX_IMAGE_SIZE", 100_000)
+    src = _photo(tmp_path / "photo.jpg")
+    encodes = []
+    real_encode = media._encode_jpeg
+    monkeypatch.setattr(media, "_encode_jpeg", lambda img, q: encodes.append(q) or real_encode(img, q))
+
+    out = media.compress_for_bluesky(src, "image/jpeg", output_path=str(tmp_path / "out.jpg"))
+
+    assert out == str(tmp_path / "out.jpg")
+    assert os.path.getsize(out) <= 100_000
+    assert len(encodes) <= 3
+    assert sorted(os.listdir(tmp_path)) == ["out.jpg", "photo.jpg"]
+
+
+@pytest.mark.parametrize("grain", [1, 4])
+def test_compress_12mp_photo_fills_the_limit_in_few_encodes(tmp_path, monkeypatch, grain):
+    # Fine grain shrinks faster than the pixel count when resized, coarse grain slower
+    src = _photo(tmp_path / "photo.jpg", size=(4032, 3024), grain=grain)
+    encodes = []
+    real_encode = media._encode_jpeg
+    monkeypatch.setattr(media, "_encode_jpeg", lambda img, q: encodes.append(q) or real_encode(img, q))
+
+    out = media.compress_for_bluesky(src, "image/jpeg", output_path=str(tmp_path / "out.jpg"))
+
+    limit = config.BLUESKY_MAX_IMAGE_SIZE
+    assert limit * 0.8 <= os.path.getsize(out) <= limit
+    assert len(encodes) <= 4
+    assert min(encodes) >= 75
+
+
+def test_compress_returns_original_when_under_limit(tmp_path):
+    src = _photo(tmp_path / "photo.jpg", size=(64, 48))
+    assert media.compress_for_bluesky(src, "image/jpeg") == src
+
+
+def _image_bytes(size, fmt="PNG", mode="RGB"):
+    buf = io.BytesIO()
+    img = Image.effect_noise(size, 60).convert(mode)
+    img.save(buf, fmt)
+    return buf.getvalue()
+
+
+def test_normalize_thumbnail_bounds_large_images():
+    original = _image_bytes((2400, 1260))
+    assert len(original) > media.THUMB_MAX_BYTES
+
+    data, mime, size = media.normalize_thumbnail(original, "image/png")
+
+    assert size == (2400, 1260)
+    assert mime == "image/jpeg"
+    assert len(data) <= media.THUMB_MAX_BYTES
+    assert Image.open(io.BytesIO(data)).size == (1200, 630)
+
+
+def test_normalize_thumbnail_keeps_small_images():
+    original = _image_bytes((120, 63), fmt="JPEG")
+    assert media.normalize_thumbnail(original, "image/jpeg") == (original, "image/jpeg", (120, 63))
+
+
+def test_normalize_thumbnail_flattens_transparency():
+    data, mime, _ = media.normalize_thumbnail(_image_bytes((40, 40), fmt="GIF", mode="P"), "image/gif")
+    assert mime == "image/jpeg"
+    assert Image.open(io.BytesIO(data)).mode == "RGB"
+
+
+def test_normalize_thumbnail_passes_unreadable_bytes_through():
+    assert media.normalize_thumbnail(b"<svg/>", "image/svg+xml") == (b"<svg/>", "image/svg+xml", (0, 0))
+
+
+@pytest.mark.parametrize("fmt, mode, mime", [
+    ("PNG", "RGBA", "image/png"),
+    ("GIF", "P", "image/gif"),
+    ("JPEG", "RGB", "image/jpeg"),
+    ("WEBP", "RGB", "image/webp"),
+])
+def test_sniff_image_reads_format_and_size_from_header(fmt, mode, mime):
+    buf = io.BytesIO()
+    Image.new(mode, (321, 123)).save(buf, fmt)
+    assert media.sniff_image(buf.getvalue()[:64 * 1024]) == (mime, 321, 123)
+
+
+def test_sniff_image_finds_jpeg_frame_after_exif_and_lossless_webp():
+    exif = Image.Exif()
+    exif[0x010E] = "x" * 20_000  # ImageDescription: a large APP1 segment before the frame header
+    buf = io.BytesIO()
+    Image.new("RGB", (40, 30)).save(buf, "JPEG", exif=exif)
+    assert media.sniff_image(buf.getvalue()) == ("image/jpeg", 40, 30)
+    assert media.sniff_image(buf.getvalue()[:10_000]) is None
+
+    buf = io.BytesIO()
+    Image.new("RGBA", (17, 9)).save(buf, "WEBP", lossless=True)
+    assert media.sniff_image(buf.getvalue()) == ("image/webp", 17, 9)
+    assert media.sniff_image(b"<html>") is None
+
+
+def test_process_uploads_streams_and_sniffs_without_pil(tmp_path, monkeypatch):
+    from werkzeug.datastructures import FileStorage
+
+    buf = io.BytesIO()
+    Image.effect_noise((300, 200), 50).convert("RGB").save(buf, "JPEG")
+    data = buf.getvalue()
+    monkeypatch.setattr(config, "UPLOAD_FOLDER", str(tmp_path))
+    monkeypatch.setattr(media.Image, "open", lambda *a, **kw: pytest.fail("PIL reopened the upload"))
+
+    files = [FileStorage(io.BytesIO(data), filename="photo.jpg"), FileStorage(io.BytesIO(b"x"), filename="a.txt")]
+    [att] = media.process_uploads(files, ["A photo"])
+
+    assert (att.mime_type, att.width, att.height, att.size) == ("image/jpeg", 300, 200, len(data))
+    assert att.alt_text == "A photo"
+    with open(att.file_path, "rb") as f:
+        assert f.read() == data
@@ -0,0 +1,348 @@
+import json
+import time
+
+import pytest
+import responses
+
+import platforms
+import platforms.bluesky_client as bluesky_client
+from atproto_client.client.session import SessionEvent
+from atproto_client.exceptions import UnauthorizedError
+from platforms.base import MediaAttachment, upload_concurrently
+from platforms.discord_client import DiscordClient
+
+
+@pytest.fixture(autouse=True)
+def fresh_registry():
+    platforms.reset_platforms()
+    yield
+    platforms.reset_platforms()
+
+
+# --- Client registry ---
+
+def test_get_platform_reuses_instances():
+    first = platforms.get_platform("mastodon")
+    assert platforms.get_platform("mastodon") is first
+    assert platforms.get_platform("bluesky") is not first
+
+
+def test_reset_platforms_builds_new_instances():
+    first = platforms.get_platform("discord")
+    platforms.reset_platforms()
+    assert platforms.get_platform("discord") is not first
+
+
+def test_get_platform_unknown():
+    with pytest.raises(ValueError):
+        platforms.get_platform("myspace")
+
+
+# --- Bluesky session persistence ---
+
+class FakeSession:
+    def __init__(self, value):
+        self.value = value
+
+    def encode(self):
+        return self.value
+
+
+class FakeAtprotoClient:
+    """Records how it was authenticated and fires session callbacks like atproto does."""
+
+    instances = []
+    reject_session = False
+
+    def __init__(self, base_url=None):
+        self.callbacks = []
+        self.logins = []
+        FakeAtprotoClient.instances.append(self)
+
+    def on_session_change(self, callback):
+        self.callbacks.append(callback)
+
+    def login(self, login=None, password=None, session_string=None):
+        if session_string:
+            self.logins.append(("session", session_string))
+            if FakeAtprotoClient.reject_session:
+                raise UnauthorizedError()
+            for cb in self.callbacks:
+                cb(SessionEvent.IMPORT, FakeSession(session_string))
+            # atproto refreshes a stale access token on first use
+            for cb in self.callbacks:
+                cb(SessionEvent.REFRESH, FakeSession("refreshed-session"))
+        else:
+            self.logins.append(("password", login))
+            for cb in self.callbacks:
+                cb(SessionEvent.CREATE, FakeSession("created-session"))
+
+
+@pytest.fixture
+def fake_atproto(monkeypatch):
+    FakeAtprotoClient.instances = []
+    FakeAtprotoClient.reject_session = False
+    monkeypatch.setattr(bluesky_client, "Client", FakeAtprotoClient)
+    monkeypatch.setattr(bluesky_client.config, "BLUESKY_IDENTIFIER", "bundle.bsky.social")
+    monkeypatch.setattr(bluesky_client.config, "BLUESKY_APP_PASSWORD", "app-pass")
+    return FakeAtprotoClient
+
+
+def test_first_login_persists_session(fake_atproto, tmp_path):
+    session_file = tmp_path / "bluesky-session.json"
+    client = bluesky_client.BlueskyClient(session_file=str(session_file))
+
+    client._get_client()
+    client._get_client()
+
+    assert len(fake_atproto.instances) == 1
+    assert fake_atproto.instances[0].logins == [("password", "bundle.bsky.social")]
+    saved = json.loads(session_file.read_text())
+    assert saved == {"identifier": "bundle.bsky.social", "session": "created-session"}
+    assert (session_file.stat().st_mode & 0o777) == 0o600
+
+
+def test_restart_resumes_saved_session(fake_atproto, tmp_path):
+    session_file = tmp_path / "bluesky-session.json"
+    session_file.write_text(json.dumps({"identifier": "bundle.bsky.social", "session": "saved-session"}))
+
+    bluesky_client.BlueskyClient(session_file=str(session_file))._get_client()
+
+    assert fake_atproto.instances[0].logins == [("session", "saved-session")]
+    assert json.loads(session_file.read_text())["session"] == "refreshed-session"
+
+
+def test_saved_session_for_other_identifier_is_ignored(fake_atproto, tmp_path):
+    session_file = tmp_path / "bluesky-session.json"
+    session_file.write_text(json.dumps({"identifier": "someone.else", "session": "theirs"}))
+
+    bluesky_client.BlueskyClient(session_file=str(session_file))._get_client()
+
+    assert fake_atproto.instances[0].logins == [("password", "bundle.bsky.social")]
+
+
+def test_rejected_session_falls_back_to_password_login(fake_atproto, tmp_path):
+    session_file = tmp_path / "bluesky-session.json"
+    session_file.write_text(json.dumps({"identifier": "bundle.bsky.social", "session": "revoked"}))
+    fake_atproto.reject_session = True
+
+    bluesky_client.BlueskyClient(session_file=str(session_file))._get_client()
+
+    assert [c.logins for c in fake_atproto.instances] == [
+        [("session", "revoked")],
+        [("password", "bundle.bsky.social")],
+    ]
+    assert json.loads(session_file.read_text())["session"] == "created-session"
+
+
+# --- Bluesky facets ---
+
+def _facet_spans(text):
+    spans = []
+    for facet in bluesky_client.parse_facets(text) or []:
+        feature = facet.features[0]
+        value = getattr(feature, "uri", None) or getattr(feature, "did", None) or feature.tag
+        spans.append((facet.index.byte_start, facet.index.byte_end, value))
+    return spans
+
+
+def test_parse_facets_byte_offsets_after_emoji():
+    text = "🎉 New on the Bundle ✨ by @zachleat.com https://11ty.dev/docs/ #eleventy"
+    encoded = text.encode("utf-8")
+
+    spans = _facet_spans(text)
+
+    assert [value for _, _, value in spans] == ["zachleat.com", "https://11ty.dev/docs/", "eleventy"]
+    assert [encoded[start:end].decode("utf-8") for start, end, _ in spans] == [
+        "@zachleat.com", "https://11ty.dev/docs/", "#eleventy",
+    ]
+
+
+def test_parse_facets_does_not_overlap_links():
+    assert _facet_spans("See https://example.com/page#intro") == [
+        (4, 34, "https://example.com/page#intro"),
+    ]
+
+
+def test_parse_facets_none_without_matches():
+    assert bluesky_client.parse_facets("just words, no links") is None
+
+
+# --- Parallel media uploads ---
+
+def test_upload_concurrently_keeps_order_and_overlaps():
+    delays = {"a": 0.3, "b": 0.2, "c": 0.1, "d": 0.0}
+
+    def upload(name):
+        time.sleep(delays[name])
+        return name.upper()
+
+    started = time.monotonic()
+    assert upload_concurrently(["a", "b", "c", "d"], upload) == ["A", "B", "C", "D"]
+    assert time.monotonic() - started < 0.5
+
+
+def test_upload_concurrently_fails_fast():
+    def upload(name):
+        if name == "bad":
+            raise RuntimeError("upload rejected")
+        time.sleep(1.0)
+        return name
+
+    started = time.monotonic()
+    with pytest.raises(RuntimeError, match="upload rejected"):
+        upload_concurrently(["a", "bad", "c"], upload)
+    assert time.monotonic() - started < 0.5
+
+
+class FakeMastodon:
+    """Uploads finish in reverse order; each item needs *polls* media() calls to be ready."""
+
+    def __init__(self, polls=0):
+        self.status = None
+        self.polls = polls
+        self.media_calls = {}
+
+    def media_post(self, media_file, mime_type=None, description=None):
+        # Later files finish first, so order must come from the inputs
+        time.sleep(0.1 * (4 - int(media_file[-1])))
+        return {"id": media_file, "url": None if self.polls else f"https://m.example/{media_file}"}
+
+    def media(self, media_id):
+        self.media_calls[media_id] = self.media_calls.get(media_id, 0) + 1
+        ready = self.media_calls[media_id] >= self.polls
+        return {"id": media_id, "url": f"https://m.example/{media_id}" if ready else None}
+
+    def status_post(self, **kwargs):
+        self.status = kwargs
+        return {"url": "https://mastodon.example/1"}
+
+
+def test_mastodon_media_ids_keep_attachment_order():
+    client = platforms.get_platform("mastodon")
+    client._client = FakeMastodon()
+    media = [MediaAttachment(file_path=f"/tmp/img{i}", mime_type="image/png") for i in range(1, 4)]
+
+    result = client.post("Hi", media=media)
+
+    assert result.success
+    assert [m["id"] for m in client._client.status["media_ids"]] == ["/tmp/img1", "/tmp/img2", "/tmp/img3"]
+
+
+# --- Discord webhooks ---
+
+HOOK = "https://discord.com/api/webhooks/1/abc"
+OK_BODY = {"id": "m1", "channel_id": "c1"}
+
+
+@responses.activate
+def test_discord_retries_429_after_retry_after():
+    responses.add(responses.POST, HOOK, status=429, json={"retry_after": 0.05, "global": False})
+    responses.add(responses.POST, HOOK, json=OK_BODY)
+    client = DiscordClient(webhook_url=HOOK, guild_id="g1")
+
+    result = client.post("Hi")
+
+    assert result.success
+    assert result.post_url == "https://discord.com/channels/g1/c1/m1"
+    assert len(responses.calls) == 2
+
+
+@responses.activate
+def test_discord_gives_up_when_rate_limit_wait_is_too_long():
+    responses.add(responses.POST, HOOK, status=429, json={"retry_after": 600})
+    result = DiscordClient(webhook_url=HOOK, guild_id="g1").post("Hi")
+    assert not result.success
+    assert "429" in result.error
+    assert len(responses.calls) == 1
+
+
+@responses.activate
+def test_discord_waits_for_empty_bucket():
+    responses.add(responses.POST, HOOK, json=OK_BODY,
+                  headers={"X-RateLimit-Remaining": "0", "X-RateLimit-Reset-After": "0.3"})
+    responses.add(responses.POST, HOOK, json=OK_BODY,
+                  headers={"X-RateLimit-Remaining": "4", "X-RateLimit-Reset-After": "2"})
+    client = DiscordClient(webhook_url=HOOK, guild_id="g1")
+
+    client.post("one")
+    started = time.monotonic()
+    client.post("two")
+    assert time.monotonic() - started >= 0.25
+    assert client._remaining == 4
+
+
+@responses.activate
+def test_discord_bucket_wait_counts_against_the_rate_limit_cap(monkeypatch):
+    import platforms.discord_client as discord_client
+    monkeypatch.setattr(discord_client, "MAX_RATE_LIMIT_WAIT", 0.3)
+    # The empty bucket uses 0.25s of the 0.3s allowance, so the 429 that follows is not retried
+    responses.add(responses.POST, HOOK, status=429, json={"retry_after": 0.1},
+                  headers={"X-RateLimit-Remaining": "0", "X-RateLimit-Reset-After": "0.1"})
+    client = DiscordClient(webhook_url=HOOK, guild_id="g1")
+    client._remaining, client._reset_at = 0, time.monotonic() + 0.25
+
+    started = time.monotonic()
+    result = client.post("Hi")
+
+    assert not result.success
+    assert len(responses.calls) == 1
+    assert time.monotonic() - started < 0.4
+
+
+@responses.activate
+def test_discord_streams_multipart_attachments(tmp_path):
+    image = tmp_path / "shot.png"
+    image.write_bytes(b"\x89PNG" + b"x" * 1000)
+    bodies = []
+
+    def capture(request):
+        body = request.body if isinstance(request.body, bytes) else request.body.read()
+        bodies.append((request.headers["Content-Type"], body))
+        return 200, {}, json.dumps(OK_BODY)
+
+    responses.add_callback(responses.POST, HOOK, callback=capture)
+    client = DiscordClient(webhook_url=HOOK, guild_id="g1")
+    result = client.post("Pic", media=[MediaAttachment(file_path=str(image), mime_type="image/png")])
+
+    assert result.success
+    content_type, body = bodies[0]
+    assert content_type.startswith("multipart/form-data; boundary=")
+    assert b'name="payload_json"' in body and b'"content": "Pic"' in body
+    assert b'name="file0"; filename="shot.png"' in body
+    assert b"\x89PNG" + b"x" * 1000 in body
+
+
+def test_discord_destinations_keep_their_own_sessions():
+    assert platforms.get_platform("discord").session is platforms.get_platform("discord").session
+    assert platforms.get_platform("discord").session is not platforms.get_platform("discord_content").session
+
+
+def test_mastodon_waits_for_media_processing(monkeypatch):
+    import platforms.mastodon_client as mastodon_client
+
+    monkeypatch.setattr(mastodon_client, "MEDIA_POLL_INITIAL", 0.01)
+    client = platforms.get_platform("mastodon")
+    client._client = FakeMastodon(polls=2)
+    media = [MediaAttachment(file_path=f"/tmp/img{i}", mime_type="image/png") for i in range(1, 3)]
+
+    result = client.post("Hi", media=media)
+
+    assert result.success
+    assert client._client.media_calls == {"/tmp/img1": 2, "/tmp/img2": 2}
+    assert all(m["url"] for m in client._client.status["media_ids"])
+
+
+def test_mastodon_gives_up_on_slow_media_processing(monkeypatch):
+    import platforms.mastodon_client as mastodon_client
+
+    monkeypatch.setattr(mastodon_client, "MEDIA_POLL_INITIAL", 0.01)
+    monkeypatch.setattr(mastodon_client, "MEDIA_READY_TIMEOUT", 0.1)
+    client = platforms.get_platform("mastodon")
+    client._client = FakeMastodon(polls=1000)
+
+    result = client.post("Hi", media=[MediaAttachment(file_path="/tmp/img1", mime_type="image/png")])
+
+    assert not result.success
+    assert "still processing" in result.error
+    assert client._client.status is None
@@ -0,0 +1,173 @@
+import json
+import time
+from types import SimpleNamespace
+
+from mastodon import MastodonNetworkError
+
+import services.posting as posting
+from platforms.discord_client import DiscordClient
+from platforms.mastodon_client import MastodonClient
+from services.post_queue import PostQueue, backoff_delay, is_retryable
+
+
+class FlakyPoster:
+    """run_platforms stand-in: each platform fails its first N attempts."""
+
+    def __init__(self, failures=None, error="Connection reset by peer"):
+        self.failures = dict(failures or {})
+        self.error = error
+        self.calls = []
+
+    def __call__(self, payload, platform_names):
+        self.calls.append(list(platform_names))
+        results = []
+        for name in platform_names:
+            if self.failures.get(name, 0) > 0:
+                self.failures[name] -= 1
+                results.append({"platform": name, "success": False, "error": self.error})
+            else:
+                results.append({"platform": name, "success": True, "post_url": f"https://{name}.example/1"})
+        return results
+
+
+def _queue(tmp_path, poster, completed=None, **kwargs):
+    return PostQueue(
+        str(tmp_path / "queue.json"), poster,
+        on_complete=(completed.append if completed is not None else None),
+        workers=0, **kwargs,
+    )
+
+
+def test_job_completes_and_reports_urls(tmp_path):
+    completed = []
+    queue = _queue(tmp_path, FlakyPoster(), completed)
+    job = queue.enqueue({"text": "Hi"}, ["mastodon", "bluesky"])
+
+    assert queue.run_pending() == 1
+
+    done = queue.get(job["id"])
+    assert done["status"] == "done"
+    assert done["platforms"]["bluesky"]["post_url"] == "https://bluesky.example/1"
+    assert [j["id"] for j in completed] == [job["id"]]
+
+
+def test_retry_only_reposts_failed_platforms(tmp_path):
+    poster = FlakyPoster(failures={"bluesky": 2})
+    completed = []
+    queue = _queue(tmp_path, poster, completed, base_delay=10)
+    job = queue.enqueue({"text": "Hi"}, ["mastodon", "bluesky"])
+
+    queue.run_pending()
+    waiting = queue.get(job["id"])
+    assert waiting["status"] == "waiting"
+    assert waiting["platforms"]["mastodon"]["status"] == "success"
+    assert waiting["next_attempt"] > time.time() + 5
+
+    # Not due yet
+    assert queue.run_pending() == 0
+    queue.run_pending(now=time.time() + 11)
+    queue.run_pending(now=time.time() + 100)
+
+    assert poster.calls == [["mastodon", "bluesky"], ["bluesky"], ["bluesky"]]
+    final = queue.get(job["id"])
+    assert final["status"] == "done"
+    assert final["platforms"]["bluesky"]["attempts"] == 3
+    assert len(completed) == 1
+
+
+def test_permanent_errors_and_max_attempts_give_up(tmp_path):
+    completed = []
+    poster = FlakyPoster(failures={"discord": 99, "bluesky": 99})
+    queue = _queue(tmp_path, poster, completed, max_attempts=2)
+    poster.error = "discord credentials not configured"
+    job = queue.enqueue({"text": "Hi"}, ["discord"])
+    queue.run_pending()
+    assert queue.get(job["id"])["status"] == "failed"
+    assert poster.calls == [["discord"]]
+
+    poster.error = "503 Service Unavailable"
+    job = queue.enqueue({"text": "Hi"}, ["bluesky"])
+    queue.run_pending()
+    queue.run_pending(now=time.time() + 1000)
+    assert queue.get(job["id"])["status"] == "failed"
+    assert queue.get(job["id"])["platforms"]["bluesky"]["attempts"] == 2
+    assert len(completed) == 2
+
+
+def test_jobs_survive_restart(tmp_path):
+    poster = FlakyPoster()
+    queue = _queue(tmp_path, poster)
+    job = queue.enqueue({"text": "Hi"}, ["mastodon"])
+
+    # Simulate a crash mid-run: the job is left "running" on disk
+    jobs = json.loads((tmp_path / "queue.json").read_text())
+    jobs[0]["status"] = "running"
+    (tmp_path / "queue.json").write_text(json.dumps(jobs))
+
+    restarted = _queue(tmp_path, poster)
+    assert restarted.run_pending() == 1
+    assert restarted.get(job["id"])["status"] == "done"
+
+
+def test_worker_threads_drain_the_queue(tmp_path):
+    completed = []
+    queue = PostQueue(str(tmp_path / "queue.json"), FlakyPoster(), on_complete=completed.append, workers=2)
+    try:
+        for _ in range(3):
+            queue.enqueue({"text": "Hi"}, ["mastodon"])
+        deadline = time.time() + 5
+        while len(completed) < 3 and time.time() < deadline:
+            time.sleep(0.02)
+    finally:
+        queue.stop()
+    assert len(completed) == 3
+
+
+def test_backoff_and_retryable():
+    assert [backoff_delay(n, 5, 30) for n in (1, 2, 3, 4)] == [5, 10, 20, 30]
+    assert all(is_retryable(c) for c in ("timeout", "rate_limit", "server", "network", "session", "other"))
+    assert not any(is_retryable(c) for c in ("config", "auth", "client", "deadline"))
+
+
+def test_retry_decision_uses_the_recorded_error_class(tmp_path):
+    def poster(payload, platform_names):
+        # The message alone looks like a plain timeout; the class says publish gave up waiting
+        return [{"platform": name, "success": False, "error": "Timed out after 30s",
+                 "telemetry": {"error_class": "deadline" if name == "mastodon" else "server"}}
+                for name in platform_names]
+
+    queue = _queue(tmp_path, poster)
+    job = queue.enqueue({"text": "Hi"}, ["mastodon", "bluesky"])
+    queue.run_pending()
+
+    states = queue.get(job["id"])["platforms"]
+    assert states["mastodon"]["status"] == "failed"
+    assert states["bluesky"]["status"] == "pending"
+
+
+def test_retry_decision_follows_the_exception_type_and_status(tmp_path, monkeypatch):
+    class Offline:
+        def status_post(self, **kwargs):
+            # "443" in the text once read as a 4xx status, and the post was never retried
+            raise MastodonNetworkError(
+                "Could not complete request: HTTPSConnectionPool(host='127.0.0.1', port=443): Max retries "
+                "exceeded with url: /api/v1/statuses (Caused by NewConnectionError('Failed to establish a new "
+                "connection: [Errno 111] Connection refused'))"
+            )
+
+    mastodon = MastodonClient()
+    mastodon._get_client = Offline
+    discord = DiscordClient()
+    discord._send = lambda *args, **kwargs: SimpleNamespace(status_code=400, text='{"content": ["Too long"]}')
+    clients = {"mastodon": mastodon, "discord": discord}
+    for client in clients.values():
+        client.validate_credentials = lambda: True
+    monkeypatch.setattr(posting, "get_platform", clients.__getitem__)
+
+    queue = _queue(tmp_path, lambda payload, names: posting.publish(posting.build_jobs(names, payload["text"])))
+    job = queue.enqueue({"text": "Hi"}, ["mastodon", "discord"])
+    queue.run_pending()
+
+    states = queue.get(job["id"])["platforms"]
+    assert (states["mastodon"]["status"], states["mastodon"]["telemetry"]["error_class"]) == ("pending", "network")
+    assert (states["discord"]["status"], states["discord"]["telemetry"]["error_class"]) == ("failed", "client")
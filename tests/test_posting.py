@@ -0,0 +1,222 @@
+import time
+from dataclasses import replace
+
+import pytest
+
+import services.media as media
+import services.posting as posting
+from services import post_telemetry, preflight
+from platforms.base import LinkCard, MediaAttachment, PostResult
+
+
+class FakeClient:
+    """Stand-in platform client that sleeps, then succeeds or raises."""
+
+    def __init__(self, name, delay=0.0, fail=None, configured=True):
+        self.name = name
+        self.delay = delay
+        self.fail = fail
+        self.configured = configured
+        self.calls = []
+
+    def validate_credentials(self):
+        return self.configured
+
+    def post(self, text, media=None, content_warning=None, link_card=None):
+        self.calls.append({"text": text, "media": media, "cw": content_warning, "link_card": link_card})
+        time.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError(self.fail)
+        return PostResult(platform=self.name, success=True, post_url=f"https://{self.name}.example/1")
+
+
+@pytest.fixture
+def fake_clients(monkeypatch):
+    clients = {}
+    monkeypatch.setattr(posting, "get_platform", lambda name: clients[name])
+    return clients
+
+
+def test_build_jobs_appends_link_for_mastodon_only():
+    card = LinkCard(url="https://site.dev", title="Site")
+    jobs = posting.build_jobs(
+        ["mastodon", "bluesky"], "Hello",
+        platform_texts={"bluesky": "Hi Bluesky"},
+        link_card=card,
+        content_warnings={"mastodon": "spoiler", "bluesky": ""},
+    )
+    assert jobs[0]["text"] == "Hello\n\nhttps://site.dev"
+    assert jobs[0]["link_card"] is None
+    assert jobs[0]["content_warning"] == "spoiler"
+    assert jobs[1]["text"] == "Hi Bluesky"
+    assert jobs[1]["link_card"] is card
+    assert jobs[1]["content_warning"] is None
+
+
+def test_publish_runs_platforms_concurrently_and_keeps_order(fake_clients):
+    for name in ("mastodon", "bluesky", "discord"):
+        fake_clients[name] = FakeClient(name, delay=0.3)
+    jobs = posting.build_jobs(["discord", "mastodon", "bluesky"], "Hi")
+
+    started = time.monotonic()
+    results = posting.publish(jobs)
+    elapsed = time.monotonic() - started
+
+    assert [r["platform"] for r in results] == ["discord", "mastodon", "bluesky"]
+    assert all(r["success"] for r in results)
+    assert elapsed < 0.8
+
+
+def test_publish_partial_failure(fake_clients):
+    fake_clients["mastodon"] = FakeClient("mastodon")
+    fake_clients["bluesky"] = FakeClient("bluesky", fail="login failed")
+    fake_clients["discord"] = FakeClient("discord", configured=False)
+
+    results = posting.publish(posting.build_jobs(["mastodon", "bluesky", "discord"], "Hi"))
+
+    assert results[0]["success"] is True
+    assert results[1].pop("telemetry")["error_class"] == "auth"
+    assert results[1] == {"platform": "bluesky", "success": False, "error": "login failed"}
+    assert results[2]["error"] == "discord credentials not configured"
+    assert results[2]["telemetry"]["error_class"] == "config"
+
+
+def test_publish_deadline_reports_timeout(fake_clients):
+    fake_clients["mastodon"] = FakeClient("mastodon")
+    fake_clients["bluesky"] = FakeClient("bluesky", delay=1.0)
+
+    results = posting.publish(
+        posting.build_jobs(["mastodon", "bluesky"], "Hi"),
+        deadlines={"mastodon": 5, "bluesky": 0.1},
+    )
+
+    assert results[0]["success"] is True
+    assert results[1]["success"] is False
+    assert "Timed out" in results[1]["error"]
+
+
+def test_publish_budget_caps_every_platform(fake_clients):
+    fake_clients["mastodon"] = FakeClient("mastodon", delay=1.0)
+    started = time.monotonic()
+    results = posting.publish(posting.build_jobs(["mastodon"], "Hi"), budget=0.1)
+    assert time.monotonic() - started < 0.5
+    assert "Timed out" in results[0]["error"]
+
+
+def test_bluesky_compression_does_not_touch_shared_attachments(fake_clients, monkeypatch):
+    monkeypatch.setattr(media, "derive", lambda att, profile, cache_dir=None: replace(att, file_path=att.file_path + ".compressed.jpg"))
+    fake_clients["mastodon"] = FakeClient("mastodon")
+    fake_clients["bluesky"] = FakeClient("bluesky")
+    att = MediaAttachment(file_path="/tmp/big.png", mime_type="image/png")
+
+    posting.publish(posting.build_jobs(["bluesky", "mastodon"], "Hi", attachments=[att]))
+
+    assert att.file_path == "/tmp/big.png"
+    assert fake_clients["bluesky"].calls[0]["media"][0].file_path == "/tmp/big.png.compressed.jpg"
+    assert fake_clients["mastodon"].calls[0]["media"][0].file_path == "/tmp/big.png"
+
+
+def test_publish_records_telemetry(fake_clients, monkeypatch):
+    def slow_derive(att, profile, cache_dir=None):
+        time.sleep(0.05)
+        return replace(att, file_path=att.file_path + ".jpg")
+
+    class Measured(FakeClient):
+        def post(self, text, media=None, content_warning=None, link_card=None):
+            return PostResult(platform=self.name, success=True, phases={"upload": 0.2, "create": 0.1},
+                              bytes_uploaded=1234, retries=1)
+
+    monkeypatch.setattr(media, "derive", slow_derive)
+    fake_clients["bluesky"] = Measured("bluesky")
+    fake_clients["mastodon"] = FakeClient("mastodon", fail="HTTP 503 Service Unavailable")
+    att = MediaAttachment(file_path="/tmp/big.png", mime_type="image/png")
+
+    bluesky, mastodon = posting.publish(posting.build_jobs(["bluesky", "mastodon"], "Hi", attachments=[att]))
+
+    t = bluesky["telemetry"]
+    assert set(t["phases"]) == {"compress", "upload", "create"}
+    assert t["phases"]["compress"] >= 0.05
+    assert t["seconds"] >= t["phases"]["compress"]
+    assert (t["bytes_uploaded"], t["retries"], t["error_class"]) == (1234, 1, "")
+    assert "compress" not in mastodon["telemetry"]["phases"]
+    assert mastodon["telemetry"]["error_class"] == "server"
+
+
+def test_summarize_telemetry_per_platform():
+    history = [
+        {"telemetry": {"bluesky": post_telemetry.build(1.0, {"create": 0.5}, 100)}},
+        {"text": "before telemetry"},
+        {"telemetry": {
+            "bluesky": dict(post_telemetry.build(3.0, {"create": 1.5}, 300, retries=1), attempts=2),
+            "discord": post_telemetry.build(0.5, error="Discord API error 429: slow down"),
+        }},
+    ]
+
+    rows = {row["platform"]: row for row in post_telemetry.summarize(history)}
+
+    assert rows["bluesky"]["attempts"] == 2
+    assert rows["bluesky"]["p50"] == 2.0
+    assert rows["bluesky"]["phases"] == {"create": 1.0}
+    assert rows["bluesky"]["avg_bytes"] == 200
+    assert rows["bluesky"]["retries"] == 2
+    assert rows["discord"]["succeeded"] == 0
+    assert rows["discord"]["errors"] == {"rate_limit": 1}
+
+
+def test_classify_error_reads_statuses_only_where_they_are_statuses():
+    classify = post_telemetry.classify_error
+
+    assert classify(str(("Mastodon API returned error", 422, "Unprocessable Entity",
+                         "Validation failed: Text character limit of 500 exceeded"))) == "client"
+    assert classify("400 ExpiredToken: Token has expired") == "session"
+    assert classify(
+        "HTTPSConnectionPool(host='127.0.0.1', port=443): Max retries exceeded with url: /api/v2/statuses "
+        "(Caused by NewConnectionError('Failed to establish a new connection: [Errno 111] Connection refused'))"
+    ) == "network"
+    assert classify("Discord API error 503: upstream") == "server"
+    assert classify("401 AuthenticationRequired: Invalid identifier or password") == "auth"
+
+
+def test_preflight_counts_graphemes_per_platform():
+    from platforms.base import grapheme_len
+    from platforms.mastodon_client import MastodonClient
+
+    assert grapheme_len("e\u0301 \U0001F469\u200d\U0001F4BB \U0001F1EF\U0001F1F5 \U0001F44D\U0001F3FD") == 7
+    assert MastodonClient.text_length("See https://example.com/" + "x" * 100) == 4 + 23
+    assert MastodonClient.text_length("Hi @bob@mastodon.social") == len("Hi @bob")
+
+    flags = "\U0001F1EF\U0001F1F5" * 300  # 300 graphemes, 600 code points
+    accepted, rejected = preflight.check(["bluesky", "mastodon"], flags)
+    assert accepted == ["bluesky", "mastodon"] and rejected == []
+
+    accepted, rejected = preflight.check(["mastodon", "bluesky", "discord"], "x" * 301)
+    assert accepted == ["mastodon", "discord"]
+    assert rejected[0]["platform"] == "bluesky"
+    assert "301 characters; bluesky allows 300" in rejected[0]["error"]
+
+
+def test_preflight_checks_media(tmp_path, monkeypatch):
+    big = tmp_path / "big.jpg"
+    big.write_bytes(b"\0" * (11 * 1024 * 1024))
+    atts = [MediaAttachment(file_path=str(big), mime_type="image/jpeg", alt_text="x" * 1501)]
+
+    accepted, rejected = preflight.check(["mastodon", "bluesky", "discord"], "Hi", attachments=atts)
+    assert accepted == ["bluesky"]  # Bluesky gets a re-encoded copy
+    errors = {r["platform"]: r["error"] for r in rejected}
+    assert "alt text is 1501 characters" in errors["mastodon"]
+    assert "Image 1 is 11.5 MB; discord allows 10.5 MB" in errors["discord"]
+
+    monkeypatch.setattr(preflight.config, "REQUIRE_ALT_TEXT", True)
+    atts = [MediaAttachment(file_path=str(big), mime_type="image/jpeg")]
+    _, rejected = preflight.check(["bluesky"], "Hi", attachments=atts, link_url="https://site.example/")
+    assert rejected[0]["error"] == (
+        "Not posted: Image 1 has no alt text; A post takes images or a link card, not both"
+    )
+
+
+def test_preflight_counts_the_link_mastodon_appends():
+    text = "x" * 476
+    accepted, _ = preflight.check(["mastodon"], text, link_url="https://site.example/a-long-path")
+    assert accepted == []  # 476 + 2 newlines + 23 for the URL
+    accepted, _ = preflight.check(["mastodon"], text[:-1], link_url="https://site.example/a-long-path")
+    assert accepted == ["mastodon"]
@@ -0,0 +1,119 @@
+import json
+import threading
+
+from services.prefetch import MetadataPrefetcher, SITE_KINDS, kinds_for_type
+
+
+def _counting_fetcher(calls, value="ok"):
+    def fetch(url):
+        calls.append(url)
+        return f"{value}:{url}"
+    return fetch
+
+
+def test_get_after_warm_reuses_background_result():
+    calls = []
+    p = MetadataPrefetcher({"description": _counting_fetcher(calls)})
+    p.warm("https://a.dev", ["description"])
+    assert p.get("description", "https://a.dev") == "ok:https://a.dev"
+    assert p.get("description", "https://a.dev") == "ok:https://a.dev"
+    assert calls == ["https://a.dev"]
+
+
+def test_get_waits_for_in_flight_warm_up():
+    release = threading.Event()
+    calls = []
+
+    def slow(url):
+        calls.append(url)
+        release.wait(5)
+        return "slow"
+
+    p = MetadataPrefetcher({"favicon": slow})
+    p.warm("https://a.dev", ["favicon"])
+    assert p.peek("favicon", "https://a.dev") == (False, None)
+    release.set()
+    assert p.get("favicon", "https://a.dev", timeout=5) == "slow"
+    assert calls == ["https://a.dev"]
+
+
+def test_failures_are_not_cached():
+    results = iter([None, {"error": "boom"}, "good"])
+    p = MetadataPrefetcher({"favicon": lambda url: next(results)})
+    assert p.get("favicon", "https://a.dev") is None
+    assert p.get("favicon", "https://a.dev") == {"error": "boom"}
+    assert p.get("favicon", "https://a.dev") == "good"
+    assert p.get("favicon", "https://a.dev") == "good"
+
+
+def test_refresh_bypasses_cached_result():
+    calls = []
+    p = MetadataPrefetcher({"description": _counting_fetcher(calls)})
+    p.get("description", "https://a.dev")
+    p.get("description", "https://a.dev", refresh=True)
+    p.get("description", "https://a.dev")
+    assert len(calls) == 2
+
+
+def test_expired_results_are_refetched():
+    calls = []
+    p = MetadataPrefetcher({"description": _counting_fetcher(calls)}, ttl=-1)
+    p.get("description", "https://a.dev")
+    p.get("description", "https://a.dev")
+    assert len(calls) == 2
+
+
+def test_lru_bound():
+    calls = []
+    p = MetadataPrefetcher({"description": _counting_fetcher(calls)}, max_entries=2)
+    for url in ("https://a.dev", "https://b.dev", "https://c.dev"):
+        p.get("description", url)
+    assert p.peek("description", "https://a.dev") == (False, None)
+    assert p.peek("description", "https://c.dev")[0] is True
+
+
+def test_kinds_for_type():
+    assert kinds_for_type("site") == SITE_KINDS
+    assert kinds_for_type("blog post") == ("description",)
+
+
+# --- Route integration ---
+
+def test_stash_next_warms_queue_and_routes_use_cache(client, app, tmp_path, monkeypatch):
+    import app as app_module
+    calls = []
+    monkeypatch.setattr(app_module.prefetcher, "fetchers", {
+        "description": _counting_fetcher(calls, "desc"),
+    })
+    app.config["PREFETCH_AHEAD"] = 2
+    stash_path = tmp_path / "stashed-entries.json"
+    stash_path.write_text(json.dumps([
+        {"title": "A", "link": "https://a.dev/post", "type": "blog post"},
+        {"title": "B", "link": "https://b.dev/post", "type": "release"},
+        {"title": "C", "link": "https://c.dev/post", "type": "blog post"},
+    ]))
+    app.config["STASH_PATH"] = str(stash_path)
+
+    resp = client.get("/editor/stash/next")
+    assert resp.get_json()["entry"]["title"] == "A"
+
+    assert app_module.prefetcher.get("description", "https://b.dev/post", timeout=5) == "desc:https://b.dev/post"
+    resp = client.post("/editor/description", json={"url": "https://a.dev/post"})
+    assert resp.get_json()["description"] == "desc:https://a.dev/post"
+    assert sorted(calls) == ["https://a.dev/post", "https://b.dev/post"]
+
+
+def test_queue_warm_up_skips_screenshots_and_reviews(client, app, monkeypatch):
+    import app as app_module
+    calls = []
+    monkeypatch.setattr(app_module, "_capture_screenshot", lambda url: calls.append(("screenshot", url)))
+    monkeypatch.setattr(app_module, "_fetch_content_review", lambda url: calls.append(("review", url)))
+    monkeypatch.setattr(app_module.prefetcher, "fetchers", {
+        kind: (lambda kind: lambda url: calls.append((kind, url)) or kind)(kind) for kind in SITE_KINDS
+    })
+    app.config["PREFETCH_AHEAD"] = 1
+
+    app_module._prefetch_queue([{"link": "https://a.dev", "type": "site"}], "link", "type")
+    for kind in SITE_KINDS:
+        app_module.prefetcher.get(kind, "https://a.dev", timeout=5)
+    assert sorted(calls) == [(kind, "https://a.dev") for kind in sorted(SITE_KINDS)]
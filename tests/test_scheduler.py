@@ -0,0 +1,88 @@
+import json
+import time
+
+from services.scheduler import PostScheduler
+
+
+def _scheduler(tmp_path, fired, **kwargs):
+    return PostScheduler(str(tmp_path / "schedule.json"), fired.append, threaded=False, **kwargs)
+
+
+def test_fires_in_due_order_only_when_due(tmp_path):
+    fired = []
+    scheduler = _scheduler(tmp_path, fired, min_interval={})
+    now = time.time()
+    late = scheduler.schedule({"text": "late"}, ["mastodon"], now + 200)
+    early = scheduler.schedule({"text": "early"}, ["bluesky"], now + 100)
+
+    assert scheduler.run_due(now) == 0
+    assert scheduler.run_due(now + 150) == 1
+    assert scheduler.run_due(now + 250) == 1
+    assert [e["id"] for e in fired] == [early["id"], late["id"]]
+    assert scheduler.entries() == []
+
+
+def test_overdue_entries_fire_after_restart(tmp_path):
+    fired = []
+    now = time.time()
+    _scheduler(tmp_path, []).schedule({"text": "missed"}, ["mastodon"], now + 10)
+
+    restarted = _scheduler(tmp_path, fired)
+    assert [e["payload"]["text"] for e in restarted.entries()] == ["missed"]
+    assert restarted.run_due(now + 3600) == 1
+    assert fired[0]["payload"]["text"] == "missed"
+    assert json.loads((tmp_path / "schedule.json").read_text()) == []
+
+
+def test_burst_is_spread_per_platform(tmp_path):
+    fired = []
+    scheduler = _scheduler(tmp_path, fired, min_interval={"mastodon": 30, "discord": 10})
+    now = time.time()
+    for i in range(3):
+        scheduler.schedule({"text": f"m{i}"}, ["mastodon"], now)
+    scheduler.schedule({"text": "d"}, ["discord"], now)
+
+    assert scheduler.run_due(now) == 2  # one Mastodon post plus the Discord one
+    assert scheduler.run_due(now + 29) == 0
+    assert scheduler.run_due(now + 30) == 1
+    assert scheduler.run_due(now + 60) == 1
+    assert sorted(e["payload"]["text"] for e in fired) == ["d", "m0", "m1", "m2"]
+
+
+def test_cancel(tmp_path):
+    fired = []
+    scheduler = _scheduler(tmp_path, fired)
+    entry = scheduler.schedule({"text": "nope"}, ["mastodon"], time.time())
+    assert scheduler.cancel(entry["id"])["payload"]["text"] == "nope"
+    assert scheduler.run_due(time.time() + 10) == 0
+    assert fired == []
+
+
+def test_failed_fire_is_retried_later(tmp_path):
+    calls = []
+
+    def fire(entry):
+        calls.append(entry["id"])
+        if len(calls) == 1:
+            raise OSError("disk full")
+
+    scheduler = PostScheduler(str(tmp_path / "schedule.json"), fire, threaded=False, min_interval={})
+    now = time.time()
+    scheduler.schedule({"text": "x"}, ["mastodon"], now)
+    scheduler.run_due(now)
+    assert len(scheduler.entries()) == 1
+    scheduler.run_due(now + 120)
+    assert len(calls) == 2 and scheduler.entries() == []
+
+
+def test_thread_fires_when_due(tmp_path):
+    fired = []
+    scheduler = PostScheduler(str(tmp_path / "schedule.json"), fired.append)
+    try:
+        scheduler.schedule({"text": "soon"}, ["mastodon"], time.time() + 0.2)
+        deadline = time.time() + 3
+        while not fired and time.time() < deadline:
+            time.sleep(0.02)
+    finally:
+        scheduler.stop()
+    assert fired and fired[0]["payload"]["text"] == "soon"
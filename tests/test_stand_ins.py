@@ -0,0 +1,218 @@
+import json
+
+import pytest
+
+import config
+import platforms
+import platforms.mastodon_client as mastodon_client
+from platforms.base import MediaAttachment
+from tests.stand_ins import (
+    BlueskyStandIn,
+    DiscordStandIn,
+    MastodonStandIn,
+    SiteStandIn,
+    stand_in_config,
+)
+
+
+@pytest.fixture
+def use_stand_ins(monkeypatch, tmp_path):
+    """Point the platform clients at the given stand-ins, with fresh pooled clients."""
+    def apply(**stand_ins):
+        values = stand_in_config(**stand_ins)
+        values.update(
+            BLUESKY_SESSION_FILE=str(tmp_path / "bluesky-session.json"),
+            BLUESKY_HANDLE_CACHE_FILE=str(tmp_path / "bluesky-handles.json"),
+        )
+        for name, value in values.items():
+            monkeypatch.setattr(config, name, value)
+        platforms.reset_platforms()
+
+    yield apply
+    platforms.reset_platforms()
+
+
+@pytest.fixture
+def image(tmp_path):
+    from PIL import Image
+
+    path = tmp_path / "photo.jpg"
+    Image.new("RGB", (64, 48), (10, 120, 200)).save(path, "JPEG")
+    return MediaAttachment(file_path=str(path), mime_type="image/jpeg", alt_text="A photo")
+
+
+def test_mastodon_waits_for_media_processing(use_stand_ins, image, monkeypatch):
+    monkeypatch.setattr(mastodon_client, "MEDIA_POLL_INITIAL", 0.01)
+    with MastodonStandIn(processing_polls=2) as server:
+        use_stand_ins(mastodon=server)
+        result = platforms.get_platform("mastodon").post("Hello", media=[image])
+
+    assert result.success, result.error
+    assert result.post_url.startswith(server.url)
+    assert server.count(r"/api/v1/media/\d+", "GET") == 3  # two still processing, then ready
+    assert server.count(r"/api/v1/statuses") == 1
+
+
+def test_bluesky_logs_in_once_and_links_only_resolved_mentions(use_stand_ins, image):
+    with BlueskyStandIn(handles={"known.test": "did:plc:known"}) as server:
+        use_stand_ins(bluesky=server)
+        client = platforms.get_platform("bluesky")
+        first = client.post("Hi @known.test and @ghost.test", media=[image])
+        second = client.post("Again")
+
+    assert first.success, first.error
+    assert second.success, second.error
+    assert server.count(r"/xrpc/com\.atproto\.server\.createSession") == 1
+    assert set(first.phases) == {"auth", "resolve", "upload", "create"}
+    assert "auth" in second.phases and "upload" not in second.phases
+    facets = server.records[0]["record"]["facets"]
+    assert [f["features"][0]["did"] for f in facets] == ["did:plc:known"]
+    assert server.records[0]["record"]["embed"]["images"][0]["alt"] == "A photo"
+
+
+def test_discord_waits_when_the_bucket_is_empty(use_stand_ins, image):
+    with DiscordStandIn(bucket_size=1, bucket_window=0.2) as server:
+        use_stand_ins(discord=server)
+        client = platforms.get_platform("discord")
+        results = [client.post("One", media=[image]), client.post("Two")]
+
+    assert all(r.success for r in results), [r.error for r in results]
+    assert len(server.messages) == 2
+    assert b'name="file0"' in server.messages[0]
+    assert results[0].bytes_uploaded > 0
+    # The first response said the bucket was empty, so the second post waited instead of hitting a 429
+    assert results[1].phases["rate_limit_wait"] >= 0.1
+    assert results[1].retries == 0
+
+
+def test_discord_counts_429_retries(use_stand_ins):
+    with DiscordStandIn(rate_limit_every=2) as server:
+        use_stand_ins(discord=server)
+        client = platforms.get_platform("discord")
+        results = [client.post("One"), client.post("Two")]
+
+    assert [r.retries for r in results] == [0, 1]
+
+
+def test_post_route_fans_out_to_stand_ins(client, app, use_stand_ins):
+    with MastodonStandIn() as mastodon, BlueskyStandIn() as bluesky, \
+            DiscordStandIn() as discord, SiteStandIn() as site:
+        use_stand_ins(mastodon=mastodon, bluesky=bluesky, discord=discord)
+        resp = client.post("/post", data={
+            "text": "Link card post",
+            "platforms": ["mastodon", "bluesky", "discord"],
+            "link_url": site.page_url("card"),
+        })
+
+    assert resp.status_code == 200
+    with open(app.config["HISTORY_FILE"]) as f:
+        history = json.load(f)
+    assert [p["name"] for p in history[0]["platforms"]] == ["mastodon", "bluesky", "discord"]
+    external = bluesky.records[0]["record"]["embed"]["external"]
+    assert external["title"] == "Stand-in page card"
+    assert external["thumb"]["mimeType"] == "image/jpeg"
+    assert mastodon.statuses[0]["status"] == "Link card post\n\n" + site.page_url("card")
+
+
+def test_edit_and_remote_delete_reach_every_platform(client, app, use_stand_ins):
+    def history():
+        with open(app.config["HISTORY_FILE"]) as f:
+            return json.load(f)
+
+    with MastodonStandIn() as mastodon, BlueskyStandIn() as bluesky, DiscordStandIn() as discord:
+        use_stand_ins(mastodon=mastodon, bluesky=bluesky, discord=discord)
+        client.post("/post", data={"text": "Typo post", "platforms": ["mastodon", "bluesky", "discord"]})
+        post_id = history()[0]["id"]
+
+        edited = client.post(f"/post/{post_id}/edit", json={"text": "Fixed post"}).get_json()["results"]
+        after_edit = history()[0]
+        first = client.post(f"/post/{post_id}/remote-delete", json={"platforms": ["discord"]}).get_json()["results"]
+        # Discord answers 404 for a message already deleted; that still counts as gone
+        again = platforms.get_platform("discord").delete(first[0]["post_url"])
+        rest = client.post(f"/post/{post_id}/remote-delete", json={}).get_json()["results"]
+
+    assert [(r["platform"], r["success"]) for r in edited] == [
+        ("mastodon", True), ("bluesky", False), ("discord", True),
+    ]
+    assert edited[1]["error"] == "bluesky does not support editing posts"
+    assert mastodon.edits[0][1]["status"] == "Fixed post"
+    assert discord.edits == [("1000001", {"content": "Fixed post"})]
+    # Bluesky still shows the old text, so only the edited platforms' texts change
+    assert after_edit["text"] == "Typo post" and "edited_at" in after_edit
+    assert after_edit["platform_texts"] == {"mastodon": "Fixed post", "bluesky": "Typo post", "discord": "Fixed post"}
+
+    assert [r["platform"] for r in first] == ["discord"]
+    assert again.success
+    assert [(r["platform"], r["success"]) for r in rest] == [("mastodon", True), ("bluesky", True)]
+    assert mastodon.deleted == ["1"]
+    assert bluesky.deleted[0]["rkey"] == "3stand0000001"
+    assert bluesky.count(r"/xrpc/com\.atproto\.server\.createSession") == 1  # pooled session reused
+    assert discord.deleted == ["1000001"]
+    assert history() == []
+
+
+
+def test_edit_skips_unchanged_platforms_and_keeps_discord_content_warning(client, app, use_stand_ins):
+    def entry():
+        with open(app.config["HISTORY_FILE"]) as f:
+            return json.load(f)[0]
+
+    with MastodonStandIn() as mastodon, BlueskyStandIn() as bluesky, DiscordStandIn() as discord:
+        use_stand_ins(mastodon=mastodon, bluesky=bluesky, discord=discord)
+        client.post("/post", data={"text": "hello", "platforms": ["mastodon", "bluesky", "discord"],
+                                   "cw_discord": "spoilers"})
+        post_id = entry()["id"]
+        html = client.get("/social").get_data(as_text=True)
+        edit_form = html.split('<details class="post-edit">')[1].split("</details>")[0]
+        first = client.post(f"/post/{post_id}/edit", data={"text_mastodon": "hello edited", "text_discord": "hello"})
+        second = client.post(f"/post/{post_id}/edit", data={"text_mastodon": "hello edited",
+                                                              "text_discord": "hello again"})
+
+    assert 'name="text_mastodon"' in edit_form and 'name="text_discord"' in edit_form
+    assert 'name="text_bluesky"' not in edit_form
+    assert first.status_code == second.status_code == 200
+    assert len(mastodon.edits) == 1  # the second save left the unchanged Mastodon text alone
+    assert discord.edits == [("1000001", {"content": "**CW: spoilers**\n\n||hello again||"})]
+    assert entry()["text"] == "hello"
+    assert entry()["platform_texts"] == {"mastodon": "hello edited", "bluesky": "hello", "discord": "hello again"}
+
+def test_engagement_is_batched_and_conditional(use_stand_ins):
+    with MastodonStandIn() as mastodon, BlueskyStandIn() as bluesky, \
+            MastodonStandIn(multi_status=False) as old_mastodon:
+        use_stand_ins(mastodon=mastodon, bluesky=bluesky)
+        toots = [platforms.get_platform("mastodon").post(f"Toot {i}").post_url for i in range(30)]
+        skeets = [platforms.get_platform("bluesky").post(f"Skeet {i}").post_url for i in range(30)]
+        mastodon.counts["1"] = (5, 2, 1)
+        bluesky.counts["3stand0000001"] = (7, 3, 2, 1)
+
+        first = platforms.get_platform("mastodon").engagement(toots)
+        again = platforms.get_platform("mastodon").engagement(toots)
+        mastodon.counts["1"] = (6, 2, 1)
+        changed = platforms.get_platform("mastodon").engagement(toots[:1])
+        likes = platforms.get_platform("bluesky").engagement(skeets)
+
+        use_stand_ins(mastodon=old_mastodon)
+        old_toot = platforms.get_platform("mastodon").post("Old instance").post_url
+        fallback = platforms.get_platform("mastodon").engagement([old_toot])
+
+    assert first[toots[0]] == {"favourites": 5, "boosts": 2, "replies": 1}
+    assert again == first and len(first) == 30
+    assert mastodon.count(r"/api/v1/statuses", "GET") == 5  # 20 + 10, twice, then one
+    assert changed[toots[0]]["favourites"] == 6  # new ETag, new body
+    assert likes[skeets[0]] == {"likes": 7, "reposts": 3, "replies": 2, "quotes": 1}
+    assert bluesky.count(r"/xrpc/app\.bsky\.feed\.getPosts") == 2  # 25 + 5
+    assert fallback == {old_toot: {"favourites": 0, "boosts": 0, "replies": 0}}
+    assert old_mastodon.count(r"/api/v1/statuses/\d+", "GET") == 1
+
+
+def test_compose_sidebar_shows_engagement(client, app, use_stand_ins):
+    with MastodonStandIn() as mastodon, BlueskyStandIn() as bluesky:
+        use_stand_ins(mastodon=mastodon, bluesky=bluesky)
+        client.post("/post", data={"text": "Counted", "platforms": ["mastodon", "bluesky"]})
+        mastodon.counts["1"] = (4, 1, 0)
+        report = client.post("/engagement/refresh").get_json()
+        html = client.get("/social").get_data(as_text=True)
+
+    assert report["fetched"] == 2 and report["errors"] == {}
+    assert "♥&nbsp;4 ↻&nbsp;1 ↩&nbsp;0" in html
+    assert "♥&nbsp;0 ↻&nbsp;0 ↩&nbsp;0 ❝&nbsp;0" in html
@@ -172,3 +172,85 @@ def test_editor_page_stash_missing_file(client, app, tmp_path):
 
     resp = client.get("/")
     assert b"window.stashCount = 0" in resp.data
+
+
+# --- POST /editor/stash/bulk ---
+
+def _bulk_setup(app, tmp_path, sample_bundledb, sample_showcase):
+    stash_path = str(tmp_path / "stashed-entries.json")
+    app.config["STASH_PATH"] = stash_path
+    _write_json(stash_path, [{"title": "Stashed", "link": "https://stashed.dev/post", "type": "blog post"}])
+    _write_json(app.config["BUNDLEDB_PATH"], sample_bundledb)
+    _write_json(app.config["SHOWCASE_PATH"], sample_showcase)
+    return stash_path
+
+
+def test_stash_bulk_csv_dedupes_against_db_and_stash(client, app, tmp_path, sample_bundledb, sample_showcase):
+    import io
+    stash_path = _bulk_setup(app, tmp_path, sample_bundledb, sample_showcase)
+    csv_body = (
+        "title,link,type\n"
+        "New One,https://new.dev/one,\n"
+        "Known,https://www.example.com/blog/eleventy-start/,blog post\n"
+        "Showcase,https://cool11ty.dev,site\n"
+        "Again,https://STASHED.dev/post,\n"
+        "Repeat,https://new.dev/one/,\n"
+        "Bad Type,https://bad.dev,podcast\n"
+    )
+    resp = client.post("/editor/stash/bulk", data={
+        "file": (io.BytesIO(csv_body.encode()), "links.csv"),
+    }, content_type="multipart/form-data")
+    data = resp.get_json()
+    assert data["success"] is True
+    assert data["added"] == 1
+    assert data["in_database"] == 2
+    assert data["already_stashed"] == 1
+    assert data["duplicates"] == 1
+    assert data["invalid"] == 1
+    assert data["count"] == 2
+
+    stash = _read_json(stash_path)
+    assert stash[1] == {"title": "New One", "link": "https://new.dev/one", "type": "blog post"}
+
+
+def test_stash_bulk_ndjson_raw_body(client, app, tmp_path, sample_bundledb, sample_showcase):
+    stash_path = _bulk_setup(app, tmp_path, sample_bundledb, sample_showcase)
+    body = (
+        '{"title": "A", "url": "https://a.dev", "type": "site", "date": "2026-03-01"}\n'
+        "not json\n"
+        '{"title": "B", "link": "https://b.dev"}\n'
+    )
+    resp = client.post("/editor/stash/bulk?format=ndjson&type=release", data=body,
+                       content_type="application/x-ndjson")
+    data = resp.get_json()
+    assert data["added"] == 2
+    assert data["invalid"] == 1
+
+    stash = _read_json(stash_path)
+    assert stash[1] == {"title": "A", "link": "https://a.dev", "type": "site", "date": "2026-03-01"}
+    assert stash[2]["type"] == "release"
+
+
+def test_stash_bulk_opml(client, app, tmp_path, sample_bundledb, sample_showcase):
+    import io
+    stash_path = _bulk_setup(app, tmp_path, sample_bundledb, sample_showcase)
+    opml = (
+        '<?xml version="1.0"?><opml version="2.0"><body>'
+        '<outline text="Blogs">'
+        '<outline text="Feed Blog" xmlUrl="https://feed.dev/feed.xml" htmlUrl="https://feed.dev/"/>'
+        '<outline text="Example" xmlUrl="https://example.com/feed.xml" htmlUrl="https://example.com/blog/eleventy-start"/>'
+        '</outline></body></opml>'
+    )
+    resp = client.post("/editor/stash/bulk", data={
+        "file": (io.BytesIO(opml.encode()), "blogroll.opml"),
+    }, content_type="multipart/form-data")
+    data = resp.get_json()
+    assert data["added"] == 1
+    assert data["in_database"] == 1
+    assert _read_json(stash_path)[1]["link"] == "https://feed.dev/"
+
+
+def test_stash_bulk_unknown_format(client, app, tmp_path):
+    app.config["STASH_PATH"] = str(tmp_path / "stashed-entries.json")
+    resp = client.post("/editor/stash/bulk", data="x", content_type="text/plain")
+    assert resp.status_code == 400